@@ -13,6 +13,8 @@ from .structures import (
     ColumnProfile,
 )
 from .db_parser import DatabaseParser
+from .async_parser import AsyncDatabaseParser
+from .store import SchemaStore
 
 # Expose the generator classes for programmatic use
 from .generators.ddl_schema.generator import DDLSchemaGenerator
@@ -28,6 +30,8 @@ __all__ = [
     "TableProfile",
     "ColumnProfile",
     "DatabaseParser",
+    "AsyncDatabaseParser",
+    "SchemaStore",
     "DDLSchemaGenerator",
     "MSchemaGenerator",
     "MacSQLSchemaGenerator",
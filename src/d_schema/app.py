@@ -1,6 +1,10 @@
 from omegaconf import DictConfig, OmegaConf
 import os
 import sys
+import gzip
+import io
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 from hydra import initialize_config_dir, compose
 
 # Use importlib.resources for robust path finding
@@ -11,6 +15,8 @@ else:
 
 from .db_parser import DatabaseParser
 from .structures import DatabaseSchema
+from .store import SchemaStore
+from .similarity.foreign_keys import apply_foreign_keys, infer_foreign_keys
 from .generators.ddl_schema.generator import DDLSchemaGenerator
 from .generators.m_schema.generator import MSchemaGenerator
 from .generators.mac_sql_schema.generator import MacSQLSchemaGenerator
@@ -24,9 +30,79 @@ GENERATOR_CLASSES = {
     "profile_report": ProfileReportGenerator,
 }
 
-def run_generator(db_structure: DatabaseSchema, output_path: str, generator_cfg: DictConfig):
+def select_generators(cfg: DictConfig, config_path: str) -> List[DictConfig]:
+    """
+    Returns the configurations of all generators of this run: the entries of
+    `generators` (each composed from its file in config/generator/), or the
+    single `generator` if the list is empty. An entry naming the selected
+    `generator` uses that configuration, including command-line overrides.
+    """
+    names = OmegaConf.to_container(cfg.generators) if cfg.generators else []
+    if not names:
+        return [cfg.generator]
+
+    generator_cfgs = []
+    for name in names:
+        if name == cfg.generator.name:
+            generator_cfgs.append(cfg.generator)
+            continue
+        file_path = os.path.join(config_path, "generator", f"{name}.yaml")
+        if os.path.exists(file_path):
+            generator_cfgs.append(OmegaConf.load(file_path))
+        else:
+            generator_cfgs.append(OmegaConf.create({"name": name}))
+    return generator_cfgs
+
+
+def needs_profile(generator_cfgs: List[DictConfig]) -> bool:
+    """Returns True if any of the generators renders profile data."""
+    return any(
+        GENERATOR_CLASSES[generator_cfg.name].requires_profile
+        for generator_cfg in generator_cfgs
+        if generator_cfg.name in GENERATOR_CLASSES
+    )
+
+
+# File name suffixes of the supported output compressions
+COMPRESSION_SUFFIXES = {
+    "gzip": ".gz",
+    "zstd": ".zst",
+}
+
+
+def open_output(file_path: str, compression: Optional[str] = None):
+    """
+    Opens an output file for writing text, compressed with gzip or zstd
+    (which requires the `zstandard` package) if requested.
+    """
+    if compression is None:
+        return open(file_path, "w", encoding="utf-8")
+    if compression == "gzip":
+        return gzip.open(file_path, "wt", encoding="utf-8")
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError(
+                "zstd output requires the zstandard package (pip install \"d-schema[zstd]\")."
+            ) from e
+        raw_file = open(file_path, "wb")
+        return io.TextIOWrapper(zstandard.ZstdCompressor().stream_writer(raw_file), encoding="utf-8")
+    raise ValueError(
+        f"Unknown compression '{compression}'. Expected one of {', '.join(COMPRESSION_SUFFIXES)}."
+    )
+
+
+def run_generator(
+    db_structure: DatabaseSchema,
+    output_path: str,
+    generator_cfg: DictConfig,
+    compression: Optional[str] = None,
+):
     """
     Initializes and runs a single generator based on its configuration.
+    The output is streamed to the file chunk by chunk (see
+    `BaseGenerator.iter_schema`), optionally compressed with gzip or zstd.
     """
     # Convert the generator config to a standard python dict
     generator_params = OmegaConf.to_container(generator_cfg, resolve=True)
@@ -41,9 +117,7 @@ def run_generator(db_structure: DatabaseSchema, output_path: str, generator_cfg:
 
     # Pass the generator-specific config to its constructor
     generator_instance = generator_class(schema=db_structure, **generator_params)
-    
-    schema_content = generator_instance.generate_schema()
-    
+
     # Define a unique output filename for each generator
     if gen_name == "ddl":
         output_filename = "schema.ddl"
@@ -56,16 +130,21 @@ def run_generator(db_structure: DatabaseSchema, output_path: str, generator_cfg:
     else:
         output_filename = f"schema.{gen_name}.txt"
 
+    if compression is not None:
+        output_filename += COMPRESSION_SUFFIXES.get(compression, "")
+
     file_path = os.path.join(output_path, output_filename)
-    with open(file_path, "w", encoding="utf-8") as f:
-        f.write(schema_content)
+    with open_output(file_path, compression) as f:
+        for chunk in generator_instance.iter_schema():
+            f.write(chunk)
         
     print(f"Generator {gen_name} finished. Output written to {file_path}")
 
 def main():
     """
     Main application entry point using programmatic Hydra initialization.
-    This version handles a single generator run at a time.
+    The database is parsed once and all selected generators then render the
+    same parsed schema concurrently.
     """
     # Find the absolute path to the config directory within the package
     config_path_ref = importlib_resources.files('d_schema') / 'config'
@@ -78,17 +157,71 @@ def main():
             print("Starting D-Schema with configuration:")
             print(OmegaConf.to_yaml(cfg))
 
-            # Determine if profiling is needed based on the selected generator
-            should_profile = cfg.generator.name == 'profile_report'
+            # Profile if any of the selected generators needs it, or to infer
+            # foreign keys from the column sketches
+            generator_cfgs = select_generators(cfg, str(config_path))
+            should_profile = needs_profile(generator_cfgs) or cfg.infer_foreign_keys
+
+            print(f"\nParsing database structure... (Profiling enabled: {should_profile}, Mode: {cfg.profile_mode}, Samples: {cfg.num_samples}, Workers: {cfg.max_workers})")
+            parser = DatabaseParser(
+                cfg.db_url,
+                max_workers=cfg.max_workers,
+                partition_rows=cfg.partition_rows,
+                executor=cfg.executor,
+                max_value_length=cfg.max_value_length,
+                approx_distinct=cfg.approx_distinct,
+            )
+            store = SchemaStore(cfg.store_path) if cfg.store_path else None
+            try:
+                previous = None
+                if store is not None and cfg.incremental:
+                    previous = store.load(cfg.db_url)
+                    if previous is None:
+                        print("No stored snapshot of this database yet; parsing all tables.")
+                db_structure = parser.parse(
+                    profile=should_profile,
+                    num_samples=cfg.num_samples,
+                    tables=OmegaConf.to_container(cfg.tables),
+                    include=OmegaConf.to_container(cfg.include),
+                    exclude=OmegaConf.to_container(cfg.exclude),
+                    profile_mode=cfg.profile_mode,
+                    sample_size=cfg.sample_size,
+                    sample_fraction=cfg.sample_fraction,
+                    time_budget=cfg.time_budget,
+                    previous=previous,
+                    track_changes=store is not None,
+                )
+                print("Database parsed successfully.")
 
-            print(f"\nParsing database structure... (Profiling enabled: {should_profile}, Samples: {cfg.num_samples})")
-            parser = DatabaseParser(cfg.db_url)
-            db_structure = parser.parse(profile=should_profile, num_samples=cfg.num_samples)
-            print("Database parsed successfully.")
+                if cfg.infer_foreign_keys:
+                    if cfg.verify_foreign_keys:
+                        with parser.engine.connect() as connection:
+                            inferred = infer_foreign_keys(db_structure, connection=connection)
+                    else:
+                        inferred = infer_foreign_keys(db_structure)
+                    applied = apply_foreign_keys(
+                        db_structure, inferred, min_confidence=cfg.foreign_key_min_confidence
+                    )
+                    print(f"Inferred {len(inferred)} foreign keys, {applied} with confidence >= {cfg.foreign_key_min_confidence}.")
+
+                if store is not None:
+                    fingerprint = store.save(db_structure, cfg.db_url)
+                    print(f"Schema saved to {cfg.store_path} (fingerprint {fingerprint[:12]}).")
+            finally:
+                if store is not None:
+                    store.close()
 
             os.makedirs(cfg.output_path, exist_ok=True)
-            
-            run_generator(db_structure, cfg.output_path, cfg.generator)
+
+            with ThreadPoolExecutor(max_workers=len(generator_cfgs)) as executor:
+                futures = [
+                    executor.submit(
+                        run_generator, db_structure, cfg.output_path, generator_cfg, cfg.output_compression
+                    )
+                    for generator_cfg in generator_cfgs
+                ]
+                for future in futures:
+                    future.result()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
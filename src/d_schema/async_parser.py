@@ -0,0 +1,140 @@
+# d_schema/async_parser.py
+
+import asyncio
+from typing import Optional, Sequence
+
+from .db_parser import DatabaseParser, _ProfilingRun
+from .profiling.aggregate import DEFAULT_MAX_COLUMNS_PER_STATEMENT
+from .profiling.sampling import DEFAULT_SAMPLE_SIZE
+from .profiling.scan import DEFAULT_BATCH_SIZE
+from .profiling.values import DEFAULT_MAX_VALUE_LENGTH
+from .reflection import TableCatalog
+from .structures import DatabaseSchema, TableInfo
+
+
+class AsyncDatabaseParser(DatabaseParser):
+    """
+    Extracts the structure of a database from asyncio code, using
+    SQLAlchemy's asyncio engine (e.g. sqlite+aiosqlite, postgresql+asyncpg,
+    mysql+aiomysql).
+
+    Tables are parsed concurrently on their own connections, with at most
+    `max_concurrency` tables in flight. Every table goes through the same
+    sample and profiling code as DatabaseParser (run through
+    `AsyncConnection.run_sync`), so the resulting DatabaseSchema is the same.
+    The event loop serves other tasks while statements wait on the database,
+    but the hashing and sketching of scanned rows runs on the loop's thread;
+    for heavy profiling, run DatabaseParser in a worker thread instead (e.g.
+    with `asyncio.to_thread`).
+    """
+
+    def __init__(
+        self,
+        db_url: str,
+        max_concurrency: int = 8,
+        max_columns_per_statement: int = DEFAULT_MAX_COLUMNS_PER_STATEMENT,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_value_length: Optional[int] = DEFAULT_MAX_VALUE_LENGTH,
+        approx_distinct: bool = False,
+    ):
+        """
+        Initializes the parser with an async database URL.
+
+        Args:
+            db_url: The SQLAlchemy database URL of an async driver.
+            max_concurrency: Number of tables parsed concurrently. Each uses
+                its own pooled connection.
+            max_columns_per_statement: Maximum number of columns profiled by a
+                single fused aggregate statement.
+            batch_size: Number of rows fetched per batch by the streaming scan.
+            max_value_length: Maximum number of characters of sample, min/max
+                and top-k values (None for no limit).
+            approx_distinct: Whether distinct counts may be approximate.
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        super().__init__(
+            db_url,
+            max_columns_per_statement=max_columns_per_statement,
+            batch_size=batch_size,
+            max_value_length=max_value_length,
+            approx_distinct=approx_distinct,
+        )
+
+    def _create_engine(self, db_url: str):
+        """Creates an asyncio engine, with a pool sized for `max_concurrency` tables."""
+        try:
+            from sqlalchemy.ext.asyncio import create_async_engine
+        except ImportError as e:
+            raise ImportError(
+                "AsyncDatabaseParser requires SQLAlchemy's asyncio extension (pip install greenlet)."
+            ) from e
+        return create_async_engine(db_url, **self._pool_options(db_url, self.max_concurrency))
+
+    async def parse(
+        self,
+        profile: bool = False,
+        num_samples: int = 5,
+        tables: Optional[Sequence[str]] = None,
+        include: Optional[Sequence[str]] = None,
+        exclude: Optional[Sequence[str]] = None,
+        profile_mode: str = "full",
+        sample_size: int = DEFAULT_SAMPLE_SIZE,
+        sample_fraction: Optional[float] = None,
+        time_budget: Optional[float] = None,
+        previous: Optional[DatabaseSchema] = None,
+        track_changes: bool = False,
+    ) -> DatabaseSchema:
+        """
+        Parses the database and returns a DatabaseSchema object.
+
+        Takes the same arguments as `DatabaseParser.parse`.
+        """
+        run = self._new_run(profile, profile_mode, sample_size, sample_fraction, time_budget)
+        async with self.engine.connect() as connection:
+            table_names, catalog, carried = await connection.run_sync(
+                self._read_catalog, tables, include, exclude, run, previous, track_changes
+            )
+        changed_names = [table_name for table_name in table_names if table_name not in carried]
+
+        concurrency = self.max_concurrency if self._supports_concurrency() else 1
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def parse_one(table_name: str) -> Optional[TableInfo]:
+            async with semaphore:
+                return await self._parse_table_async(
+                    table_name, catalog.get(table_name), num_samples, run
+                )
+
+        results = await asyncio.gather(*(parse_one(table_name) for table_name in changed_names))
+        parsed = dict(zip(changed_names, results))
+        parsed.update(carried)
+        tables_info = [parsed[table_name] for table_name in table_names if parsed[table_name] is not None]
+        return DatabaseSchema(db_name=self._database_name(), tables=tables_info)
+
+    async def _parse_table_async(
+        self,
+        table_name: str,
+        table_catalog: Optional[TableCatalog],
+        num_samples: int,
+        run: Optional[_ProfilingRun] = None,
+    ) -> Optional[TableInfo]:
+        """
+        Extracts (and optionally profiles) a single table on its own connection.
+        Errors are reported and isolated so that the other tables still parse.
+        """
+        if table_catalog is None:
+            print(f"Could not find table '{table_name}' in reflected catalog. Skipping.")
+            return None
+
+        try:
+            async with self.engine.connect() as connection:
+                return await connection.run_sync(
+                    self._parse_table_on, table_catalog, num_samples, run
+                )
+        except Exception as e:
+            print(f"Could not parse table '{table_name}': {e}")
+            return None
+
+    async def dispose(self):
+        """Closes all pooled connections of the async engine."""
+        await self.engine.dispose()
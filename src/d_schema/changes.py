@@ -0,0 +1,100 @@
+# d_schema/changes.py
+
+from typing import Dict, List, Optional
+
+from sqlalchemy import select, func, text
+from sqlalchemy.exc import SQLAlchemyError
+
+from .profiling.sampling import range_key
+from .reflection import TableCatalog
+
+
+def read_change_signals(connection, catalog: Dict[str, TableCatalog]) -> Dict[str, Optional[str]]:
+    """
+    Reads a cheap signature of the data of every table. Two runs that read
+    the same signature for a table consider its data unchanged.
+
+    PostgreSQL uses the insert/update/delete counters of pg_stat_user_tables
+    and MySQL the UPDATE_TIME of information_schema.tables, both read for
+    all tables in one query. Everywhere else (and for MySQL tables without
+    an UPDATE_TIME) the signature is the row count plus the largest rowid or
+    integer primary key, which catches inserts and deletes but not updates
+    in place.
+
+    Args:
+        connection: An open SQLAlchemy connection.
+        catalog: The catalog entries of the tables, keyed by table name.
+
+    Returns:
+        A dict mapping table names to their signature, or to None if none
+        could be read (the table then counts as changed).
+    """
+    table_names = list(catalog)
+    if not table_names:
+        return {}
+    reader = _SIGNAL_READERS.get(connection.dialect.name)
+    signals: Dict[str, Optional[str]] = {}
+    if reader is not None:
+        try:
+            signals = reader(connection, table_names)
+        except SQLAlchemyError as e:
+            connection.rollback()
+            print(f"Could not read change counters: {e}")
+            signals = {}
+
+    for table_name in table_names:
+        if signals.get(table_name) is None:
+            signals[table_name] = _read_row_signal(connection, catalog[table_name])
+    return signals
+
+
+def _read_row_signal(connection, table_catalog: TableCatalog) -> Optional[str]:
+    """Returns the row count and largest key of a table as its signature."""
+    meta_table = table_catalog.query_table()
+    key = range_key(connection, meta_table, table_catalog.primary_keys)
+    expressions = [func.count()] if key is None else [func.count(), func.max(key)]
+    try:
+        row = connection.execute(select(*expressions).select_from(meta_table)).one()
+    except SQLAlchemyError as e:
+        connection.rollback()
+        print(f"Could not read the change signal of table {table_catalog.name}: {e}")
+        return None
+    return ":".join(str(value) for value in row)
+
+
+# --- PostgreSQL ---
+
+def _read_postgresql(connection, table_names: List[str]) -> Dict[str, Optional[str]]:
+    rows = connection.execute(
+        text(
+            "SELECT relname, n_tup_ins, n_tup_upd, n_tup_del FROM pg_catalog.pg_stat_user_tables "
+            "WHERE schemaname = current_schema() AND relname = ANY(:names)"
+        ),
+        {"names": table_names},
+    ).all()
+    return {name: f"pg:{inserted}:{updated}:{deleted}" for name, inserted, updated, deleted in rows}
+
+
+# --- MySQL ---
+
+def _read_mysql(connection, table_names: List[str]) -> Dict[str, Optional[str]]:
+    rows = connection.execute(
+        text(
+            "SELECT table_name, update_time FROM information_schema.tables "
+            "WHERE table_schema = DATABASE()"
+        )
+    ).all()
+    wanted = set(table_names)
+    # UPDATE_TIME is NULL for tables not modified since the server started
+    return {
+        name: f"mysql:{update_time.isoformat()}"
+        for name, update_time in rows
+        if name in wanted and update_time is not None
+    }
+
+
+_SIGNAL_READERS = {
+    "postgresql": _read_postgresql,
+    "mysql": _read_mysql,
+    "mariadb": _read_mysql,
+}
@@ -1,9 +1,36 @@
 # d_schema/db_parser.py
 
 import os
-from sqlalchemy import create_engine, inspect, select, distinct, func, MetaData, String, Date
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import create_engine, inspect, select, func
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import NullPool, QueuePool
 from sqlalchemy.exc import SQLAlchemyError
-from datasketch import MinHash, LeanMinHash
+from .profiling.aggregate import DEFAULT_MAX_COLUMNS_PER_STATEMENT, profile_aggregates
+from .profiling.partition import plan_partitions, scan_partitions
+from .profiling.catalog_stats import TableStatistics, apply_catalog_statistics, read_catalog_statistics
+from .profiling.planner import STRATEGIES, ProfilingPlanner, TablePlan, estimate_row_count, missing_fields
+from .profiling.sampling import (
+    DEFAULT_SAMPLE_SIZE,
+    build_sample_statement,
+    margin_of_error,
+    resolve_sample_size,
+)
+from .profiling.scan import DEFAULT_BATCH_SIZE, TableScanner
+from .profiling.values import DEFAULT_MAX_VALUE_LENGTH, display_value, is_binary_type
+from .profiling.timeouts import (
+    ProfilingTimeout,
+    StatementDeadline,
+    active_deadline,
+    statement_deadline,
+)
+from .changes import read_change_signals
+from .sample_values import fetch_sample_values
+from .store import table_fingerprint
+from .reflection import TableCatalog, filter_table_names, reflect_catalog
 from .structures import (
     DatabaseSchema,
     TableInfo,
@@ -12,132 +39,650 @@ from .structures import (
     ColumnProfile,
 )
 
+PROFILE_MODES = ("full", "sample", "catalog", "auto")
+
+EXECUTORS = ("thread", "process")
+
+# Fields a strategy is expected to fill for every column
+_EXPECTED_COLUMN_FIELDS = {
+    "full": ["null_count", "distinct_count", "top_k_values", "minhash_sketch"],
+    "sample": ["null_count", "distinct_count", "top_k_values", "minhash_sketch"],
+    "catalog": [],
+}
+
+
+@dataclass
+class _ProfilingRun:
+    """
+    Settings and shared state of the profiling part of one parse() call.
+    """
+    mode: str
+    sample_size: int = DEFAULT_SAMPLE_SIZE
+    sample_fraction: Optional[float] = None
+    statistics: Dict[str, TableStatistics] = field(default_factory=dict)
+    plans: Dict[str, TablePlan] = field(default_factory=dict)
+    deadline: Optional[StatementDeadline] = None
+
+
 class DatabaseParser:
     """
     Connects to a database and extracts its structure into a self-contained format.
     """
 
-    def __init__(self, db_url: str):
+    def __init__(
+        self,
+        db_url: str,
+        max_workers: int = 1,
+        max_columns_per_statement: int = DEFAULT_MAX_COLUMNS_PER_STATEMENT,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        partition_rows: Optional[int] = None,
+        executor: str = "thread",
+        max_value_length: Optional[int] = DEFAULT_MAX_VALUE_LENGTH,
+        approx_distinct: bool = False,
+    ):
         """
         Initializes the parser with a database URL.
 
         Args:
             db_url: The SQLAlchemy database URL.
+            max_workers: Number of tables parsed and profiled concurrently. Each
+                worker uses its own pooled connection.
+            max_columns_per_statement: Maximum number of columns profiled by a
+                single fused aggregate statement.
+            batch_size: Number of rows fetched per batch by the streaming scan.
+            partition_rows: If set (and max_workers > 1), fully profiled
+                tables spanning more keys than this are split into ranges of
+                their rowid or integer primary key, which are scanned by up
+                to `max_workers` connections in parallel.
+            executor: "thread" runs the workers as threads of this process.
+                "process" runs every worker in its own process with its own
+                engine, so that CPU-bound sketch construction is not limited
+                by the GIL. Tables are not partitioned in "process" mode.
+            max_value_length: Sample, min/max and top-k values of long text
+                are cut to this many characters by the database before they
+                are transferred (None for no limit). Values of binary columns
+                are never transferred.
+            approx_distinct: If True, full profiles skip the exact
+                COUNT(DISTINCT) and use the dialect's native approximation,
+                or else the HyperLogLog built during the streaming scan.
+                Approximate counts are marked as estimates.
+        """
+        if executor not in EXECUTORS:
+            raise ValueError(f"Unknown executor '{executor}'. Expected one of {', '.join(EXECUTORS)}.")
+        self.db_url = db_url
+        self.executor = executor
+        self.max_workers = max(1, max_workers)
+        self.partition_rows = partition_rows
+        self.max_columns_per_statement = max_columns_per_statement
+        self.batch_size = batch_size
+        self.max_value_length = max_value_length
+        self.approx_distinct = approx_distinct
+        self.engine = self._create_engine(db_url)
+
+    def _create_engine(self, db_url: str):
+        """Creates the engine of the parser, with a pool sized for its workers."""
+        return create_engine(
+            db_url, **self._pool_options(db_url, self.max_workers, self.partition_rows is not None)
+        )
+
+    @staticmethod
+    def _pool_options(db_url: str, max_workers: int, partitioned: bool = False) -> dict:
+        """
+        Sizes the connection pool so that every worker can hold a connection
+        while the main thread keeps one for reflection. With partitioning,
+        every table worker may additionally open one connection per partition
+        worker.
         """
-        self.engine = create_engine(db_url)
+        url = make_url(db_url)
+        pool_class = url.get_dialect().get_pool_class(url)
+        if max_workers > 1 and issubclass(pool_class, QueuePool):
+            options = {"pool_size": max_workers + 1}
+            if partitioned:
+                options["max_overflow"] = max_workers * max_workers
+            return options
+        return {}
 
-    def parse(self, profile: bool = False, num_samples: int = 5) -> DatabaseSchema:
+    def _supports_concurrency(self) -> bool:
+        """
+        Returns True if pooled connections can be used from several threads.
+        In-memory SQLite databases are bound to a single connection (or one
+        database per thread), so they are always parsed sequentially.
+        """
+        return isinstance(self.engine.pool, (QueuePool, NullPool))
+
+    def parse(
+        self,
+        profile: bool = False,
+        num_samples: int = 5,
+        tables: Optional[Sequence[str]] = None,
+        include: Optional[Sequence[str]] = None,
+        exclude: Optional[Sequence[str]] = None,
+        profile_mode: str = "full",
+        sample_size: int = DEFAULT_SAMPLE_SIZE,
+        sample_fraction: Optional[float] = None,
+        time_budget: Optional[float] = None,
+        previous: Optional[DatabaseSchema] = None,
+        track_changes: bool = False,
+    ) -> DatabaseSchema:
         """
         Parses the database and returns a DatabaseSchema object.
 
+        Table filters are applied before anything else, so excluded tables
+        never cost a catalog query or a scan. The catalog of the selected
+        tables is read up front with the inspector's
+        multi-table methods; tables are then processed by up to `max_workers`
+        threads. The order of
+        `DatabaseSchema.tables` always follows the order reported by the
+        inspector, regardless of which table finishes first.
+
         Args:
             profile: If True, performs detailed profiling of the data.
+            num_samples: Number of distinct sample values fetched per column.
+            tables: Explicit list of tables to parse. Defaults to all tables.
+            include: Glob patterns (or regular expressions prefixed with "re:")
+                selecting the tables to parse.
+            exclude: Glob patterns (or regular expressions prefixed with "re:")
+                of tables to leave out.
+            profile_mode: How profiles are computed if `profile` is True.
+                "full" scans the data; "sample" profiles a sample of each table
+                and scales the counts up; "catalog" reads the database's
+                optimizer statistics instead, without any data scan; "auto"
+                picks one of these (or skips profiling) per table to fit
+                `time_budget`. Values that are not exact are marked as
+                estimates.
+            sample_size: Number of rows sampled per table in "sample" mode.
+            sample_fraction: Fraction of each table sampled in "sample" mode.
+                Takes precedence over `sample_size` if given.
+            time_budget: Total seconds available for profiling in "auto" mode.
+                Statements still running when a table's share of the budget
+                is used up are cancelled.
+            previous: An earlier snapshot of the same database. Tables whose
+                structure and change signal (see `read_change_signals`) are
+                the same as in the snapshot, and that were profiled the same
+                way, are carried over from it instead of being sampled and
+                profiled again.
+            track_changes: Record the change signal of every table, so that
+                the result can serve as `previous` of a later parse. Implied
+                by `previous`.
 
         Returns:
             A DatabaseSchema object containing the database structure.
         """
+        run = self._new_run(profile, profile_mode, sample_size, sample_fraction, time_budget)
+        with self.engine.connect() as connection:
+            table_names, catalog, carried = self._read_catalog(
+                connection, tables, include, exclude, run, previous, track_changes
+            )
+        changed_names = [table_name for table_name in table_names if table_name not in carried]
+
+        def parse_one(table_name: str) -> Optional[TableInfo]:
+            return self._parse_table(table_name, catalog.get(table_name), num_samples, run)
+
+        if self.max_workers > 1 and len(changed_names) > 1 and self._supports_concurrency():
+            if self.executor == "process":
+                results = self._parse_tables_in_processes(changed_names, catalog, num_samples, run)
+            else:
+                with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                    results = list(executor.map(parse_one, changed_names))
+        else:
+            results = [parse_one(table_name) for table_name in changed_names]
+
+        parsed = dict(zip(changed_names, results))
+        parsed.update(carried)
+        tables_info = [parsed[table_name] for table_name in table_names if parsed[table_name] is not None]
+        return DatabaseSchema(db_name=self._database_name(), tables=tables_info)
+
+    @staticmethod
+    def _new_run(
+        profile: bool,
+        profile_mode: str,
+        sample_size: int,
+        sample_fraction: Optional[float],
+        time_budget: Optional[float],
+    ) -> Optional[_ProfilingRun]:
+        """Validates the profiling arguments of parse() and bundles them."""
+        if profile_mode not in PROFILE_MODES:
+            raise ValueError(
+                f"Unknown profile_mode '{profile_mode}'. Expected one of {', '.join(PROFILE_MODES)}."
+            )
+        if profile_mode == "auto" and time_budget is None:
+            raise ValueError("profile_mode 'auto' requires a time_budget.")
+        if not profile:
+            return None
+        return _ProfilingRun(
+            mode=profile_mode,
+            sample_size=sample_size,
+            sample_fraction=sample_fraction,
+            deadline=StatementDeadline(time_budget if profile_mode == "auto" else None),
+        )
+
+    def _database_name(self) -> str:
         db_name = self.engine.url.database
         # For SQLite, the database name is the file path. Let's just get the filename without the extension.
         if self.engine.dialect.name == 'sqlite':
             basename = os.path.basename(db_name)
             db_name, _ = os.path.splitext(basename)
+        return db_name
 
-        tables_info = []
-        inspector = inspect(self.engine)
-        metadata = MetaData()
-        metadata.reflect(bind=self.engine)
+    def _read_catalog(
+        self,
+        connection,
+        tables: Optional[Sequence[str]],
+        include: Optional[Sequence[str]],
+        exclude: Optional[Sequence[str]],
+        run: Optional[_ProfilingRun],
+        previous: Optional[DatabaseSchema] = None,
+        track_changes: bool = False,
+    ) -> Tuple[List[str], Dict[str, TableCatalog], Dict[str, TableInfo]]:
+        """
+        Selects the tables to parse and reads their catalog entries, plus the
+        catalog statistics and plans the profiling run needs.
 
-        table_names = inspector.get_table_names()
+        Returns:
+            The selected table names, their catalog entries, and the tables
+            carried over unchanged from `previous`, keyed by name.
+        """
+        inspector = inspect(connection)
+        table_names = filter_table_names(
+            inspector.get_table_names(), tables=tables, include=include, exclude=exclude
+        )
+        catalog = reflect_catalog(inspector, table_names)
 
-        with self.engine.connect() as connection:
-            for table_name in table_names:
-                columns_info = []
-                pk_constraint = inspector.get_pk_constraint(table_name)
-                primary_keys = pk_constraint.get("constrained_columns", [])
-                columns = inspector.get_columns(table_name)
-                foreign_keys = inspector.get_foreign_keys(table_name)
-
-                meta_table = metadata.tables.get(table_name)
-                if meta_table is None:
-                    print(f"Could not find table '{table_name}' in reflected metadata. Skipping.")
-                    continue
-
-                for column in columns:
-                    is_primary_key = column["name"] in primary_keys
-                    fk_info = next(
-                        (
-                            fk
-                            for fk in foreign_keys
-                            if column["name"] in fk["constrained_columns"]
-                        ),
-                        None,
-                    )
-                    foreign_key_str = (
-                        f"REFERENCES {fk_info['referred_table']}({fk_info['referred_columns'][0]})"
-                        if fk_info
-                        else None
-                    )
-
-                    # Fetch sample values
-                    try:
-                        meta_column = meta_table.c[column["name"]]
-                        if isinstance(column["type"], Date):
-                            query = (
-                                select(meta_column.cast(String))
-                                .distinct()
-                                .where(meta_column.isnot(None))
-                                .limit(num_samples)
-                            )
-                        else:
-                            query = (
-                                select(meta_column)
-                                .distinct()
-                                .where(meta_column.isnot(None))
-                                .limit(num_samples)
-                            )
-                        result = connection.execute(query)
-                        samples = [str(row[0]) for row in result]
-                    except SQLAlchemyError as e:
-                        print(
-                            f"Could not fetch samples for {table_name}.{column['name']}: {e}"
-                        )
-                        samples = []
-
-                    columns_info.append(
-                        ColumnInfo(
-                            name=column["name"],
-                            type=str(column["type"]),
-                            nullable=column["nullable"],
-                            primary_key=is_primary_key,
-                            foreign_key=foreign_key_str,
-                            comment=column.get("comment"),
-                            samples=samples,
-                        )
-                    )
-
-                table_info = TableInfo(name=table_name, columns=columns_info)
-
-                if profile:
-                    self._profile_table_and_columns(
-                        connection, table_info, meta_table
-                    )
-
-                tables_info.append(table_info)
-
-        return DatabaseSchema(db_name=db_name, tables=tables_info)
+        carried: Dict[str, TableInfo] = {}
+        if previous is not None or track_changes:
+            for table_name, signal in read_change_signals(connection, catalog).items():
+                catalog[table_name].change_signal = signal
+        if previous is not None:
+            carried = self._unchanged_tables(catalog, previous, run)
+            print(f"Incremental parse: {len(carried)} of {len(table_names)} tables unchanged.")
+        changed = {name: entry for name, entry in catalog.items() if name not in carried}
+
+        if run is not None and run.mode in ("catalog", "sample", "auto"):
+            # Sampling and planning use the catalog's row count estimates
+            run.statistics = read_catalog_statistics(connection, list(changed))
+        if run is not None and run.mode == "auto":
+            run.plans = self._plan_profiling(connection, changed, run)
+        return table_names, catalog, carried
+
+    def _unchanged_tables(
+        self,
+        catalog: Dict[str, TableCatalog],
+        previous: DatabaseSchema,
+        run: Optional[_ProfilingRun],
+    ) -> Dict[str, TableInfo]:
+        """
+        Finds the tables of `previous` that can be reused: same structure,
+        same change signal, and profiled if and only if this run profiles,
+        with a strategy this run could have chosen.
+        """
+        previous_tables = {table_info.name: table_info for table_info in previous.tables}
+        unchanged = {}
+        for table_name, table_catalog in catalog.items():
+            old = previous_tables.get(table_name)
+            if old is None or table_catalog.change_signal is None:
+                continue
+            if old.change_signal != table_catalog.change_signal:
+                continue
+            if (old.profile is None) != (run is None):
+                continue
+            if run is not None and not self._same_profiling(old.profile.strategy, run):
+                continue
+            if table_fingerprint(self._build_table_info(table_catalog)) != table_fingerprint(old):
+                continue
+            unchanged[table_name] = old
+        return unchanged
+
+    @staticmethod
+    def _same_profiling(strategy: Optional[str], run: _ProfilingRun) -> bool:
+        """Returns True if a table profiled with `strategy` counts as profiled the way `run` profiles."""
+        if run.mode == "auto":
+            return strategy in STRATEGIES
+        return strategy == run.mode
+
+    def _parse_tables_in_processes(
+        self,
+        table_names: Sequence[str],
+        catalog: Dict[str, TableCatalog],
+        num_samples: int,
+        run: Optional[_ProfilingRun],
+    ) -> List[Optional[TableInfo]]:
+        """
+        Parses tables in a pool of `max_workers` processes. Every process opens
+        its own engine; catalog entries and profiling settings are sent to the
+        workers, and finished TableInfo objects (with serialized sketches) are
+        sent back.
+        """
+        worker_options = {
+            "max_columns_per_statement": self.max_columns_per_statement,
+            "batch_size": self.batch_size,
+            "max_value_length": self.max_value_length,
+            "approx_distinct": self.approx_distinct,
+        }
+        tasks = [
+            (table_name, catalog.get(table_name), num_samples, run)
+            for table_name in table_names
+        ]
+        with ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_init_worker_parser,
+            initargs=(self.db_url, worker_options),
+        ) as executor:
+            return list(executor.map(_parse_table_in_worker, tasks))
+
+    def _parse_table(
+        self,
+        table_name: str,
+        table_catalog: Optional[TableCatalog],
+        num_samples: int,
+        run: Optional[_ProfilingRun] = None,
+    ) -> Optional[TableInfo]:
+        """
+        Extracts (and optionally profiles) a single table on its own connection.
+        Errors are reported and isolated so that the other tables still parse.
+        """
+        if table_catalog is None:
+            print(f"Could not find table '{table_name}' in reflected catalog. Skipping.")
+            return None
+
+        try:
+            with self.engine.connect() as connection:
+                return self._parse_table_on(connection, table_catalog, num_samples, run)
+        except Exception as e:
+            print(f"Could not parse table '{table_name}': {e}")
+            return None
+
+    def _parse_table_on(
+        self,
+        connection,
+        table_catalog: TableCatalog,
+        num_samples: int,
+        run: Optional[_ProfilingRun] = None,
+    ) -> TableInfo:
+        """Extracts (and optionally profiles) a single table on the given connection."""
+        meta_table = table_catalog.query_table()
+        samples = fetch_sample_values(
+            connection, meta_table, table_catalog.columns, num_samples,
+            max_length=self.max_value_length,
+        )
+        table_info = self._build_table_info(table_catalog, samples)
+
+        if run is not None:
+            self._profile_table(connection, table_info, meta_table, run)
+            self._limit_profile_values(table_info)
+
+        return table_info
+
+    @staticmethod
+    def _build_table_info(
+        table_catalog: TableCatalog, samples: Optional[Dict[str, List[str]]] = None
+    ) -> TableInfo:
+        """Builds the TableInfo of a catalog entry, with the given sample values."""
+        primary_keys = table_catalog.primary_keys
+        foreign_keys = table_catalog.foreign_keys
+        samples = samples or {}
+        columns_info = []
+        for column in table_catalog.columns:
+            is_primary_key = column["name"] in primary_keys
+            fk_info = next(
+                (
+                    fk
+                    for fk in foreign_keys
+                    if column["name"] in fk["constrained_columns"]
+                ),
+                None,
+            )
+            foreign_key_str = (
+                f"REFERENCES {fk_info['referred_table']}({fk_info['referred_columns'][0]})"
+                if fk_info
+                else None
+            )
+
+            columns_info.append(
+                ColumnInfo(
+                    name=column["name"],
+                    type=str(column["type"]),
+                    nullable=column["nullable"],
+                    primary_key=is_primary_key,
+                    foreign_key=foreign_key_str,
+                    comment=column.get("comment"),
+                    samples=samples.get(column["name"], []),
+                )
+            )
+
+        return TableInfo(
+            name=table_catalog.name,
+            columns=columns_info,
+            comment=table_catalog.comment,
+            change_signal=table_catalog.change_signal,
+        )
+
+    def _limit_profile_values(self, table_info: TableInfo):
+        """
+        Cuts the min/max and top-k values of all column profiles to
+        `max_value_length` characters, whichever strategy produced them, and
+        drops them for binary columns.
+        """
+        for column_info in table_info.columns:
+            col_profile = column_info.profile
+            if col_profile is None:
+                continue
+            if is_binary_type(column_info.type):
+                col_profile.min_value = col_profile.max_value = None
+                col_profile.top_k_values = []
+                continue
+            if col_profile.min_value is not None:
+                col_profile.min_value = display_value(col_profile.min_value, self.max_value_length)
+            if col_profile.max_value is not None:
+                col_profile.max_value = display_value(col_profile.max_value, self.max_value_length)
+            col_profile.top_k_values = [
+                (display_value(value, self.max_value_length), count)
+                for value, count in col_profile.top_k_values
+            ]
+
+    def _plan_profiling(self, connection, catalog: Dict[str, TableCatalog], run: _ProfilingRun) -> Dict[str, TablePlan]:
+        """
+        Estimates the size of every table (from catalog statistics where
+        available) and plans a profiling strategy per table within the budget.
+        """
+        row_counts = {}
+        for table_name, table_catalog in catalog.items():
+            statistics = run.statistics.get(table_name)
+            if statistics is not None and statistics.row_count is not None:
+                row_counts[table_name] = statistics.row_count
+            else:
+                row_counts[table_name] = estimate_row_count(connection, table_catalog.query_table())
+
+        planner = ProfilingPlanner(
+            time_budget=max(0.0, run.deadline.remaining()),
+            max_workers=self.max_workers if self._supports_concurrency() else 1,
+            sample_size=run.sample_size,
+        )
+        plans = planner.plan(
+            row_counts,
+            column_counts={name: len(entry.columns) for name, entry in catalog.items()},
+            has_statistics={name: name in run.statistics for name in catalog},
+        )
+        for table_name, plan in plans.items():
+            print(f"Planned profiling of {table_name}: {plan.strategy} (~{plan.estimated_rows} rows)")
+        return plans
+
+    def _profile_table(self, connection, table_info: TableInfo, meta_table, run: _ProfilingRun):
+        """
+        Profiles a table with the strategy of the run's mode, or with the
+        planned strategy and time limit in "auto" mode.
+        """
+        if run.mode == "auto":
+            self._profile_table_planned(connection, table_info, meta_table, run)
+            return
+        self._profile_with_strategy(run.mode, connection, table_info, meta_table, run)
+        if table_info.profile is not None:
+            table_info.profile.strategy = run.mode
+
+    def _profile_with_strategy(self, strategy: str, connection, table_info: TableInfo, meta_table, run: _ProfilingRun):
+        statistics = run.statistics.get(table_info.name)
+        if strategy == "catalog":
+            apply_catalog_statistics(table_info, statistics)
+        elif strategy == "sample":
+            self._profile_table_sampled(
+                connection, table_info, meta_table, statistics,
+                run.sample_size, run.sample_fraction,
+            )
+        elif strategy == "full":
+            self._profile_table_and_columns(connection, table_info, meta_table)
+
+    def _profile_table_planned(self, connection, table_info: TableInfo, meta_table, run: _ProfilingRun):
+        """
+        Runs the planned strategy of a table under a hard time limit. If the
+        time runs out, whatever was computed is kept, missing table-level
+        information falls back to catalog statistics, and the fields that
+        could not be computed are recorded in `TableProfile.degraded_fields`.
+        """
+        table_name = table_info.name
+        plan = run.plans[table_name]
+        statistics = run.statistics.get(table_name)
+        strategy = plan.strategy
+        degraded_fields = []
+
+        remaining = run.deadline.remaining()
+        if strategy in ("full", "sample") and remaining <= 0:
+            print(f"  - Time budget exhausted before profiling {table_name}.")
+            degraded_fields = list(_EXPECTED_COLUMN_FIELDS[strategy])
+            strategy = "catalog" if statistics is not None else "skip"
+
+        if strategy in ("full", "sample"):
+            with statement_deadline(connection, min(plan.allotted_seconds, remaining)) as deadline:
+                try:
+                    self._profile_with_strategy(strategy, connection, table_info, meta_table, run)
+                except ProfilingTimeout:
+                    pass
+            if deadline.expired:
+                print(f"  - Profiling of {table_name} hit its time limit.")
+                degraded_fields = missing_fields(
+                    [col.profile for col in table_info.columns], _EXPECTED_COLUMN_FIELDS[strategy]
+                )
+                if table_info.profile is None:
+                    degraded_fields.insert(0, "record_count")
+                    if statistics is not None:
+                        apply_catalog_statistics(table_info, statistics)
+                        strategy = "catalog"
+        elif strategy == "catalog":
+            apply_catalog_statistics(table_info, statistics)
+        else:
+            print(f"  - Skipping profiling of {table_name} to stay within the time budget.")
+
+        if table_info.profile is None:
+            table_info.profile = TableProfile(record_count=plan.estimated_rows)
+            if plan.estimated_rows is not None:
+                table_info.profile.estimated_fields = ["record_count"]
+        table_info.profile.strategy = strategy
+        table_info.profile.degraded_fields = degraded_fields
+
+    def _profile_table_sampled(
+        self,
+        connection,
+        table_info: TableInfo,
+        meta_table,
+        table_statistics: Optional[TableStatistics],
+        sample_size: int,
+        sample_fraction: Optional[float],
+    ):
+        """
+        Profiles a table from a sample of its rows. Counts are scaled up to the
+        table's size and, like all sampled values, marked as estimates.
+        Tables no larger than the sample are profiled in full instead.
+        """
+        table_name = table_info.name
+        print(f"Profiling table (sampled): {table_name}...")
+
+        estimated_fields = []
+        if table_statistics is not None and table_statistics.row_count is not None:
+            total_rows = table_statistics.row_count
+            estimated_fields.append("record_count")
+        else:
+            try:
+                total_rows = connection.execute(
+                    select(func.count()).select_from(meta_table)
+                ).scalar_one()
+            except SQLAlchemyError as e:
+                print(f"  - Could not get record count for {table_name}: {e}")
+                return
+
+        rows_to_sample = resolve_sample_size(total_rows, sample_size, sample_fraction)
+        if total_rows <= rows_to_sample:
+            self._profile_table_and_columns(connection, table_info, meta_table)
+            return
+
+        primary_keys = [col.name for col in table_info.columns if col.primary_key]
+        scanner = TableScanner(meta_table, batch_size=self.batch_size, track_frequencies=True)
+        try:
+            statement, method = build_sample_statement(
+                connection, meta_table, primary_keys, total_rows, rows_to_sample
+            )
+            scanner.scan(connection, statement)
+        except SQLAlchemyError as e:
+            print(f"  - Could not sample table {table_name}: {e}")
+            return
+
+        sampled_rows = scanner.row_count
+        table_info.profile = TableProfile(
+            record_count=total_rows,
+            estimated_fields=estimated_fields,
+            sample_size=sampled_rows,
+            sample_method=method,
+            margin_of_error=margin_of_error(sampled_rows, total_rows),
+        )
+        if sampled_rows == 0:
+            print("  - Sample is empty, skipping column profiling.")
+            return
+
+        for column_info in table_info.columns:
+            col_profile = ColumnProfile()
+            scanner.accumulators[column_info.name].apply_sample_to(col_profile, total_rows)
+            column_info.profile = col_profile
 
     def _profile_table_and_columns(self, connection, table_info: TableInfo, meta_table):
         """
         Performs data profiling for a given table and its columns.
+
+        Null counts, distinct counts, min/max values and average lengths of all
+        columns are computed together with the record count by a single fused
+        aggregate statement per batch of columns. MinHash sketches and numeric
+        moments are then computed for all columns from one streaming scan,
+        which also estimates the distinct counts left out by `approx_distinct`
+        and finds the most frequent values with a heavy-hitters summary.
+        Tables larger than `partition_rows` are instead scanned in parallel
+        key ranges (see `_profile_table_partitioned`).
         """
         table_name = table_info.name
+        if self.partition_rows is not None and self.max_workers > 1 and self._supports_concurrency():
+            primary_keys = [col.name for col in table_info.columns if col.primary_key]
+            try:
+                conditions = plan_partitions(connection, meta_table, primary_keys, self.partition_rows)
+            except SQLAlchemyError:
+                # e.g. SQLite tables created WITHOUT ROWID
+                connection.rollback()
+                conditions = []
+            if conditions:
+                self._profile_table_partitioned(
+                    table_info, meta_table, conditions, active_deadline(connection)
+                )
+                return
+
         print(f"Profiling table: {table_name}...")
 
-        # Table-level profiling
+        column_profiles = {col.name: ColumnProfile() for col in table_info.columns}
+
+        # Table-level and aggregate column-level profiling
         try:
-            record_count = connection.execute(
-                select(func.count()).select_from(meta_table)
-            ).scalar_one()
+            record_count = profile_aggregates(
+                connection,
+                meta_table,
+                table_info.columns,
+                column_profiles,
+                self.max_columns_per_statement,
+                self.max_value_length,
+                self.approx_distinct,
+            )
             table_info.profile = TableProfile(record_count=record_count)
         except SQLAlchemyError as e:
             print(f"  - Could not get record count for {table_name}: {e}")
@@ -147,71 +692,78 @@ class DatabaseParser:
             print("  - Table is empty, skipping column profiling.")
             return
 
-        # Column-level profiling
+        # Single streaming pass for the client-side statistics and sketches.
+        # Top-k values come from its heavy-hitters summaries, so no column is
+        # grouped and sorted by the database.
+        scanner = TableScanner(meta_table, batch_size=self.batch_size)
+        try:
+            scanner.scan(connection)
+            scanner.apply_to(column_profiles)
+            for column_info in table_info.columns:
+                scanner.accumulators[column_info.name].apply_heavy_hitters_to(
+                    column_profiles[column_info.name]
+                )
+        except SQLAlchemyError as e:
+            print(f"  - Could not scan table {table_name}: {e}")
+
+        for column_info in table_info.columns:
+            column_info.profile = column_profiles[column_info.name]
+
+    def _profile_table_partitioned(
+        self,
+        table_info: TableInfo,
+        meta_table,
+        conditions,
+        deadline: Optional[StatementDeadline] = None,
+    ):
+        """
+        Profiles a table by scanning its key ranges on parallel connections and
+        merging the partial statistics of every partition.
+
+        Counts, min/max values, lengths, moments and MinHash sketches merge
+        exactly. Distinct counts come from merged HyperLogLog sketches and the
+        most frequent values from merged heavy-hitters summaries; both are
+        marked as estimates unless they are known to be exact.
+        """
+        table_name = table_info.name
+        print(f"Profiling table: {table_name} in {len(conditions)} partitions...")
+        try:
+            scanner = scan_partitions(
+                self.engine,
+                meta_table,
+                conditions,
+                self.max_workers,
+                batch_size=self.batch_size,
+                seconds=deadline.remaining() if deadline is not None else None,
+            )
+        except SQLAlchemyError as e:
+            print(f"  - Could not scan table {table_name}: {e}")
+            return
+
+        table_info.profile = TableProfile(record_count=scanner.row_count, partitions=len(conditions))
+        if scanner.row_count == 0:
+            print("  - Table is empty, skipping column profiling.")
+            return
+
         for column_info in table_info.columns:
-            col_name = column_info.name
-            meta_column = meta_table.c[col_name]
+            accumulator = scanner.accumulators[column_info.name]
             col_profile = ColumnProfile()
+            accumulator.apply_to(col_profile)
+            accumulator.apply_heavy_hitters_to(col_profile)
+            column_info.profile = col_profile
 
-            try:
-                # Null/Non-null count
-                null_count = connection.execute(
-                    select(func.count())
-                    .select_from(meta_table)
-                    .where(meta_column.is_(None))
-                ).scalar_one()
-                col_profile.null_count = null_count
-                col_profile.non_null_count = record_count - null_count
 
-                # Distinct count
-                distinct_count = connection.execute(
-                    select(func.count(distinct(meta_column)))
-                ).scalar_one()
-                col_profile.distinct_count = distinct_count
-
-                # Min/Max values (only for non-null values)
-                if col_profile.non_null_count > 0:
-                    min_max_query = select(func.min(meta_column), func.max(meta_column))
-                    min_val, max_val = connection.execute(min_max_query).first()
-                    col_profile.min_value = str(min_val) if min_val is not None else None
-                    col_profile.max_value = str(max_val) if max_val is not None else None
-
-                # String length analysis (for text-like types)
-                if "CHAR" in str(column_info.type) or "TEXT" in str(column_info.type):
-                    avg_len_query = select(func.avg(func.length(meta_column)))
-                    avg_len = connection.execute(avg_len_query).scalar_one()
-                    col_profile.avg_char_length = float(avg_len) if avg_len else 0.0
-
-                # Top-K frequent values
-                top_k_query = (
-                    select(meta_column, func.count().label("freq"))
-                    .where(meta_column.isnot(None))
-                    .group_by(meta_column)
-                    .order_by(func.count().desc())
-                    .limit(10)
-                )
-                top_k_result = connection.execute(top_k_query)
-                col_profile.top_k_values = [
-                    (str(row[0]), row[1]) for row in top_k_result
-                ]
-
-                # MinHash sketch
-                m = MinHash(num_perm=128)
-                # Use streaming results to avoid loading all data into memory
-                stream_query = select(meta_column).where(meta_column.isnot(None))
-                for row in connection.execute(stream_query):
-                    m.update(str(row[0]).encode("utf8"))
-                
-                # Convert to LeanMinHash for efficient serialization
-                lean_m = LeanMinHash(m)
-                buffer = bytearray(lean_m.bytesize())
-                lean_m.serialize(buffer)
-                col_profile.minhash_sketch = buffer
+# Parser of a worker process in "process" executor mode
+_worker_parser: Optional[DatabaseParser] = None
 
-            except SQLAlchemyError as e:
-                print(f"  - Could not fully profile column {table_name}.{col_name}: {e}")
-            except Exception as e:
-                print(f"  - An unexpected error occurred during profiling of {table_name}.{col_name}: {e}")
 
+def _init_worker_parser(db_url: str, options: dict):
+    """Creates the worker process's own parser and engine."""
+    global _worker_parser
+    _worker_parser = DatabaseParser(db_url, **options)
 
-            column_info.profile = col_profile
+
+def _parse_table_in_worker(task) -> Optional[TableInfo]:
+    """Parses one table in a worker process."""
+    table_name, table_catalog, num_samples, run = task
+    return _worker_parser._parse_table(table_name, table_catalog, num_samples, run)
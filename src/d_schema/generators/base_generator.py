@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import Any, Dict, Iterable, Iterator, List
 
 from d_schema.structures import TableInfo, ColumnInfo, DatabaseSchema
 
@@ -13,6 +13,10 @@ class BaseGenerator(ABC):
     of the schema (e.g., for a column or a table).
     """
 
+    # Whether the generator renders profile data, so the schema must be parsed
+    # with profiling enabled
+    requires_profile: bool = False
+
     def __init__(self, schema: DatabaseSchema):
         self.schema = schema
         self.tables = schema.tables
@@ -33,6 +37,45 @@ class BaseGenerator(ABC):
         """
         pass
 
+    @staticmethod
+    def estimate_prefix(profile, field_name: str) -> str:
+        """
+        Returns "~" if the given field of a TableProfile or ColumnProfile is an
+        estimate (e.g. read from catalog statistics), else an empty string.
+        """
+        if profile is not None and field_name in profile.estimated_fields:
+            return "~"
+        return ""
+
+    @staticmethod
+    def foreign_key_note(column: ColumnInfo) -> str:
+        """
+        Returns "inferred, confidence 0.93" if the column's foreign key was
+        inferred from the data rather than declared, else an empty string.
+        """
+        if column.foreign_key and column.foreign_key_confidence is not None:
+            return f"inferred, confidence {column.foreign_key_confidence:.2f}"
+        return ""
+
+    @staticmethod
+    def join_chunks(parts: Iterable[str], separator: str) -> Iterator[str]:
+        """
+        Yields the same text as `separator.join(parts)`, one part at a time.
+        """
+        for idx, part in enumerate(parts):
+            yield part if idx == 0 else separator + part
+
+    def iter_schema(self) -> Iterator[str]:
+        """
+        Yields the schema in chunks (generally one per table) whose
+        concatenation equals `generate_schema()`, so that large schemas can be
+        written out without building the whole text in memory.
+
+        The default yields the complete schema as a single chunk; generators
+        that stream override this and build `generate_schema` on it.
+        """
+        yield self.generate_schema()
+
     def generate_schema(self) -> str:
         """
         Assembles the final schema for all tables into a single string.
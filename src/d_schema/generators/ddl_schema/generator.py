@@ -1,4 +1,4 @@
-from typing import List, Dict, Any
+from typing import Any, Dict, Iterator, List
 
 from d_schema.structures import TableInfo, ColumnInfo, DatabaseSchema
 from d_schema.generators.base_generator import BaseGenerator
@@ -56,9 +56,11 @@ class DDLSchemaGenerator(BaseGenerator):
                 total = column.profile.non_null_count + column.profile.null_count
                 if total > 0:
                     non_null_pct = (column.profile.non_null_count / total) * 100
-                    profile_parts.append(f"{non_null_pct:.1f}% non-null")
+                    approx = self.estimate_prefix(column.profile, "null_count")
+                    profile_parts.append(f"{approx}{non_null_pct:.1f}% non-null")
             if column.profile.distinct_count is not None:
-                profile_parts.append(f"{column.profile.distinct_count} distinct")
+                approx = self.estimate_prefix(column.profile, "distinct_count")
+                profile_parts.append(f"{approx}{column.profile.distinct_count} distinct")
             
             if profile_parts:
                 comment_parts.append(f"Profile: {', '.join(profile_parts)}")
@@ -82,10 +84,12 @@ class DDLSchemaGenerator(BaseGenerator):
         if primary_keys:
             definitions.append(f"    PRIMARY KEY ({', '.join(primary_keys)})")
 
-        foreign_keys = [
-            f"    FOREIGN KEY ({col.name}) {col.foreign_key}" 
-            for col in table.columns if col.foreign_key
-        ]
+        foreign_keys = []
+        for col in table.columns:
+            if col.foreign_key:
+                fk_note = self.foreign_key_note(col)
+                foreign_key = f"    FOREIGN KEY ({col.name}) {col.foreign_key}"
+                foreign_keys.append(f"{foreign_key} /* {fk_note} */" if fk_note else foreign_key)
         definitions.extend(foreign_keys)
 
         statement_parts.append(",\n".join(definitions))
@@ -93,10 +97,14 @@ class DDLSchemaGenerator(BaseGenerator):
         
         return "\n".join(statement_parts)
 
+    def iter_schema(self) -> Iterator[str]:
+        """
+        Yields the DDL schema one table at a time.
+        """
+        return self.join_chunks((self.generate_table(table) for table in self.tables), "\n\n")
+
     def generate_schema(self) -> str:
         """
         Assembles the final DDL schema for all tables into a single string.
         """
-        schema_parts = [self.generate_table(table) for table in self.tables]
-        
-        return "\n\n".join(schema_parts)
+        return "".join(self.iter_schema())
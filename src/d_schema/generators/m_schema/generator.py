@@ -1,4 +1,4 @@
-from typing import List, Dict, Any
+from typing import Any, Dict, Iterator, List
 
 from d_schema.structures import TableInfo, ColumnInfo, DatabaseSchema
 from d_schema.generators.base_generator import BaseGenerator
@@ -30,7 +30,8 @@ class MSchemaGenerator(BaseGenerator):
 
         if column.foreign_key:
             fk_target = column.foreign_key.replace('REFERENCES ', '')
-            col_parts.append(f"Maps to {fk_target}")
+            fk_note = self.foreign_key_note(column)
+            col_parts.append(f"Maps to {fk_target} ({fk_note})" if fk_note else f"Maps to {fk_target}")
 
         if column.samples:
             samples_str = ", ".join([f"{s}" for s in column.samples])
@@ -42,9 +43,11 @@ class MSchemaGenerator(BaseGenerator):
                 total = column.profile.non_null_count + column.profile.null_count
                 if total > 0:
                     non_null_pct = (column.profile.non_null_count / total) * 100
-                    profile_parts.append(f"{non_null_pct:.1f}% non-null")
+                    approx = self.estimate_prefix(column.profile, "null_count")
+                    profile_parts.append(f"{approx}{non_null_pct:.1f}% non-null")
             if column.profile.distinct_count is not None:
-                profile_parts.append(f"{column.profile.distinct_count} distinct values")
+                approx = self.estimate_prefix(column.profile, "distinct_count")
+                profile_parts.append(f"{approx}{column.profile.distinct_count} distinct values")
             if profile_parts:
                 col_parts.append(f"Profile: {', '.join(profile_parts)}")
         
@@ -58,18 +61,29 @@ class MSchemaGenerator(BaseGenerator):
         column_defs = [self.generate_column(col, table.name) for col in table.columns]
         return "\n".join([header] + column_defs)
 
+    def iter_schema(self) -> Iterator[str]:
+        """
+        Yields the M-Schema one table at a time, followed by the foreign keys.
+        """
+        return self.join_chunks(self._schema_parts(), "\n")
+
     def generate_schema(self) -> str:
         """
         Assembles the final M-Schema for all tables into a single string.
         """
+        return "".join(self.iter_schema())
+
+    def _schema_parts(self) -> Iterator[str]:
+        """Yields the lines and table blocks of the M-Schema."""
         # 1. DB_ID and Schema Header
-        schema_parts = [f"[DB_ID] {self.db_name}\n", "[Schema]"]
+        yield f"[DB_ID] {self.db_name}\n"
+        yield "[Schema]"
 
         # 2. Generate each table's schema
         foreign_keys_list = []
         for table in self.tables:
-            schema_parts.append(self.generate_table(table))
-            schema_parts.append("")  # Blank line for readability
+            yield self.generate_table(table)
+            yield ""  # Blank line for readability
 
             # 3. Collect all foreign keys for the final section
             for column in table.columns:
@@ -79,11 +93,11 @@ class MSchemaGenerator(BaseGenerator):
                     fk_col_name = column.name
                     ref_table, ref_col = fk_target.split('(')
                     ref_col = ref_col[:-1]
-                    foreign_keys_list.append(f"{fk_table_name}.{fk_col_name} = {ref_table}.{ref_col}")
+                    fk_line = f"{fk_table_name}.{fk_col_name} = {ref_table}.{ref_col}"
+                    fk_note = self.foreign_key_note(column)
+                    foreign_keys_list.append(f"{fk_line} ({fk_note})" if fk_note else fk_line)
 
         # 4. Append the foreign keys section if needed
         if foreign_keys_list:
-            schema_parts.append("[Foreign keys]")
-            schema_parts.extend(foreign_keys_list)
-
-        return "\n".join(schema_parts)
\ No newline at end of file
+            yield "[Foreign keys]"
+            yield from foreign_keys_list
\ No newline at end of file
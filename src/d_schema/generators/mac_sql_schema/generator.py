@@ -1,4 +1,4 @@
-from typing import List, Dict, Any
+from typing import Any, Dict, Iterator, List
 
 from d_schema.structures import TableInfo, ColumnInfo
 from d_schema.generators.base_generator import BaseGenerator
@@ -23,15 +23,23 @@ class MacSQLSchemaGenerator(BaseGenerator):
                 total = column.profile.non_null_count + column.profile.null_count
                 if total > 0:
                     non_null_pct = (column.profile.non_null_count / total) * 100
-                    profile_parts.append(f"{non_null_pct:.1f}% non-null")
+                    approx = self.estimate_prefix(column.profile, "null_count")
+                    profile_parts.append(f"{approx}{non_null_pct:.1f}% non-null")
             if column.profile.distinct_count is not None:
-                profile_parts.append(f"{column.profile.distinct_count} distinct")
+                approx = self.estimate_prefix(column.profile, "distinct_count")
+                profile_parts.append(f"{approx}{column.profile.distinct_count} distinct")
             if column.profile.min_value is not None:
-                profile_parts.append(f"min='{column.profile.min_value}'")
+                approx = self.estimate_prefix(column.profile, "min_value")
+                profile_parts.append(f"min={approx}'{column.profile.min_value}'")
             if column.profile.max_value is not None:
-                profile_parts.append(f"max='{column.profile.max_value}'")
+                approx = self.estimate_prefix(column.profile, "max_value")
+                profile_parts.append(f"max={approx}'{column.profile.max_value}'")
             if column.profile.avg_char_length is not None:
                 profile_parts.append(f"avg_len={column.profile.avg_char_length:.1f}")
+            if len(column.profile.quartiles) == 3:
+                approx = self.estimate_prefix(column.profile, "quartiles")
+                q1, median, q3 = column.profile.quartiles
+                profile_parts.append(f"q1={approx}'{q1}', median={approx}'{median}', q3={approx}'{q3}'")
             
             if profile_parts:
                 base_detail += f" (Profile: {', '.join(profile_parts)})"
@@ -46,16 +54,23 @@ class MacSQLSchemaGenerator(BaseGenerator):
         record_count = 0
         if table.profile and table.profile.record_count is not None:
             record_count = table.profile.record_count
-            table_header += f" ({record_count} rows)"
+            approx = self.estimate_prefix(table.profile, "record_count")
+            table_header += f" ({approx}{record_count} rows)"
         
         column_details = [self.generate_column(col, table.name, record_count) for col in table.columns]
         
         return f"{table_header}\n[\n" + "\n".join(column_details) + "\n]"
 
-    def generate_schema(self) -> str:
+    def iter_schema(self) -> Iterator[str]:
         """
-        Assembles the final MAC-SQL schema for all tables into a single string.
+        Yields the MAC-SQL schema one table block at a time.
         """
         # The base implementation needs to be adjusted because generate_column needs table-level info
         # and generate_table produces the final formatted block for a table.
-        return "\n\n".join([self.generate_table(table) for table in self.tables])
\ No newline at end of file
+        return self.join_chunks((self.generate_table(table) for table in self.tables), "\n\n")
+
+    def generate_schema(self) -> str:
+        """
+        Assembles the final MAC-SQL schema for all tables into a single string.
+        """
+        return "".join(self.iter_schema())
\ No newline at end of file
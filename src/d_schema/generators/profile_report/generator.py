@@ -1,3 +1,5 @@
+from typing import Iterator
+
 from d_schema.structures import TableInfo, ColumnInfo
 from d_schema.generators.base_generator import BaseGenerator
 
@@ -7,6 +9,8 @@ class ProfileReportGenerator(BaseGenerator):
     Generates a detailed data profiling report in Markdown format.
     """
 
+    requires_profile = True
+
     def generate_column(self, column: ColumnInfo) -> str:
         """
         Generates the Markdown table row for a single column's profile.
@@ -16,23 +20,49 @@ class ProfileReportGenerator(BaseGenerator):
 
         p = column.profile
         total = (p.non_null_count or 0) + (p.null_count or 0)
-        non_null_pct = f"{(p.non_null_count / total) * 100:.1f}%" if total > 0 else "N/A"
-        distinct_count = str(p.distinct_count) if p.distinct_count is not None else "N/A"
-        
+        non_null_pct = (
+            f"{self.estimate_prefix(p, 'null_count')}{(p.non_null_count / total) * 100:.1f}%"
+            if total > 0 else "N/A"
+        )
+        distinct_count = (
+            f"{self.estimate_prefix(p, 'distinct_count')}{p.distinct_count}"
+            if p.distinct_count is not None else "N/A"
+        )
+        min_value = f"{self.estimate_prefix(p, 'min_value')}{p.min_value}" if p.min_value else "N/A"
+        max_value = f"{self.estimate_prefix(p, 'max_value')}{p.max_value}" if p.max_value else "N/A"
+
         top_k_str = ""
         if p.top_k_values:
-            top_k_str = ", ".join([f"'{val}' ({count})" for val, count in p.top_k_values])
-
-        details = (
-            f"**Non-Null**: {non_null_pct}<br>"
-            f"**Distinct**: {distinct_count}<br>"
-            f"**Min**: {p.min_value or 'N/A'}<br>"
-            f"**Max**: {p.max_value or 'N/A'}<br>"
-            f"**Avg. Len**: {p.avg_char_length:.2f}" if p.avg_char_length is not None else ""
-        )
+            approx = self.estimate_prefix(p, "top_k_values")
+            top_k_str = ", ".join([f"'{val}' ({approx}{count})" for val, count in p.top_k_values])
+            if p.top_k_error:
+                top_k_str += f" (counts up to {p.top_k_error} low)"
 
+        detail_parts = [
+            f"**Non-Null**: {non_null_pct}",
+            f"**Distinct**: {distinct_count}",
+            f"**Min**: {min_value}",
+            f"**Max**: {max_value}",
+        ]
+        if p.avg_char_length is not None:
+            detail_parts.append(f"**Avg. Len**: {p.avg_char_length:.2f}")
+        if p.mean_value is not None:
+            detail_parts.append(f"**Mean**: {p.mean_value:.2f} (std. dev. {p.std_dev:.2f})")
+        if p.quartiles:
+            approx = self.estimate_prefix(p, "quartiles")
+            detail_parts.append(f"**Quartiles**: {approx}{' / '.join(p.quartiles)}")
+        if p.deciles:
+            approx = self.estimate_prefix(p, "deciles")
+            detail_parts.append(f"**Deciles**: {approx}{' / '.join(p.deciles)}")
+        if p.histogram_bounds:
+            approx = self.estimate_prefix(p, "histogram_bounds")
+            buckets = len(p.histogram_bounds) - 1
+            detail_parts.append(
+                f"**Histogram** ({buckets} equal-count buckets): {approx}{', '.join(p.histogram_bounds)}"
+            )
         if top_k_str:
-            details += f"<br>**Top Values**: {top_k_str}"
+            detail_parts.append(f"**Top Values**: {top_k_str}")
+        details = "<br>".join(detail_parts)
 
         return f"| {column.name} | {column.type} | {details} |"
 
@@ -42,9 +72,21 @@ class ProfileReportGenerator(BaseGenerator):
         """
         record_count = "N/A"
         if table.profile and table.profile.record_count is not None:
-            record_count = str(table.profile.record_count)
+            approx = self.estimate_prefix(table.profile, "record_count")
+            record_count = f"{approx}{table.profile.record_count}"
+
+        if table.profile and table.profile.sample_size is not None:
+            record_count += f" (sampled {table.profile.sample_size} rows"
+            if table.profile.margin_of_error is not None:
+                record_count += f", ±{table.profile.margin_of_error * 100:.1f}%"
+            record_count += ")"
 
         header = f"### Table: `{table.name}`\n*Record Count: {record_count}*\n"
+        if table.profile and (table.profile.strategy not in (None, "full") or table.profile.degraded_fields):
+            strategy = f"*Profiling Strategy: {table.profile.strategy}"
+            if table.profile.degraded_fields:
+                strategy += f" (incomplete: {', '.join(table.profile.degraded_fields)})"
+            header += f"{strategy}*\n"
         
         table_md = [
             header,
@@ -57,14 +99,20 @@ class ProfileReportGenerator(BaseGenerator):
         
         return "\n".join(table_md)
 
+    def iter_schema(self) -> Iterator[str]:
+        """
+        Yields the Markdown report one table section at a time.
+        """
+        def report_parts():
+            yield "# Data Profiling Report\n"
+            for table in self.tables:
+                yield self.generate_table(table)
+                yield "\n---\n"
+
+        return self.join_chunks(report_parts(), "\n")
+
     def generate_schema(self) -> str:
         """
         Assembles the final Markdown report for all tables.
         """
-        report_parts = ["# Data Profiling Report\n"]
-        
-        for table in self.tables:
-            report_parts.append(self.generate_table(table))
-            report_parts.append("\n---\n")
-
-        return "\n".join(report_parts)
+        return "".join(self.iter_schema())
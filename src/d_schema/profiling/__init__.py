@@ -0,0 +1 @@
+# Profiling engines used by DatabaseParser to compute column and table statistics.
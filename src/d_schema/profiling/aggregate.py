@@ -0,0 +1,228 @@
+# d_schema/profiling/aggregate.py
+
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select, func, distinct
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.types import JSON, Boolean, Uuid
+
+from ..structures import ColumnInfo, ColumnProfile
+from .values import display_value, is_binary_type, needs_truncation, prefix_expression
+
+# Every column contributes up to five expressions to the fused statement, so
+# 100 columns keep us comfortably below the result-column limits of SQLite
+# (2000), MySQL (4096) and PostgreSQL (1664).
+DEFAULT_MAX_COLUMNS_PER_STATEMENT = 100
+
+ROW_COUNT_LABEL = "row_count"
+
+# Native approximate distinct count functions. Dialects missing here get
+# their approximate distinct counts from the HyperLogLog of the streaming scan.
+APPROX_COUNT_DISTINCT_FUNCTIONS = {
+    "mssql": "approx_count_distinct",
+    "oracle": "approx_count_distinct",
+    "snowflake": "approx_count_distinct",
+    "bigquery": "approx_count_distinct",
+    "databricks": "approx_count_distinct",
+    "duckdb": "approx_count_distinct",
+    "trino": "approx_distinct",
+    "presto": "approx_distinct",
+}
+
+# Column types the dialect cannot aggregate with MIN/MAX. Their min/max
+# values come from the streaming scan instead, so that a single such column
+# does not fail the fused statement of its whole batch.
+UNORDERED_TYPES = {
+    "postgresql": (Boolean, Uuid, JSON),
+    "mssql": (Boolean,),
+}
+
+
+def is_text_type(type_str: str) -> bool:
+    """Returns True for column types whose character length is worth profiling."""
+    return "CHAR" in type_str or "TEXT" in type_str
+
+
+def supports_min_max(sa_type, dialect_name: str) -> bool:
+    """Returns True if the dialect can compute MIN/MAX of the column type."""
+    if is_binary_type(sa_type):
+        return False
+    return not isinstance(sa_type, UNORDERED_TYPES.get(dialect_name, ()))
+
+
+def supports_count_distinct(sa_type, dialect_name: str) -> bool:
+    """Returns True if the dialect can compute COUNT(DISTINCT) of the column type."""
+    # PostgreSQL's json has no equality operator (jsonb has one)
+    return not (dialect_name == "postgresql" and str(sa_type).upper() == "JSON")
+
+
+def build_aggregate_statement(
+    meta_table,
+    columns: List[Tuple[int, ColumnInfo]],
+    dialect_name: str = "",
+    max_value_length: Optional[int] = None,
+    approx_distinct: bool = False,
+):
+    """
+    Builds a single SELECT that returns COUNT(*) together with the null count,
+    distinct count, min/max and average length of every given column.
+
+    Min/max values of long text are cut to `max_value_length` characters by
+    the database. Columns whose type the dialect cannot aggregate (binary
+    columns, and e.g. PostgreSQL booleans, UUIDs and JSON) get no min/max or
+    distinct count; the streaming scan fills these in. With
+    `approx_distinct`, the exact COUNT(DISTINCT) is replaced by the dialect's
+    native approximation, or left out if there is none.
+
+    Args:
+        meta_table: The SQLAlchemy table to profile.
+        columns: (position, ColumnInfo) pairs. The position is used to build
+            unique labels, since column names are not valid labels everywhere.
+        dialect_name: The name of the connection's dialect.
+        max_value_length: Maximum number of characters of min/max values.
+        approx_distinct: Whether distinct counts may be approximate.
+
+    Returns:
+        A SQLAlchemy Select statement.
+    """
+    expressions = [func.count().label(ROW_COUNT_LABEL)]
+    for idx, column_info in columns:
+        meta_column = meta_table.c[column_info.name]
+        expressions.append(func.count(meta_column).label(f"c{idx}_non_null"))
+        if supports_count_distinct(meta_column.type, dialect_name):
+            if not approx_distinct:
+                expressions.append(func.count(distinct(meta_column)).label(f"c{idx}_distinct"))
+            elif dialect_name in APPROX_COUNT_DISTINCT_FUNCTIONS:
+                approx_function = getattr(func, APPROX_COUNT_DISTINCT_FUNCTIONS[dialect_name])
+                expressions.append(approx_function(meta_column).label(f"c{idx}_distinct"))
+        if supports_min_max(meta_column.type, dialect_name):
+            min_expression, max_expression = func.min(meta_column), func.max(meta_column)
+            if needs_truncation(meta_column.type, max_value_length):
+                min_expression = prefix_expression(
+                    min_expression, meta_column.type, dialect_name, max_value_length
+                )
+                max_expression = prefix_expression(
+                    max_expression, meta_column.type, dialect_name, max_value_length
+                )
+            expressions.extend([
+                min_expression.label(f"c{idx}_min"),
+                max_expression.label(f"c{idx}_max"),
+            ])
+        if is_text_type(str(column_info.type)):
+            expressions.append(
+                func.avg(func.length(meta_column)).label(f"c{idx}_avg_len")
+            )
+    return select(*expressions).select_from(meta_table)
+
+
+def apply_aggregate_row(
+    row,
+    columns: List[Tuple[int, ColumnInfo]],
+    profiles: Dict[str, ColumnProfile],
+    max_value_length: Optional[int] = None,
+    approx_distinct: bool = False,
+) -> int:
+    """
+    Copies the values of a fused aggregate row into the column profiles.
+    Distinct counts of an approximate statement are marked as estimates.
+
+    Returns:
+        The record count of the table.
+    """
+    mapping = row._mapping
+    record_count = mapping[ROW_COUNT_LABEL]
+    for idx, column_info in columns:
+        col_profile = profiles[column_info.name]
+        non_null_count = mapping[f"c{idx}_non_null"]
+        col_profile.non_null_count = non_null_count
+        col_profile.null_count = record_count - non_null_count
+        if f"c{idx}_distinct" in mapping:
+            col_profile.distinct_count = mapping[f"c{idx}_distinct"]
+            if approx_distinct and "distinct_count" not in col_profile.estimated_fields:
+                col_profile.estimated_fields.append("distinct_count")
+
+        min_val = mapping.get(f"c{idx}_min")
+        max_val = mapping.get(f"c{idx}_max")
+        col_profile.min_value = display_value(min_val, max_value_length) if min_val is not None else None
+        col_profile.max_value = display_value(max_val, max_value_length) if max_val is not None else None
+
+        if f"c{idx}_avg_len" in mapping:
+            avg_len = mapping[f"c{idx}_avg_len"]
+            col_profile.avg_char_length = float(avg_len) if avg_len else 0.0
+    return record_count
+
+
+def profile_aggregates(
+    connection,
+    meta_table,
+    columns: List[ColumnInfo],
+    profiles: Dict[str, ColumnProfile],
+    max_columns_per_statement: int = DEFAULT_MAX_COLUMNS_PER_STATEMENT,
+    max_value_length: Optional[int] = None,
+    approx_distinct: bool = False,
+) -> int:
+    """
+    Fills the aggregate statistics of all columns of a table using one
+    statement per batch of columns instead of several statements per column.
+
+    Aggregates that a column's type is known not to support are left out of
+    the statement up front. If a batch still fails, its columns are retried
+    one statement each so that a single unsupported column does not hide the
+    statistics of the others.
+
+    Args:
+        connection: An open SQLAlchemy connection.
+        meta_table: The SQLAlchemy table to profile.
+        columns: The columns of the table.
+        profiles: Column profiles to fill, keyed by column name.
+        max_columns_per_statement: Maximum number of columns per statement.
+        max_value_length: Maximum number of characters of min/max values.
+        approx_distinct: Whether distinct counts may be approximate (see
+            `build_aggregate_statement`).
+
+    Returns:
+        The record count of the table.
+
+    Raises:
+        SQLAlchemyError: If not even the record count could be obtained.
+    """
+    table_name = meta_table.name
+    dialect_name = connection.dialect.name
+
+    def run(batch) -> int:
+        statement = build_aggregate_statement(
+            meta_table, batch, dialect_name, max_value_length, approx_distinct
+        )
+        row = connection.execute(statement).one()
+        return apply_aggregate_row(row, batch, profiles, max_value_length, approx_distinct)
+
+    indexed_columns = list(enumerate(columns))
+    batches = [
+        indexed_columns[start:start + max_columns_per_statement]
+        for start in range(0, len(indexed_columns), max(1, max_columns_per_statement))
+    ] or [[]]
+
+    record_count: Optional[int] = None
+    for batch in batches:
+        try:
+            record_count = run(batch)
+            continue
+        except SQLAlchemyError as e:
+            connection.rollback()
+            if len(batch) <= 1:
+                if batch:
+                    print(f"  - Could not fully profile column {table_name}.{batch[0][1].name}: {e}")
+                continue
+
+        for single in batch:
+            try:
+                record_count = run([single])
+            except SQLAlchemyError as e:
+                connection.rollback()
+                print(f"  - Could not fully profile column {table_name}.{single[1].name}: {e}")
+
+    if record_count is None:
+        record_count = connection.execute(
+            select(func.count()).select_from(meta_table)
+        ).scalar_one()
+    return record_count
@@ -0,0 +1,319 @@
+# d_schema/profiling/catalog_stats.py
+
+import base64
+import json
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import text, bindparam
+from sqlalchemy.exc import SQLAlchemyError
+
+from ..structures import TableInfo, TableProfile, ColumnProfile
+
+
+ESTIMATED_COLUMN_FIELDS = (
+    "null_count",
+    "non_null_count",
+    "distinct_count",
+    "min_value",
+    "max_value",
+    "top_k_values",
+)
+
+
+@dataclass
+class TableStatistics:
+    """
+    Approximate statistics of a table, as kept by the database's own
+    optimizer catalogs. Every value is an estimate.
+    """
+    row_count: Optional[int] = None
+    columns: Dict[str, ColumnProfile] = field(default_factory=dict)
+
+
+def read_catalog_statistics(connection, table_names: Sequence[str]) -> Dict[str, TableStatistics]:
+    """
+    Reads optimizer statistics of the given tables without scanning any data.
+
+    Supported are PostgreSQL (pg_class/pg_stats), SQLite (sqlite_stat1, only
+    available after ANALYZE) and MySQL (information_schema tables, statistics
+    and histograms). Other dialects return no statistics.
+
+    Args:
+        connection: An open SQLAlchemy connection.
+        table_names: The tables to read statistics for.
+
+    Returns:
+        A dict mapping table names to their statistics. Tables for which the
+        catalog holds nothing are missing.
+    """
+    reader = _CATALOG_READERS.get(connection.dialect.name)
+    if reader is None:
+        print(f"Catalog statistics are not supported for dialect '{connection.dialect.name}'.")
+        return {}
+    if not table_names:
+        return {}
+    try:
+        return reader(connection, list(table_names))
+    except SQLAlchemyError as e:
+        connection.rollback()
+        print(f"Could not read catalog statistics: {e}")
+        return {}
+
+
+def apply_catalog_statistics(table_info: TableInfo, statistics: Optional[TableStatistics]):
+    """
+    Fills the profiles of a table from its catalog statistics and marks all
+    filled fields as estimates.
+    """
+    if statistics is None:
+        print(f"  - No catalog statistics for table {table_info.name} (has it been analyzed?).")
+        return
+
+    table_info.profile = TableProfile(
+        record_count=statistics.row_count,
+        estimated_fields=["record_count"] if statistics.row_count is not None else [],
+    )
+    primary_keys = [col.name for col in table_info.columns if col.primary_key]
+    for column_info in table_info.columns:
+        col_profile = statistics.columns.get(column_info.name)
+        if primary_keys == [column_info.name] and statistics.row_count is not None:
+            # A single-column primary key is unique and never NULL
+            col_profile = col_profile or ColumnProfile()
+            col_profile.null_count = 0
+            col_profile.non_null_count = statistics.row_count
+            col_profile.distinct_count = statistics.row_count
+        if col_profile is None:
+            continue
+        col_profile.estimated_fields = [
+            name for name in ESTIMATED_COLUMN_FIELDS
+            if getattr(col_profile, name) not in (None, [])
+        ]
+        column_info.profile = col_profile
+
+
+def _column_profile(
+    row_count: Optional[int],
+    null_fraction: Optional[float] = None,
+    distinct_count: Optional[int] = None,
+    top_k: Optional[List[Tuple[str, float]]] = None,
+    min_value: Optional[str] = None,
+    max_value: Optional[str] = None,
+) -> ColumnProfile:
+    """Builds a column profile from fractional catalog statistics."""
+    col_profile = ColumnProfile(
+        distinct_count=distinct_count,
+        min_value=min_value,
+        max_value=max_value,
+    )
+    if row_count is not None:
+        if null_fraction is not None:
+            col_profile.null_count = round(null_fraction * row_count)
+            col_profile.non_null_count = row_count - col_profile.null_count
+        if top_k:
+            col_profile.top_k_values = [
+                (value, round(frequency * row_count)) for value, frequency in top_k[:10]
+            ]
+    return col_profile
+
+
+# --- PostgreSQL ---
+
+def _parse_pg_array(literal: Optional[str]) -> List[Optional[str]]:
+    """Parses the text representation of a one-dimensional PostgreSQL array."""
+    if not literal or literal == "{}":
+        return []
+    values: List[Optional[str]] = []
+    body = literal.strip()[1:-1]
+    current, quoted, was_quoted, escaped = [], False, False, False
+    for char in body:
+        if escaped:
+            current.append(char)
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char == '"':
+            quoted = not quoted
+            was_quoted = True
+        elif char == "," and not quoted:
+            value = "".join(current)
+            values.append(None if value == "NULL" and not was_quoted else value)
+            current, was_quoted = [], False
+        else:
+            current.append(char)
+    value = "".join(current)
+    values.append(None if value == "NULL" and not was_quoted else value)
+    return values
+
+
+def _read_postgresql(connection, table_names: List[str]) -> Dict[str, TableStatistics]:
+    row_counts = connection.execute(
+        text(
+            "SELECT c.relname, c.reltuples FROM pg_catalog.pg_class c "
+            "JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace "
+            "WHERE n.nspname = current_schema() AND c.relname = ANY(:names)"
+        ),
+        {"names": table_names},
+    ).all()
+    statistics = {
+        # reltuples is -1 (or 0 on old versions) for tables never analyzed
+        name: TableStatistics(row_count=int(reltuples) if reltuples and reltuples > 0 else None)
+        for name, reltuples in row_counts
+    }
+
+    column_rows = connection.execute(
+        text(
+            "SELECT tablename, attname, null_frac, n_distinct, "
+            "most_common_vals::text, most_common_freqs, histogram_bounds::text "
+            "FROM pg_catalog.pg_stats "
+            "WHERE schemaname = current_schema() AND tablename = ANY(:names)"
+        ),
+        {"names": table_names},
+    ).all()
+    for table_name, column_name, null_frac, n_distinct, mcv, mcf, histogram in column_rows:
+        table_stats = statistics.setdefault(table_name, TableStatistics())
+        row_count = table_stats.row_count
+        distinct_count = None
+        if n_distinct is not None:
+            if n_distinct >= 0:
+                distinct_count = int(n_distinct)
+            elif row_count is not None:
+                # Negative values are the distinct count divided by the row count
+                distinct_count = round(-n_distinct * row_count)
+        bounds = _parse_pg_array(histogram)
+        table_stats.columns[column_name] = _column_profile(
+            row_count,
+            null_fraction=null_frac,
+            distinct_count=distinct_count,
+            top_k=list(zip(_parse_pg_array(mcv), mcf or [])),
+            min_value=bounds[0] if bounds else None,
+            max_value=bounds[-1] if bounds else None,
+        )
+    return statistics
+
+
+# --- SQLite ---
+
+def _read_sqlite(connection, table_names: List[str]) -> Dict[str, TableStatistics]:
+    has_stat1 = connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'")
+    ).first()
+    if not has_stat1:
+        return {}
+
+    rows = connection.execute(
+        text(
+            "SELECT s.tbl, s.stat, ii.name FROM sqlite_stat1 s "
+            "LEFT JOIN pragma_index_info(s.idx) ii ON ii.seqno = 0 "
+            "WHERE s.tbl IN :names"
+        ).bindparams(bindparam("names", expanding=True)),
+        {"names": table_names},
+    ).all()
+
+    statistics: Dict[str, TableStatistics] = {}
+    for table_name, stat, first_column in rows:
+        # stat is "<rows> <avg rows per distinct prefix of 1 column> ..."
+        numbers = [int(part) for part in stat.split() if part.isdigit()]
+        if not numbers:
+            continue
+        table_stats = statistics.setdefault(table_name, TableStatistics())
+        table_stats.row_count = numbers[0]
+        if first_column is not None and len(numbers) > 1 and numbers[1] > 0:
+            distinct_count = max(1, round(numbers[0] / numbers[1]))
+            existing = table_stats.columns.get(first_column)
+            if existing is None or (existing.distinct_count or 0) < distinct_count:
+                table_stats.columns[first_column] = ColumnProfile(distinct_count=distinct_count)
+    return statistics
+
+
+# --- MySQL ---
+
+def _decode_mysql_histogram_value(value) -> str:
+    """Decodes values of MySQL histograms, where strings are base64 encoded."""
+    if isinstance(value, str) and value.startswith("base64:"):
+        _, _, payload = value.split(":", 2)
+        return base64.b64decode(payload).decode("utf8", errors="replace")
+    return str(value)
+
+
+def _read_mysql(connection, table_names: List[str]) -> Dict[str, TableStatistics]:
+    expanding_names = bindparam("names", expanding=True)
+    row_counts = connection.execute(
+        text(
+            "SELECT TABLE_NAME, TABLE_ROWS FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME IN :names"
+        ).bindparams(expanding_names),
+        {"names": table_names},
+    ).all()
+    statistics = {
+        name: TableStatistics(row_count=int(rows) if rows is not None else None)
+        for name, rows in row_counts
+    }
+
+    cardinalities = connection.execute(
+        text(
+            "SELECT TABLE_NAME, COLUMN_NAME, MAX(CARDINALITY) FROM information_schema.STATISTICS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND SEQ_IN_INDEX = 1 AND TABLE_NAME IN :names "
+            "GROUP BY TABLE_NAME, COLUMN_NAME"
+        ).bindparams(expanding_names),
+        {"names": table_names},
+    ).all()
+    for table_name, column_name, cardinality in cardinalities:
+        table_stats = statistics.setdefault(table_name, TableStatistics())
+        table_stats.columns[column_name] = ColumnProfile(
+            distinct_count=int(cardinality) if cardinality is not None else None
+        )
+
+    try:
+        histograms = connection.execute(
+            text(
+                "SELECT TABLE_NAME, COLUMN_NAME, HISTOGRAM FROM information_schema.COLUMN_STATISTICS "
+                "WHERE SCHEMA_NAME = DATABASE() AND TABLE_NAME IN :names"
+            ).bindparams(expanding_names),
+            {"names": table_names},
+        ).all()
+    except SQLAlchemyError:
+        # COLUMN_STATISTICS only exists on MySQL 8.0+ (not on MariaDB)
+        connection.rollback()
+        histograms = []
+
+    for table_name, column_name, histogram in histograms:
+        table_stats = statistics.setdefault(table_name, TableStatistics())
+        if isinstance(histogram, str):
+            histogram = json.loads(histogram)
+        buckets = histogram.get("buckets") or []
+        if not buckets:
+            continue
+        if histogram.get("histogram-type") == "singleton":
+            # [value, cumulative frequency]
+            top_k, previous = [], 0.0
+            for value, cumulative in buckets:
+                top_k.append((_decode_mysql_histogram_value(value), cumulative - previous))
+                previous = cumulative
+            top_k.sort(key=lambda item: item[1], reverse=True)
+            distinct_count = len(buckets)
+            min_value, max_value = buckets[0][0], buckets[-1][0]
+        else:
+            # [lower bound, upper bound, cumulative frequency, distinct values]
+            top_k = []
+            distinct_count = sum(int(bucket[3]) for bucket in buckets)
+            min_value, max_value = buckets[0][0], buckets[-1][1]
+
+        existing = table_stats.columns.get(column_name)
+        table_stats.columns[column_name] = _column_profile(
+            table_stats.row_count,
+            null_fraction=histogram.get("null-values"),
+            distinct_count=max(distinct_count, (existing.distinct_count or 0) if existing else 0),
+            top_k=top_k,
+            min_value=_decode_mysql_histogram_value(min_value),
+            max_value=_decode_mysql_histogram_value(max_value),
+        )
+    return statistics
+
+
+_CATALOG_READERS = {
+    "postgresql": _read_postgresql,
+    "sqlite": _read_sqlite,
+    "mysql": _read_mysql,
+    "mariadb": _read_mysql,
+}
@@ -0,0 +1,91 @@
+# d_schema/profiling/partition.py
+
+import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence
+
+from sqlalchemy import select, func, and_
+
+from .sampling import range_key
+from .scan import DEFAULT_BATCH_SIZE, TableScanner
+from .timeouts import statement_deadline
+
+
+def plan_partitions(
+    connection,
+    meta_table,
+    primary_keys: Sequence[str],
+    partition_rows: int,
+) -> List:
+    """
+    Splits a table into contiguous ranges of its rowid or integer primary
+    key, each spanning about `partition_rows` keys.
+
+    Args:
+        connection: An open SQLAlchemy connection.
+        meta_table: The table to split.
+        primary_keys: The names of the table's primary key columns.
+        partition_rows: Target number of keys per partition.
+
+    Returns:
+        One WHERE condition per partition. The conditions are disjoint and
+        together cover every row. Empty if the table has no usable key or is
+        not larger than a single partition.
+    """
+    key = range_key(connection, meta_table, primary_keys)
+    if key is None:
+        return []
+    low, high = connection.execute(
+        select(func.min(key), func.max(key)).select_from(meta_table)
+    ).one()
+    if low is None:
+        return []
+
+    span = high - low + 1
+    num_partitions = math.ceil(span / max(1, partition_rows))
+    if num_partitions <= 1:
+        return []
+    bounds = [low + span * i // num_partitions for i in range(num_partitions + 1)]
+    return [
+        and_(key >= start, key < end) for start, end in zip(bounds[:-1], bounds[1:])
+    ]
+
+
+def scan_partitions(
+    engine,
+    meta_table,
+    conditions: Sequence,
+    max_workers: int,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    seconds: Optional[float] = None,
+) -> TableScanner:
+    """
+    Scans every partition of a table on its own connection, with up to
+    `max_workers` partitions in flight, and merges the partial results.
+
+    Args:
+        engine: The SQLAlchemy engine the worker connections come from.
+        meta_table: The table to scan.
+        conditions: The partition conditions from `plan_partitions`.
+        max_workers: Number of partitions scanned concurrently.
+        batch_size: Number of rows fetched per batch.
+        seconds: Optional time limit of every partition scan.
+
+    Returns:
+        A TableScanner holding the statistics of the whole table.
+    """
+
+    def scan_one(condition) -> TableScanner:
+        scanner = TableScanner(meta_table, batch_size=batch_size)
+        with engine.connect() as connection:
+            with statement_deadline(connection, seconds):
+                scanner.scan(connection, select(*meta_table.columns).where(condition))
+        return scanner
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        partials = list(executor.map(scan_one, conditions))
+
+    merged = partials[0]
+    for partial in partials[1:]:
+        merged.merge(partial)
+    return merged
@@ -0,0 +1,187 @@
+# d_schema/profiling/planner.py
+
+import heapq
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from sqlalchemy import select, func, literal_column
+from sqlalchemy.exc import SQLAlchemyError
+
+from .sampling import DEFAULT_SAMPLE_SIZE
+from .timeouts import ProfilingTimeout, statement_deadline
+
+# Strategies from most to least expensive
+STRATEGIES = ("full", "sample", "catalog", "skip")
+
+# Cells (rows x columns) per second a full profile processes. The fused
+# aggregate and the streaming scan each touch every cell once.
+DEFAULT_CELLS_PER_SECOND = 1_000_000
+
+# Fixed cost of profiling any table (round trips, statement planning)
+TABLE_OVERHEAD_SECONDS = 0.05
+
+# Smallest per-table allotment, so tiny tables are not cut by clock jitter
+MIN_TABLE_SECONDS = 1.0
+
+# Time allowed for counting the rows of a table without catalog statistics
+ROW_COUNT_TIMEOUT_SECONDS = 1.0
+
+
+@dataclass
+class TablePlan:
+    """
+    The profiling strategy chosen for a table and the time allotted to it.
+    """
+    strategy: str
+    estimated_rows: Optional[int] = None
+    estimated_seconds: float = 0.0
+    allotted_seconds: Optional[float] = None
+
+
+def estimate_row_count(connection, meta_table) -> Optional[int]:
+    """
+    Cheaply estimates the number of rows of a table that has no catalog
+    statistics: SQLite's largest rowid (an index lookup), or otherwise a
+    COUNT(*) that is abandoned after ROW_COUNT_TIMEOUT_SECONDS.
+
+    Returns:
+        The estimate, or None if the table is too big to count quickly.
+    """
+    try:
+        if connection.dialect.name == "sqlite":
+            max_rowid = connection.execute(
+                select(func.max(literal_column("rowid"))).select_from(meta_table)
+            ).scalar_one()
+            return int(max_rowid or 0)
+    except SQLAlchemyError:
+        # WITHOUT ROWID tables fall through to counting
+        connection.rollback()
+
+    try:
+        with statement_deadline(connection, ROW_COUNT_TIMEOUT_SECONDS):
+            return connection.execute(
+                select(func.count()).select_from(meta_table)
+            ).scalar_one()
+    except (SQLAlchemyError, ProfilingTimeout):
+        return None
+
+
+class ProfilingPlanner:
+    """
+    Chooses a profiling strategy per table so that the estimated total
+    profiling time fits a time budget.
+
+    Every table starts with a full profile. While the estimated total exceeds
+    the budget, the table with the highest estimated cost is degraded one
+    step (full -> sample -> catalog -> skip; catalog is only used for tables
+    that have catalog statistics). Whatever slack remains is distributed
+    over the tables in proportion to their estimated cost and becomes their
+    hard per-table time limit.
+    """
+
+    def __init__(
+        self,
+        time_budget: float,
+        max_workers: int = 1,
+        sample_size: int = DEFAULT_SAMPLE_SIZE,
+        cells_per_second: float = DEFAULT_CELLS_PER_SECOND,
+    ):
+        """
+        Args:
+            time_budget: Total wall-clock seconds available for profiling.
+            max_workers: Number of tables profiled concurrently.
+            sample_size: Rows read per table by the "sample" strategy.
+            cells_per_second: Throughput of a full profile, in rows x columns.
+        """
+        self.time_budget = time_budget
+        self.max_workers = max(1, max_workers)
+        self.sample_size = sample_size
+        self.cells_per_second = cells_per_second
+
+    def estimate_seconds(self, strategy: str, rows: Optional[int], num_columns: int) -> float:
+        """Estimates how long profiling a table with the given strategy takes."""
+        if strategy in ("catalog", "skip"):
+            return 0.0
+        if rows is None:
+            # Unknown size: assume it is too big to count, i.e. huge.
+            rows = 10 ** 12
+        if strategy == "sample":
+            rows = min(rows, self.sample_size)
+        return TABLE_OVERHEAD_SECONDS + rows * max(1, num_columns) / self.cells_per_second
+
+    def plan(
+        self,
+        row_counts: Dict[str, Optional[int]],
+        column_counts: Dict[str, int],
+        has_statistics: Dict[str, bool],
+    ) -> Dict[str, TablePlan]:
+        """
+        Plans the strategy of every table.
+
+        Args:
+            row_counts: Estimated row counts per table (None if unknown).
+            column_counts: Number of columns per table.
+            has_statistics: Whether catalog statistics exist per table.
+
+        Returns:
+            A dict mapping table names to their plans.
+        """
+        # Work that can be done in parallel scales the budget
+        budget = self.time_budget * self.max_workers
+        plans = {
+            name: TablePlan(
+                strategy="full",
+                estimated_rows=rows,
+                estimated_seconds=self.estimate_seconds("full", rows, column_counts[name]),
+            )
+            for name, rows in row_counts.items()
+        }
+        total = sum(plan.estimated_seconds for plan in plans.values())
+
+        heap = [(-plan.estimated_seconds, name) for name, plan in plans.items()]
+        heapq.heapify(heap)
+        while total > budget and heap:
+            _, name = heapq.heappop(heap)
+            plan = plans[name]
+            next_strategy = self._degrade(plan.strategy, has_statistics.get(name, False))
+            seconds = self.estimate_seconds(next_strategy, plan.estimated_rows, column_counts[name])
+            total += seconds - plan.estimated_seconds
+            plan.strategy, plan.estimated_seconds = next_strategy, seconds
+            if seconds > 0:
+                heapq.heappush(heap, (-seconds, name))
+
+        slack = budget / total if total > 0 else 1.0
+        for plan in plans.values():
+            if plan.strategy in ("full", "sample"):
+                plan.allotted_seconds = max(MIN_TABLE_SECONDS, plan.estimated_seconds * slack)
+        return plans
+
+    @staticmethod
+    def _degrade(strategy: str, has_statistics: bool) -> str:
+        """Returns the next cheaper strategy."""
+        next_strategy = STRATEGIES[STRATEGIES.index(strategy) + 1]
+        if next_strategy == "catalog" and not has_statistics:
+            return "skip"
+        return next_strategy
+
+
+# Fields that are legitimately empty for some columns (near-unique and
+# binary columns have no top-k values), mapped to a field that the same scan
+# always fills. They are missing exactly when that field is.
+_FILLED_WITH = {"top_k_values": "minhash_sketch"}
+
+
+def missing_fields(profiles: List, expected_fields: List[str]) -> List[str]:
+    """
+    Returns the expected profile fields that are missing in at least one of
+    the given column profiles (a missing profile counts as missing all).
+    """
+    missing = []
+    for field_name in expected_fields:
+        present_name = _FILLED_WITH.get(field_name, field_name)
+        if any(
+            profile is None or getattr(profile, present_name) in (None, [])
+            for profile in profiles
+        ):
+            missing.append(field_name)
+    return missing
@@ -0,0 +1,126 @@
+# d_schema/profiling/sampling.py
+
+import math
+import random
+from typing import Optional, Sequence, Tuple
+
+from sqlalchemy import select, func, or_, literal_column
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.types import Integer
+
+DEFAULT_SAMPLE_SIZE = 10_000
+
+# Rows read per contiguous block by key-range sampling. Reading blocks keeps
+# the number of index probes low while still spreading the sample over the
+# whole key range.
+SAMPLE_BLOCK_ROWS = 100
+
+# Maximum number of blocks in one statement. Every block adds a range
+# condition, and SQLite rejects expression trees deeper than 1000, so
+# large samples read fewer, bigger blocks instead.
+MAX_SAMPLE_BLOCKS = 64
+
+# Above this size PostgreSQL samples whole pages (SYSTEM) instead of single
+# rows (BERNOULLI), since BERNOULLI still has to read every page.
+SYSTEM_SAMPLING_MIN_ROWS = 1_000_000
+
+
+def resolve_sample_size(total_rows: int, sample_size: int, sample_fraction: Optional[float]) -> int:
+    """Returns the number of rows to sample, preferring an explicit fraction."""
+    if sample_fraction is not None:
+        return max(1, math.ceil(total_rows * sample_fraction))
+    return sample_size
+
+
+def margin_of_error(sample_rows: int, total_rows: int) -> Optional[float]:
+    """
+    Returns the worst-case half-width of the 95% confidence interval of a
+    ratio (e.g. the null ratio) estimated from a simple random sample,
+    including the finite population correction.
+    """
+    if sample_rows <= 0 or total_rows <= 1:
+        return None
+    correction = max(0.0, (total_rows - sample_rows) / (total_rows - 1))
+    return 1.96 * math.sqrt(0.25 / sample_rows) * math.sqrt(correction)
+
+
+def build_sample_statement(
+    connection,
+    meta_table,
+    primary_keys: Sequence[str],
+    total_rows: int,
+    sample_size: int,
+) -> Tuple[object, str]:
+    """
+    Builds a statement returning a sample of roughly `sample_size` rows with
+    all columns of the table, in the table's column order.
+
+    Strategies, from best to worst:
+    - PostgreSQL: TABLESAMPLE SYSTEM (large tables) or BERNOULLI.
+    - SQLite: blocks of consecutive rowids spread over the rowid range.
+    - Any dialect with a single integer primary key: the same block sampler
+      on the primary key.
+    - Otherwise: the first `sample_size` rows (LIMIT), which may be biased.
+
+    Returns:
+        A (statement, method) tuple, where method names the strategy used.
+    """
+    if connection.dialect.name == "postgresql":
+        percent = min(100.0, 100.0 * sample_size / max(total_rows, 1))
+        method = "system" if total_rows >= SYSTEM_SAMPLING_MIN_ROWS else "bernoulli"
+        sampling = func.system(percent) if method == "system" else func.bernoulli(percent)
+        sampled = meta_table.tablesample(sampling)
+        return select(*sampled.columns), f"tablesample_{method}"
+
+    key = range_key(connection, meta_table, primary_keys)
+    if key is not None:
+        try:
+            statement = _key_range_statement(connection, meta_table, key, sample_size)
+            if statement is not None:
+                return statement, "key_range"
+        except SQLAlchemyError:
+            # e.g. SQLite tables created WITHOUT ROWID
+            connection.rollback()
+
+    return select(*meta_table.columns).limit(sample_size), "limit"
+
+
+def range_key(connection, meta_table, primary_keys: Sequence[str]):
+    """
+    Returns an integer key whose ranges address the rows of the table
+    efficiently: SQLite's rowid, or else a single integer primary key.
+    Returns None if the table has no such key.
+    """
+    if connection.dialect.name == "sqlite":
+        return literal_column("rowid")
+    if len(primary_keys) == 1 and isinstance(meta_table.c[primary_keys[0]].type, Integer):
+        return meta_table.c[primary_keys[0]]
+    return None
+
+
+def _key_range_statement(connection, meta_table, key, sample_size: int):
+    """
+    Splits the key range into equally sized strata and reads one block of
+    consecutive keys at a random offset within each stratum. Blocks hold
+    SAMPLE_BLOCK_ROWS keys, or more if the sample needs more than
+    MAX_SAMPLE_BLOCKS of them.
+    """
+    low, high = connection.execute(
+        select(func.min(key), func.max(key)).select_from(meta_table)
+    ).one()
+    if low is None:
+        return None
+
+    num_blocks = min(MAX_SAMPLE_BLOCKS, max(1, math.ceil(sample_size / SAMPLE_BLOCK_ROWS)))
+    block_rows = max(SAMPLE_BLOCK_ROWS, math.ceil(sample_size / num_blocks))
+    stratum = (high - low + 1) / num_blocks
+    if stratum <= block_rows:
+        # The blocks would cover the whole key range anyway
+        return select(*meta_table.columns)
+
+    rng = random.Random()
+    conditions = []
+    for block in range(num_blocks):
+        start = low + int(block * stratum) + rng.randrange(int(stratum) - block_rows + 1)
+        conditions.append(key.between(start, start + block_rows - 1))
+    return select(*meta_table.columns).where(or_(*conditions))
@@ -0,0 +1,448 @@
+# d_schema/profiling/scan.py
+
+import datetime
+import math
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.types import Integer, Float, Numeric, Date, DateTime
+
+from ..structures import ColumnProfile
+from .aggregate import is_text_type
+from .values import is_binary_type, scan_expression
+from .sketches import (
+    NUM_PERM,
+    HeavyHitters,
+    KLLSketch,
+    hash_values,
+    new_hll,
+    new_minhash,
+    serialize_minhash,
+    update_hll,
+    update_minhash,
+)
+
+DEFAULT_BATCH_SIZE = 10_000
+
+# A column is near-unique if at least this share of its values is distinct.
+# Once that is evident after NEAR_UNIQUE_MIN_ROWS values, its heavy-hitters
+# summary is dropped: every value is rare, so there are no top-k values.
+NEAR_UNIQUE_RATIO = 0.99
+NEAR_UNIQUE_MIN_ROWS = 10_000
+
+# Number of buckets of the equi-depth histogram
+HISTOGRAM_BUCKETS = 20
+
+QUARTILE_FRACTIONS = (0.25, 0.5, 0.75)
+DECILE_FRACTIONS = tuple(i / 10 for i in range(1, 10))
+HISTOGRAM_FRACTIONS = tuple(i / HISTOGRAM_BUCKETS for i in range(HISTOGRAM_BUCKETS + 1))
+QUANTILE_FIELDS = ("quartiles", "deciles", "histogram_bounds")
+
+
+def is_numeric_type(sa_type) -> bool:
+    """Returns True for SQLAlchemy types whose values have numeric moments."""
+    # Float is not a Numeric subclass in SQLAlchemy 2.1
+    return isinstance(sa_type, (Integer, Numeric, Float))
+
+
+def temporal_kind(sa_type) -> Optional[str]:
+    """Returns "datetime" or "date" for temporal SQLAlchemy types, else None."""
+    if isinstance(sa_type, DateTime):
+        return "datetime"
+    if isinstance(sa_type, Date):
+        return "date"
+    return None
+
+
+def _to_epoch_array(values: np.ndarray) -> np.ndarray:
+    """Converts an object array of dates or datetimes to float64 microseconds since the epoch."""
+    try:
+        return values.astype("datetime64[us]").astype(np.int64).astype(np.float64)
+    except (TypeError, ValueError):
+        # Time zone aware datetimes, or text that is not a date (SQLite)
+        numbers = []
+        for value in values:
+            try:
+                if isinstance(value, datetime.datetime) and value.tzinfo is not None:
+                    value = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+                numbers.append(float(np.datetime64(value, "us").astype(np.int64)))
+            except (TypeError, ValueError):
+                pass
+        return np.array(numbers, dtype=np.float64)
+
+
+def _to_float_array(values: np.ndarray) -> np.ndarray:
+    """Converts an object array of numbers to float64, skipping non-numeric values."""
+    try:
+        return values.astype(np.float64)
+    except (TypeError, ValueError):
+        # SQLite does not enforce column types, so a numeric column may still
+        # contain text. Only the values that are actually numbers count.
+        numbers = []
+        for value in values:
+            try:
+                numbers.append(float(value))
+            except (TypeError, ValueError):
+                pass
+        return np.array(numbers, dtype=np.float64)
+
+
+class ColumnAccumulator:
+    """
+    Accumulates client-side statistics of a single column from row batches.
+
+    Memory usage is independent of the number of rows: only counters, the
+    running moments, min/max and fixed-size sketches (MinHash, HyperLogLog
+    and a heavy-hitters summary) are kept between batches. Exact value
+    frequencies are only tracked on request, for bounded inputs such as
+    samples.
+
+    All state is mergeable, so accumulators of disjoint partitions of a
+    column combine into the accumulator of the whole column (see `merge`).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        numeric: bool = False,
+        text: bool = False,
+        num_perm: int = NUM_PERM,
+        track_frequencies: bool = False,
+        binary: bool = False,
+        temporal: Optional[str] = None,
+        integer: bool = False,
+    ):
+        self.name = name
+        self.numeric = numeric
+        self.text = text
+        # "date" or "datetime" for temporal columns; integers print without decimals
+        self.temporal = temporal
+        self.integer = integer
+        # Binary values are hashed, but never kept as min/max
+        self.binary = binary
+        self.row_count = 0
+        self.null_count = 0
+        self.length_sum = 0
+        self.min_value = None
+        self.max_value = None
+        # Running count, mean and sum of squared deviations (Chan et al.)
+        self.moment_count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minhash = new_minhash(num_perm)
+        self.hll = new_hll()
+        self.heavy_hitters = HeavyHitters()
+        self.near_unique = False
+        self.quantiles: Optional[KLLSketch] = KLLSketch() if numeric or temporal else None
+        # Value hash -> frequency, and value hash -> value
+        self.frequencies: Optional[Dict[int, int]] = {} if track_frequencies else None
+        self.representatives: Dict[int, str] = {}
+
+    def update(self, values: np.ndarray):
+        """
+        Updates the statistics with one batch of values.
+
+        Args:
+            values: A 1-D object array holding the batch's values of this column.
+        """
+        null_mask = np.equal(values, None)
+        non_null = values[~null_mask]
+        self.row_count += values.size
+        self.null_count += int(null_mask.sum())
+        if not non_null.size:
+            return
+
+        strings = np.array([str(value) for value in non_null], dtype=object)
+        if self.text:
+            # Summed per value: a fixed-width array would be sized by the longest one
+            self.length_sum += sum(map(len, strings))
+        hashes = hash_values(strings)
+        update_minhash(self.minhash, hashes)
+        update_hll(self.hll, hashes)
+        if not self.near_unique:
+            self.heavy_hitters.update(hashes, strings)
+            self._check_near_unique(non_null.size)
+        if not self.binary:
+            self._update_min_max(non_null)
+
+        if self.numeric:
+            numbers = _to_float_array(non_null)
+            self._update_moments(numbers)
+            self.quantiles.update(numbers)
+        elif self.temporal:
+            self.quantiles.update(_to_epoch_array(non_null))
+
+        if self.frequencies is not None:
+            unique_hashes, first_index, counts = np.unique(
+                hashes, return_index=True, return_counts=True
+            )
+            for value_hash, index, count in zip(
+                unique_hashes.tolist(), first_index.tolist(), counts.tolist()
+            ):
+                self.frequencies[value_hash] = self.frequencies.get(value_hash, 0) + count
+                self.representatives.setdefault(value_hash, strings[index])
+
+    def _check_near_unique(self, batch_non_null: int):
+        """Checks once, when NEAR_UNIQUE_MIN_ROWS values have been seen."""
+        seen = self.non_null_count
+        if seen - batch_non_null < NEAR_UNIQUE_MIN_ROWS <= seen:
+            if self.hll.count() >= NEAR_UNIQUE_RATIO * seen:
+                self.near_unique = True
+                self.heavy_hitters = HeavyHitters()
+
+    def _update_min_max(self, non_null: np.ndarray):
+        candidates = list(non_null)
+        if self.min_value is not None:
+            candidates.extend((self.min_value, self.max_value))
+        try:
+            self.min_value, self.max_value = min(candidates), max(candidates)
+        except TypeError:
+            # Mixed types (possible in SQLite) are compared by their text
+            self.min_value, self.max_value = min(candidates, key=str), max(candidates, key=str)
+
+    def _update_moments(self, numbers: np.ndarray):
+        if not numbers.size:
+            return
+        batch_mean = float(numbers.mean())
+        self._combine_moments(numbers.size, batch_mean, float(((numbers - batch_mean) ** 2).sum()))
+
+    def _combine_moments(self, batch_count: int, batch_mean: float, batch_m2: float):
+        if not batch_count:
+            return
+        total = self.moment_count + batch_count
+        delta = batch_mean - self.mean
+        self.mean += delta * batch_count / total
+        self.m2 += batch_m2 + delta ** 2 * self.moment_count * batch_count / total
+        self.moment_count = total
+
+    def merge(self, other: "ColumnAccumulator"):
+        """
+        Merges the accumulator of another, disjoint partition of the column
+        into this one. The result equals the accumulator of a single scan
+        over both partitions, except for the heavy-hitters counts, which keep
+        their error bound.
+        """
+        self.row_count += other.row_count
+        self.null_count += other.null_count
+        self.length_sum += other.length_sum
+        if other.min_value is not None:
+            self._update_min_max(np.array([other.min_value, other.max_value], dtype=object))
+        self._combine_moments(other.moment_count, other.mean, other.m2)
+        self.minhash.merge(other.minhash)
+        self.hll.merge(other.hll)
+        if self.quantiles is not None and other.quantiles is not None:
+            self.quantiles.merge(other.quantiles)
+        if self.near_unique or other.near_unique:
+            self.near_unique = True
+            self.heavy_hitters = HeavyHitters()
+        else:
+            self.heavy_hitters.merge(other.heavy_hitters)
+        if self.frequencies is not None and other.frequencies is not None:
+            for value_hash, count in other.frequencies.items():
+                self.frequencies[value_hash] = self.frequencies.get(value_hash, 0) + count
+            for value_hash, value in other.representatives.items():
+                self.representatives.setdefault(value_hash, value)
+
+    @property
+    def non_null_count(self) -> int:
+        return self.row_count - self.null_count
+
+    def apply_to(self, profile: ColumnProfile):
+        """
+        Writes the accumulated statistics into a column profile.
+
+        Fields already filled by the server-side aggregate statement are kept,
+        since the database computes them exactly with its own semantics. A
+        missing distinct count is estimated from the HyperLogLog sketch.
+        """
+        if profile.null_count is None:
+            profile.null_count = self.null_count
+            profile.non_null_count = self.non_null_count
+        if profile.distinct_count is None:
+            profile.distinct_count = min(round(self.hll.count()), self.non_null_count)
+            if "distinct_count" not in profile.estimated_fields:
+                profile.estimated_fields.append("distinct_count")
+        if profile.min_value is None and self.min_value is not None:
+            profile.min_value = str(self.min_value)
+            profile.max_value = str(self.max_value)
+        if self.text and profile.avg_char_length is None and self.non_null_count:
+            profile.avg_char_length = self.length_sum / self.non_null_count
+        if self.moment_count:
+            profile.mean_value = self.mean
+            profile.std_dev = math.sqrt(self.m2 / self.moment_count)
+        if self.quantiles is not None and self.quantiles.count:
+            profile.quartiles = self._quantile_values(QUARTILE_FRACTIONS)
+            profile.deciles = self._quantile_values(DECILE_FRACTIONS)
+            profile.histogram_bounds = self._quantile_values(HISTOGRAM_FRACTIONS)
+            if not self.quantiles.is_exact():
+                for name in QUANTILE_FIELDS:
+                    if name not in profile.estimated_fields:
+                        profile.estimated_fields.append(name)
+        profile.minhash_sketch = serialize_minhash(self.minhash)
+
+    def _quantile_values(self, fractions: Sequence[float]) -> List[str]:
+        """Looks up quantiles in the sketch and formats them like the column's values."""
+        formatted = []
+        for value in self.quantiles.quantiles(fractions):
+            if self.temporal == "date":
+                formatted.append(str(np.datetime64(int(value), "us").astype("datetime64[D]").astype(datetime.date)))
+            elif self.temporal == "datetime":
+                formatted.append(str(np.datetime64(int(value), "us").astype(datetime.datetime)))
+            elif self.integer:
+                formatted.append(str(int(value)))
+            else:
+                formatted.append(str(value))
+        return formatted
+
+    def is_near_unique(self, distinct_count: Optional[int] = None) -> bool:
+        """
+        Returns True if (almost) every value of the column is distinct, judged
+        early from the HyperLogLog or at the end from a known distinct count.
+        """
+        if self.near_unique:
+            return True
+        return (
+            distinct_count is not None
+            and self.non_null_count >= NEAR_UNIQUE_MIN_ROWS
+            and distinct_count >= NEAR_UNIQUE_RATIO * self.non_null_count
+        )
+
+    def apply_heavy_hitters_to(self, profile: ColumnProfile, top_k: int = 10):
+        """
+        Writes the most frequent values of the heavy-hitters summary into a
+        column profile. Every count is at most `top_k_error` below the true
+        frequency; inexact counts are marked as estimates. Near-unique and
+        binary columns get no top-k values.
+        """
+        if self.binary or self.is_near_unique(profile.distinct_count):
+            profile.top_k_values = []
+            return
+        profile.top_k_values = self.heavy_hitters.top(top_k)
+        profile.top_k_error = self.heavy_hitters.error_bound()
+        if profile.top_k_values and not self.heavy_hitters.is_exact():
+            if "top_k_values" not in profile.estimated_fields:
+                profile.estimated_fields.append("top_k_values")
+
+    def estimate_distinct(self, population_non_null: int) -> int:
+        """
+        Estimates the distinct count of the whole column from the sample
+        frequencies with the Duj1 estimator of Haas and Stokes (also used by
+        PostgreSQL's ANALYZE): n*d / (n - f1 + f1*n/N), where f1 is the number
+        of values seen exactly once in the sample.
+        """
+        sample_distinct = len(self.frequencies)
+        sample_size = self.non_null_count
+        if not sample_size or population_non_null <= sample_size:
+            return sample_distinct
+        singletons = sum(1 for count in self.frequencies.values() if count == 1)
+        denominator = sample_size - singletons + singletons * sample_size / population_non_null
+        estimate = round(sample_size * sample_distinct / denominator)
+        return int(min(max(estimate, sample_distinct), population_non_null))
+
+    def apply_sample_to(self, profile: ColumnProfile, total_rows: int, top_k: int = 10):
+        """
+        Writes statistics computed from a sample into a column profile,
+        scaling counts up to `total_rows` and marking them as estimates.
+        Near-unique columns get no top-k values, and values seen only once in
+        the sample are left out of them. Requires the accumulator to track
+        frequencies.
+        """
+        scale = total_rows / self.row_count if self.row_count else 0.0
+        profile.null_count = round(self.null_count * scale)
+        profile.non_null_count = total_rows - profile.null_count
+        profile.distinct_count = self.estimate_distinct(profile.non_null_count)
+        sample_distinct = len(self.frequencies)
+        if self.binary or (self.non_null_count and sample_distinct >= NEAR_UNIQUE_RATIO * self.non_null_count):
+            # Near-unique in the sample: scaling would claim every value repeats
+            profile.top_k_values = []
+        else:
+            # A value seen once in the sample is no evidence that it repeats
+            most_common = sorted(
+                ((value_hash, count) for value_hash, count in self.frequencies.items() if count > 1),
+                key=lambda item: item[1],
+                reverse=True,
+            )[:top_k]
+            profile.top_k_values = [
+                (self.representatives[value_hash], round(count * scale))
+                for value_hash, count in most_common
+            ]
+        profile.min_value = None
+        self.apply_to(profile)
+        profile.estimated_fields = [
+            "null_count", "non_null_count", "distinct_count",
+            "min_value", "max_value", "top_k_values",
+        ] + [name for name in QUANTILE_FIELDS if getattr(profile, name)]
+
+
+class TableScanner:
+    """
+    Reads a table exactly once in fixed-size row batches and feeds every
+    batch to one ColumnAccumulator per column.
+    """
+
+    def __init__(
+        self,
+        meta_table,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        num_perm: int = NUM_PERM,
+        track_frequencies: bool = False,
+    ):
+        self.meta_table = meta_table
+        self.batch_size = batch_size
+        self.accumulators: Dict[str, ColumnAccumulator] = {
+            column.name: ColumnAccumulator(
+                column.name,
+                numeric=is_numeric_type(column.type),
+                text=is_text_type(str(column.type)),
+                num_perm=num_perm,
+                track_frequencies=track_frequencies,
+                binary=is_binary_type(column.type),
+                temporal=temporal_kind(column.type),
+                integer=isinstance(column.type, Integer),
+            )
+            for column in meta_table.columns
+        }
+
+    def update(self, rows: Sequence):
+        """Updates every column accumulator with one batch of rows."""
+        if not rows:
+            return
+        for idx, accumulator in enumerate(self.accumulators.values()):
+            values = np.fromiter((row[idx] for row in rows), dtype=object, count=len(rows))
+            accumulator.update(values)
+
+    @property
+    def row_count(self) -> int:
+        """The number of rows scanned so far."""
+        return next(iter(self.accumulators.values())).row_count if self.accumulators else 0
+
+    def scan(self, connection, statement=None):
+        """
+        Streams the rows of `statement` (by default all columns of the table)
+        through a server-side cursor, so at most one batch is held in memory.
+        The statement must select the table's columns in their table order;
+        binary columns are replaced by a server-side digest where the
+        database has one (see `scan_expression`).
+        """
+        if statement is None:
+            statement = select(*self.meta_table.columns)
+        dialect_name = connection.dialect.name
+        statement = statement.with_only_columns(
+            *(scan_expression(column, dialect_name) for column in statement.selected_columns)
+        )
+        result = connection.execution_options(
+            stream_results=True, yield_per=self.batch_size
+        ).execute(statement)
+        for partition in result.partitions(self.batch_size):
+            self.update(partition)
+
+    def merge(self, other: "TableScanner"):
+        """Merges the scanner of another, disjoint partition of the table."""
+        for name, accumulator in self.accumulators.items():
+            accumulator.merge(other.accumulators[name])
+
+    def apply_to(self, profiles: Dict[str, ColumnProfile]):
+        """Writes the statistics of every column into the matching profile."""
+        for name, accumulator in self.accumulators.items():
+            accumulator.apply_to(profiles[name])
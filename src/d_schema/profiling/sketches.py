@@ -0,0 +1,262 @@
+# d_schema/profiling/sketches.py
+
+import hashlib
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+from datasketch import HyperLogLogPlusPlus, LeanMinHash, MinHash
+
+NUM_PERM = 128
+
+_LOW_32_BITS = np.uint64(0xFFFFFFFF)
+
+
+def hash_values(values: Iterable[str]) -> np.ndarray:
+    """
+    Hashes string values to 64-bit integers.
+
+    The low 32 bits equal datasketch's `sha1_hash32` of the UTF-8 encoded
+    value, so sketches built from these hashes are identical to sketches
+    built with `MinHash.update(value.encode("utf8"))`.
+    """
+    return np.fromiter(
+        (
+            int.from_bytes(hashlib.sha1(value.encode("utf8")).digest()[:8], "little")
+            for value in values
+        ),
+        dtype=np.uint64,
+    )
+
+
+def new_minhash(num_perm: int = NUM_PERM) -> MinHash:
+    """Creates a MinHash that is updated with precomputed hashes (see `update_minhash`)."""
+    return MinHash(num_perm=num_perm, hashfunc=int)
+
+
+def update_minhash(minhash: MinHash, hashes: np.ndarray) -> None:
+    """Updates a MinHash with a batch of hashes produced by `hash_values`."""
+    if hashes.size:
+        minhash.update_batch(np.bitwise_and(hashes, _LOW_32_BITS).tolist())
+
+
+def serialize_minhash(minhash: MinHash) -> bytearray:
+    """Serializes a MinHash through LeanMinHash for compact storage."""
+    lean_m = LeanMinHash(minhash)
+    buffer = bytearray(lean_m.bytesize())
+    lean_m.serialize(buffer)
+    return buffer
+
+
+def deserialize_minhash(buffer: bytes) -> LeanMinHash:
+    """Restores a sketch stored in `ColumnProfile.minhash_sketch`."""
+    return LeanMinHash.deserialize(buffer)
+
+
+# --- HyperLogLog ---
+
+HLL_PRECISION = 14
+
+
+def new_hll(p: int = HLL_PRECISION) -> HyperLogLogPlusPlus:
+    """Creates a HyperLogLog++ sketch that is updated with `update_hll`."""
+    return HyperLogLogPlusPlus(p=p, hashfunc=int)
+
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    """Vectorized int.bit_length() for an array of uint64 values."""
+    values = values.copy()
+    lengths = np.zeros(values.shape, dtype=np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        mask = values >= (np.uint64(1) << np.uint64(shift))
+        lengths[mask] += shift
+        values[mask] >>= np.uint64(shift)
+    lengths += (values > 0)
+    return lengths
+
+
+def update_hll(hll: HyperLogLogPlusPlus, hashes: np.ndarray) -> None:
+    """
+    Updates a HyperLogLog++ sketch with a batch of 64-bit hashes produced by
+    `hash_values`. Equivalent to calling `hll.update()` for every hash.
+    """
+    if not hashes.size:
+        return
+    register_index = np.bitwise_and(hashes, np.uint64(hll.m - 1)).astype(np.int64)
+    ranks = hll.max_rank - _bit_length(hashes >> np.uint64(hll.p)) + 1
+    np.maximum.at(hll.reg, register_index, ranks.astype(hll.reg.dtype))
+
+
+# --- Heavy hitters ---
+
+HEAVY_HITTERS_CAPACITY = 100
+
+
+class HeavyHitters:
+    """
+    A Misra-Gries summary of the most frequent values, keyed by value hash.
+
+    At most `capacity` counters are kept. Every counter underestimates the
+    true frequency of its value by at most `error_bound()`, and every value
+    occurring more than n / (capacity + 1) times is guaranteed to be kept.
+    Summaries are mergeable (Agarwal et al., "Mergeable Summaries"), so
+    partial summaries of disjoint partitions combine into a summary of the
+    whole column with the same guarantee.
+    """
+
+    def __init__(self, capacity: int = HEAVY_HITTERS_CAPACITY):
+        self.capacity = capacity
+        self.keys = np.empty(0, dtype=np.uint64)
+        self.counts = np.empty(0, dtype=np.int64)
+        # Value hash -> value, for the hashes that hold a counter
+        self.values: Dict[int, str] = {}
+        self.total = 0
+
+    def update(self, hashes: np.ndarray, strings: np.ndarray):
+        """
+        Adds a batch of values.
+
+        Args:
+            hashes: The hashes of the values, as produced by `hash_values`.
+            strings: The values as strings, aligned with `hashes`.
+        """
+        if not hashes.size:
+            return
+        unique_hashes, first_index, counts = np.unique(
+            hashes, return_index=True, return_counts=True
+        )
+        self.total += int(hashes.size)
+
+        def lookup(value_hash: int) -> str:
+            position = np.searchsorted(unique_hashes, np.uint64(value_hash))
+            return strings[first_index[position]]
+
+        self._combine(unique_hashes, counts.astype(np.int64), lookup)
+
+    def merge(self, other: "HeavyHitters"):
+        """Merges the summary of another partition into this one."""
+        self.total += other.total
+        self._combine(other.keys, other.counts, other.values.__getitem__)
+
+    def _combine(self, keys: np.ndarray, counts: np.ndarray, lookup: Callable[[int], str]):
+        all_keys, inverse = np.unique(
+            np.concatenate([self.keys, keys]), return_inverse=True
+        )
+        summed = np.bincount(
+            inverse, weights=np.concatenate([self.counts, counts]), minlength=all_keys.size
+        ).astype(np.int64)
+        if all_keys.size > self.capacity:
+            # Subtracting the (capacity + 1)-th largest counter leaves at
+            # most `capacity` positive counters.
+            summed -= np.partition(summed, -(self.capacity + 1))[-(self.capacity + 1)]
+            kept = summed > 0
+            all_keys, summed = all_keys[kept], summed[kept]
+
+        values = {}
+        for value_hash in all_keys.tolist():
+            value = self.values.get(value_hash)
+            values[value_hash] = value if value is not None else lookup(value_hash)
+        self.keys, self.counts, self.values = all_keys, summed, values
+
+    def error_bound(self) -> int:
+        """The largest possible undercount of any counter."""
+        return (self.total - int(self.counts.sum())) // (self.capacity + 1)
+
+    def is_exact(self) -> bool:
+        """True if no counter was ever decremented, i.e. all counts are exact."""
+        return self.total == int(self.counts.sum())
+
+    def top(self, k: int) -> List[Tuple[str, int]]:
+        """Returns up to `k` (value, count) pairs, most frequent first."""
+        order = np.argsort(-self.counts, kind="stable")[:k]
+        return [
+            (self.values[int(self.keys[i])], int(self.counts[i])) for i in order
+        ]
+
+
+# --- Quantiles ---
+
+KLL_K = 200
+
+
+class KLLSketch:
+    """
+    A KLL quantile sketch (Karnin, Lang and Liberty) over float values.
+
+    Items are kept in a hierarchy of compactors; an item at level h stands for
+    2**h input values. When a compactor overflows, its items are sorted and
+    every other one (starting at a random offset) is promoted to the next
+    level. Compactor capacities shrink geometrically towards the lower
+    levels, so memory stays O(k) regardless of the number of values, and the
+    rank error of quantiles is about 1.7 / k with high probability. Sketches
+    of disjoint partitions merge into a sketch of their union.
+    """
+
+    def __init__(self, k: int = KLL_K, seed: int = 0):
+        self.k = k
+        self.count = 0
+        self.levels: List[np.ndarray] = [np.empty(0, dtype=np.float64)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def update(self, values: np.ndarray):
+        """Adds a batch of float values (NaNs are ignored)."""
+        values = values[~np.isnan(values)]
+        if not values.size:
+            return
+        self.count += int(values.size)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other: "KLLSketch"):
+        """Merges the sketch of another partition into this one."""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0, dtype=np.float64))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.count += other.count
+        self._compress()
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if items.size > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0, dtype=np.float64))
+                items = np.sort(items)
+                # An odd item out stays at this level
+                kept = items[items.size - items.size % 2:]
+                paired = items[:items.size - items.size % 2]
+                promoted = paired[int(self._rng.integers(2))::2]
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+                self.levels[level] = kept
+            level += 1
+
+    def is_exact(self) -> bool:
+        """True while no compaction has happened, i.e. all values are kept."""
+        return len(self.levels) == 1
+
+    def quantiles(self, fractions: Sequence[float]) -> List[float]:
+        """
+        Returns the approximate values at the given rank fractions (0 to 1).
+
+        Returns:
+            One value per fraction, or an empty list if the sketch is empty.
+        """
+        if not self.count:
+            return []
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([
+            np.full(level_items.size, 2 ** level, dtype=np.int64)
+            for level, level_items in enumerate(self.levels)
+        ])
+        order = np.argsort(items, kind="stable")
+        items, cumulative = items[order], np.cumsum(weights[order])
+        total = cumulative[-1]
+        positions = np.searchsorted(
+            cumulative, np.clip(np.asarray(fractions) * total, 1, total), side="left"
+        )
+        return items[np.minimum(positions, items.size - 1)].tolist()
@@ -0,0 +1,130 @@
+# d_schema/profiling/timeouts.py
+
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+from sqlalchemy import event
+
+# SQLite calls the progress handler every this many virtual machine instructions
+_SQLITE_PROGRESS_STEPS = 10_000
+
+# Key of the active deadline in Connection.info
+_DEADLINE_INFO_KEY = "d_schema_statement_deadline"
+
+
+class ProfilingTimeout(Exception):
+    """Raised when a statement is about to start after its deadline has passed."""
+
+
+class StatementDeadline:
+    """
+    A point in time after which no statement on a connection may run.
+    """
+
+    def __init__(self, seconds: Optional[float]):
+        self.deadline = time.monotonic() + seconds if seconds is not None else None
+        self.expired = False
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left until the deadline, or None if there is no deadline."""
+        if self.deadline is None:
+            return None
+        return self.deadline - time.monotonic()
+
+    def check(self):
+        """Marks the deadline as expired and raises if it has passed."""
+        remaining = self.remaining()
+        if remaining is not None and remaining <= 0:
+            self.expired = True
+            raise ProfilingTimeout("Profiling time budget exhausted")
+
+
+def active_deadline(connection) -> Optional[StatementDeadline]:
+    """
+    Returns the deadline enforced on `connection` by an enclosing
+    `statement_deadline`, so that work spread over further connections can
+    honor the same limit.
+    """
+    return connection.info.get(_DEADLINE_INFO_KEY)
+
+
+def _execute_on_plain_cursor(connection, statement: str):
+    """
+    Runs a statement on a new client-side cursor of the connection. The
+    cursor handed to before_cursor_execute can be a named server-side cursor
+    (streamed scans), which would wrap the statement in DECLARE ... CURSOR
+    FOR and cannot be executed twice.
+    """
+    cursor = connection.connection.dbapi_connection.cursor()
+    try:
+        cursor.execute(statement)
+    finally:
+        cursor.close()
+
+
+@contextmanager
+def statement_deadline(connection, seconds: Optional[float]):
+    """
+    Enforces a hard deadline on every statement executed on `connection`
+    inside the context.
+
+    Before each statement, the remaining time is pushed to the server as a
+    statement timeout (PostgreSQL `statement_timeout`, MySQL
+    `MAX_EXECUTION_TIME`); SQLite statements are interrupted through a
+    progress handler (sqlite3 driver only). Statements that would start after the deadline raise
+    ProfilingTimeout without reaching the database.
+
+    Yields:
+        The StatementDeadline, whose `expired` flag tells whether any
+        statement was cut short.
+    """
+    deadline = StatementDeadline(seconds)
+    if seconds is None:
+        yield deadline
+        return
+
+    dialect = connection.dialect.name
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        deadline.check()
+        milliseconds = max(1, int(deadline.remaining() * 1000))
+        if dialect == "postgresql":
+            _execute_on_plain_cursor(conn, f"SET statement_timeout = {milliseconds}")
+        elif dialect in ("mysql", "mariadb"):
+            _execute_on_plain_cursor(conn, f"SET SESSION MAX_EXECUTION_TIME = {milliseconds}")
+
+    def sqlite_progress_handler():
+        if deadline.remaining() <= 0:
+            deadline.expired = True
+            return 1
+        return 0
+
+    event.listen(connection, "before_cursor_execute", before_cursor_execute)
+    connection.info[_DEADLINE_INFO_KEY] = deadline
+    driver_connection = connection.connection.driver_connection
+    # Async drivers (aiosqlite) run the sqlite3 connection in a thread of
+    # their own; there, statements are only checked before they start.
+    use_progress_handler = dialect == "sqlite" and isinstance(driver_connection, sqlite3.Connection)
+    if use_progress_handler:
+        driver_connection.set_progress_handler(sqlite_progress_handler, _SQLITE_PROGRESS_STEPS)
+    try:
+        yield deadline
+    finally:
+        event.remove(connection, "before_cursor_execute", before_cursor_execute)
+        connection.info.pop(_DEADLINE_INFO_KEY, None)
+        if deadline.remaining() <= 0:
+            deadline.expired = True
+        if use_progress_handler:
+            driver_connection.set_progress_handler(None, 0)
+        elif dialect != "sqlite":
+            # Rolling back also reverts PostgreSQL's (transactional) SET and
+            # clears a transaction aborted by a timed-out statement.
+            connection.rollback()
+            if dialect in ("mysql", "mariadb"):
+                cursor = driver_connection.cursor()
+                try:
+                    cursor.execute("SET SESSION MAX_EXECUTION_TIME = 0")
+                finally:
+                    cursor.close()
@@ -0,0 +1,89 @@
+# d_schema/profiling/values.py
+
+from typing import Optional
+
+from sqlalchemy import func, cast, Text, String, JSON, LargeBinary
+
+# Longest value (in characters) transferred for samples, min/max and top-k
+DEFAULT_MAX_VALUE_LENGTH = 200
+
+# Appended to values that were cut at the maximum length
+TRUNCATION_MARK = "..."
+
+_BINARY_TYPE_NAMES = ("BLOB", "BINARY", "BYTEA", "IMAGE")
+_LONG_TEXT_TYPE_NAMES = ("TEXT", "CLOB", "JSON", "XML")
+
+
+def is_binary_type(sa_type) -> bool:
+    """Returns True for binary and binary LOB column types."""
+    if isinstance(sa_type, LargeBinary):
+        return True
+    type_str = str(sa_type).upper()
+    return any(name in type_str for name in _BINARY_TYPE_NAMES)
+
+
+def needs_truncation(sa_type, max_length: Optional[int]) -> bool:
+    """
+    Returns True if values of the type may be longer than `max_length`
+    characters: unbounded or long strings, text LOBs and JSON documents.
+    """
+    if max_length is None:
+        return False
+    if isinstance(sa_type, JSON):
+        return True
+    if isinstance(sa_type, String):
+        return sa_type.length is None or sa_type.length > max_length
+    type_str = str(sa_type).upper()
+    return any(name in type_str for name in _LONG_TEXT_TYPE_NAMES)
+
+
+def prefix_expression(expression, sa_type, dialect_name: str, max_length: int):
+    """
+    Wraps an expression so that the database returns at most one character
+    more than `max_length`, which is enough to tell truncated values apart.
+    """
+    if not isinstance(sa_type, String):
+        # JSON documents and unknown text types are cut as text
+        expression = cast(expression, Text)
+    substring = func.substring if dialect_name == "mssql" else func.substr
+    return substring(expression, 1, max_length + 1)
+
+
+def value_expression(meta_column, dialect_name: str, max_length: Optional[int]):
+    """
+    Returns the expression to select when values of a column are shown
+    (samples, top-k values): the column itself, a server-side prefix of it
+    for long text, or None for binary columns, whose values are not
+    transferred at all.
+    """
+    sa_type = meta_column.type
+    if is_binary_type(sa_type):
+        return None
+    if needs_truncation(sa_type, max_length):
+        return prefix_expression(meta_column, sa_type, dialect_name, max_length)
+    return meta_column
+
+
+def scan_expression(meta_column, dialect_name: str):
+    """
+    Returns the expression a streaming scan selects for a column. Binary
+    values are only counted and sketched, so where the database has a
+    digest function (MD5 on PostgreSQL and MySQL, HASHBYTES on SQL Server)
+    the scan reads the digest instead of the value. Elsewhere, e.g. for
+    SQLite, which runs in-process, the column itself is read.
+    """
+    if not is_binary_type(meta_column.type):
+        return meta_column
+    if dialect_name in ("postgresql", "mysql", "mariadb"):
+        return func.md5(meta_column).label(meta_column.name)
+    if dialect_name == "mssql":
+        return func.hashbytes("SHA2_256", meta_column).label(meta_column.name)
+    return meta_column
+
+
+def display_value(value, max_length: Optional[int]) -> str:
+    """Converts a value to text, cutting it at `max_length` characters."""
+    text = str(value)
+    if max_length is not None and len(text) > max_length:
+        return text[:max_length] + TRUNCATION_MARK
+    return text
@@ -0,0 +1,121 @@
+# d_schema/reflection.py
+
+import fnmatch
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import table, column
+
+
+@dataclass
+class TableCatalog:
+    """
+    The catalog entries of a single table, as returned by the inspector.
+    """
+    name: str
+    columns: List[Dict[str, Any]]
+    primary_keys: List[str] = field(default_factory=list)
+    foreign_keys: List[Dict[str, Any]] = field(default_factory=list)
+    comment: Optional[str] = None
+    # Cheap signature of the table's data, read for incremental parses
+    change_signal: Optional[str] = None
+
+    def query_table(self):
+        """
+        Builds a lightweight SQLAlchemy table construct that can be used as
+        the target of sample and profiling queries without reflecting the
+        table a second time through MetaData.
+        """
+        return table(
+            self.name,
+            *[column(col["name"], col["type"]) for col in self.columns],
+        )
+
+
+def _matches(table_name: str, pattern: str) -> bool:
+    """
+    Matches a table name against a glob pattern, or against a regular
+    expression if the pattern starts with "re:".
+    """
+    if pattern.startswith("re:"):
+        return re.fullmatch(pattern[3:], table_name) is not None
+    return fnmatch.fnmatchcase(table_name, pattern)
+
+
+def filter_table_names(
+    table_names: Sequence[str],
+    tables: Optional[Sequence[str]] = None,
+    include: Optional[Sequence[str]] = None,
+    exclude: Optional[Sequence[str]] = None,
+) -> List[str]:
+    """
+    Selects the tables to parse, keeping the order of `table_names`.
+
+    Args:
+        table_names: All table names of the database.
+        tables: An explicit list of tables. If given, only these are kept.
+        include: Patterns of which at least one must match (if given).
+        exclude: Patterns of which none may match.
+
+    Returns:
+        The selected table names.
+    """
+    selected = list(table_names)
+    if tables:
+        missing = set(tables) - set(selected)
+        for table_name in sorted(missing):
+            print(f"Table '{table_name}' not found in the database. Skipping.")
+        wanted = set(tables)
+        selected = [name for name in selected if name in wanted]
+    if include:
+        selected = [name for name in selected if any(_matches(name, p) for p in include)]
+    if exclude:
+        selected = [name for name in selected if not any(_matches(name, p) for p in exclude)]
+    return selected
+
+
+def reflect_catalog(inspector, table_names: Sequence[str]) -> Dict[str, TableCatalog]:
+    """
+    Fetches columns, primary keys, foreign keys and comments of many tables
+    with the inspector's multi-table methods, which most dialects answer with
+    a handful of catalog queries instead of several queries per table.
+
+    Args:
+        inspector: A SQLAlchemy Inspector.
+        table_names: The tables to reflect.
+
+    Returns:
+        A dict mapping table names to their catalog entries, in the order of
+        `table_names`. Tables that could not be reflected are missing.
+    """
+    if not table_names:
+        return {}
+    filter_names = list(table_names)
+
+    columns = _by_table_name(inspector.get_multi_columns(filter_names=filter_names))
+    pk_constraints = _by_table_name(inspector.get_multi_pk_constraint(filter_names=filter_names))
+    foreign_keys = _by_table_name(inspector.get_multi_foreign_keys(filter_names=filter_names))
+    try:
+        comments = _by_table_name(inspector.get_multi_table_comment(filter_names=filter_names))
+    except NotImplementedError:
+        # Dialects without comment support (e.g. SQLite)
+        comments = {}
+
+    catalog = {}
+    for table_name in table_names:
+        if table_name not in columns:
+            continue
+        catalog[table_name] = TableCatalog(
+            name=table_name,
+            columns=columns[table_name],
+            primary_keys=(pk_constraints.get(table_name) or {}).get("constrained_columns", []),
+            foreign_keys=foreign_keys.get(table_name, []),
+            comment=(comments.get(table_name) or {}).get("text"),
+        )
+    return catalog
+
+
+def _by_table_name(multi_result: Dict) -> Dict[str, Any]:
+    """Re-keys a get_multi_* result from (schema, table_name) to table_name."""
+    return {table_name: value for (_, table_name), value in multi_result.items()}
@@ -0,0 +1,121 @@
+# d_schema/sample_values.py
+
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import select, String, Date
+from sqlalchemy.exc import SQLAlchemyError
+
+from .profiling.values import DEFAULT_MAX_VALUE_LENGTH, display_value, value_expression
+
+# Rows read per table to pick sample values from. Columns that are still
+# short of distinct non-null values afterwards are queried on their own.
+SAMPLE_VALUE_BLOCK_ROWS = 1000
+
+
+def _sample_column(meta_table, column: Dict[str, Any], dialect_name: str, max_length: Optional[int]):
+    """
+    Selects a column for sampling: dates are read as text, as they are shown,
+    long text is cut server-side and binary columns are not read (None).
+    """
+    meta_column = meta_table.c[column["name"]]
+    if isinstance(column["type"], Date):
+        return meta_column.cast(String)
+    return value_expression(meta_column, dialect_name, max_length)
+
+
+def fetch_sample_values(
+    connection,
+    meta_table,
+    columns: Sequence[Dict[str, Any]],
+    num_samples: int,
+    block_rows: int = SAMPLE_VALUE_BLOCK_ROWS,
+    max_length: Optional[int] = DEFAULT_MAX_VALUE_LENGTH,
+) -> Dict[str, List[str]]:
+    """
+    Fetches up to `num_samples` distinct non-null example values of every
+    column of a table.
+
+    A single query reads a block of at most `block_rows` rows with all
+    columns, and the samples are picked on the client. Only columns with too
+    few distinct values in that block fall back to their own
+    `SELECT DISTINCT ... LIMIT` query, and only if the block did not already
+    cover the whole table.
+
+    Args:
+        connection: An open SQLAlchemy connection.
+        meta_table: The table to sample.
+        columns: The inspector's column entries of the table.
+        num_samples: Number of distinct sample values per column.
+        block_rows: Number of rows read by the batched query.
+        max_length: Maximum number of characters of a sample value (None
+            for no limit).
+
+    Returns:
+        A dict mapping column names to their sample values as strings.
+    """
+    samples: Dict[str, List[str]] = {column["name"]: [] for column in columns}
+    dialect_name = connection.dialect.name
+    expressions = {
+        column["name"]: _sample_column(meta_table, column, dialect_name, max_length)
+        for column in columns
+    }
+    columns = [column for column in columns if expressions[column["name"]] is not None]
+    if num_samples <= 0 or not columns:
+        return samples
+
+    table_name = meta_table.name
+    block_limit = max(block_rows, num_samples)
+    try:
+        rows = connection.execute(
+            select(*[expressions[column["name"]] for column in columns]).limit(block_limit)
+        ).all()
+        covers_table = len(rows) < block_limit
+    except SQLAlchemyError as e:
+        print(f"Could not fetch sample rows for {table_name}: {e}")
+        connection.rollback()
+        rows, covers_table = [], False
+
+    for idx, column in enumerate(columns):
+        column_samples = samples[column["name"]]
+        seen = set()
+        for row in rows:
+            value = row[idx]
+            if value is None:
+                continue
+            text = display_value(value, max_length)
+            if text not in seen:
+                seen.add(text)
+                column_samples.append(text)
+                if len(column_samples) == num_samples:
+                    break
+
+        if len(column_samples) < num_samples and not covers_table:
+            # Sparse column: look beyond the block
+            samples[column["name"]] = _fetch_column_samples(
+                connection, meta_table, column, expressions[column["name"]], num_samples, max_length
+            )
+    return samples
+
+
+def _fetch_column_samples(
+    connection,
+    meta_table,
+    column: Dict[str, Any],
+    expression,
+    num_samples: int,
+    max_length: Optional[int],
+) -> List[str]:
+    """Fetches the distinct non-null sample values of a single column."""
+    meta_column = meta_table.c[column["name"]]
+    try:
+        query = (
+            select(expression)
+            .distinct()
+            .where(meta_column.isnot(None))
+            .limit(num_samples)
+        )
+        return [display_value(row[0], max_length) for row in connection.execute(query)]
+    except SQLAlchemyError as e:
+        print(f"Could not fetch samples for {meta_table.name}.{column['name']}: {e}")
+        connection.rollback()
+        return []
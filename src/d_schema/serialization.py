@@ -0,0 +1,371 @@
+# d_schema/serialization.py
+
+import base64
+import dataclasses
+import json
+import math
+import mmap
+import struct
+from typing import Any, Dict, List, Optional, Tuple
+
+from .structures import (
+    ColumnInfo,
+    ColumnProfile,
+    DatabaseSchema,
+    LazyTableList,
+    TableInfo,
+    TableProfile,
+)
+
+# --- Binary format ---
+#
+#   header       magic, version, table count and the offsets of the sections below
+#   descriptor   JSON list of the (field, kind) layout of every structure
+#   tables       one record per table, fields encoded in descriptor order
+#   sketches     all MinHash sketches, back to back
+#   strings      string count, (count + 1) end offsets, then the UTF-8 bytes
+#   index        database name string, then the name string, record offset
+#                and record length of every table
+#
+# Strings are stored once and referenced by their number everywhere else.
+# Loading maps the file into memory; the header, index and string offsets are
+# read in place, and table records and strings are decoded on first access.
+
+MAGIC = b"DSCHEMA\0"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<8sIIQQQQQ")
+_INDEX_ENTRY = struct.Struct("<IQI")
+_U8 = struct.Struct("<B")
+_U32 = struct.Struct("<I")
+_U64 = struct.Struct("<Q")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+_TOP_K_ITEM = struct.Struct("<Iq")
+_SKETCH_REF = struct.Struct("<QI")
+
+_NO_STRING = 0xFFFFFFFF
+_NO_INT = -(2 ** 63)
+
+# Field kinds: i = int, f = float, s = string, b = bool, S = string list,
+# T = (string, int) list, B = sketch bytes, P/Q = column/table profile,
+# C = column list
+_FIELD_KINDS = {
+    int: "i",
+    Optional[int]: "i",
+    float: "f",
+    Optional[float]: "f",
+    str: "s",
+    Optional[str]: "s",
+    bool: "b",
+    List[str]: "S",
+    List[Tuple[str, int]]: "T",
+    Optional[bytes]: "B",
+    Optional[ColumnProfile]: "P",
+    Optional[TableProfile]: "Q",
+    List[ColumnInfo]: "C",
+}
+_KIND_NAMES = {
+    "i": "int", "f": "float", "s": "string", "b": "bool", "S": "strings", "T": "top_k",
+    "B": "sketch", "P": "column_profile", "Q": "table_profile", "C": "columns",
+}
+_CLASSES = {cls.__name__: cls for cls in (TableInfo, ColumnInfo, ColumnProfile, TableProfile)}
+
+
+def _layout(cls) -> List[Tuple[str, str]]:
+    """Returns the (field, kind) layout of a structure."""
+    return [(f.name, _FIELD_KINDS[f.type]) for f in dataclasses.fields(cls)]
+
+
+class _Encoder:
+    """Encodes table records, collecting strings and sketches on the way."""
+
+    def __init__(self):
+        self.layouts = {name: _layout(cls) for name, cls in _CLASSES.items()}
+        self.string_ids: Dict[str, int] = {}
+        self.strings: List[str] = []
+        self.sketches = bytearray()
+
+    def string(self, value: Optional[str]) -> int:
+        if value is None:
+            return _NO_STRING
+        sid = self.string_ids.get(value)
+        if sid is None:
+            sid = self.string_ids[value] = len(self.strings)
+            self.strings.append(value)
+        return sid
+
+    def record(self, obj, out: bytearray):
+        for name, kind in self.layouts[type(obj).__name__]:
+            self.value(kind, getattr(obj, name), out)
+
+    def value(self, kind: str, value, out: bytearray):
+        if kind == "s":
+            out += _U32.pack(self.string(value))
+        elif kind == "i":
+            out += _I64.pack(_NO_INT if value is None else value)
+        elif kind == "f":
+            out += _F64.pack(math.nan if value is None else value)
+        elif kind == "b":
+            out += _U8.pack(bool(value))
+        elif kind == "S":
+            out += _U32.pack(len(value))
+            out += struct.pack(f"<{len(value)}I", *(self.string(item) for item in value))
+        elif kind == "T":
+            out += _U32.pack(len(value))
+            for item, count in value:
+                out += _TOP_K_ITEM.pack(self.string(item), count)
+        elif kind == "B":
+            if value is None:
+                out += _SKETCH_REF.pack(0, _NO_STRING)
+            else:
+                out += _SKETCH_REF.pack(len(self.sketches), len(value))
+                self.sketches += value
+        elif kind in ("P", "Q"):
+            out += _U8.pack(value is not None)
+            if value is not None:
+                self.record(value, out)
+        elif kind == "C":
+            out += _U32.pack(len(value))
+            for column_info in value:
+                self.record(column_info, out)
+
+
+def dump_binary(schema: DatabaseSchema, path: str):
+    """Writes a schema to a file in the binary format."""
+    encoder = _Encoder()
+    db_name_sid = encoder.string(schema.db_name)
+    records = bytearray()
+    index = []
+    for table_info in schema.tables:
+        start = len(records)
+        encoder.record(table_info, records)
+        index.append((encoder.string(table_info.name), start, len(records) - start))
+
+    descriptor = json.dumps(encoder.layouts).encode("utf-8")
+    encoded = [value.encode("utf-8") for value in encoder.strings]
+    ends, end = [], 0
+    for data in encoded:
+        end += len(data)
+        ends.append(end)
+    strings = _U32.pack(len(encoded)) + struct.pack(f"<{len(ends) + 1}Q", 0, *ends) + b"".join(encoded)
+
+    descriptor_offset = _HEADER.size
+    tables_offset = descriptor_offset + _U32.size + len(descriptor)
+    sketches_offset = tables_offset + len(records)
+    strings_offset = sketches_offset + len(encoder.sketches)
+    index_offset = strings_offset + len(strings)
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(
+            MAGIC, FORMAT_VERSION, len(index), descriptor_offset,
+            tables_offset, sketches_offset, strings_offset, index_offset,
+        ))
+        f.write(_U32.pack(len(descriptor)) + descriptor)
+        f.write(records)
+        f.write(encoder.sketches)
+        f.write(strings)
+        f.write(_U32.pack(db_name_sid))
+        for entry in index:
+            f.write(_INDEX_ENTRY.pack(*entry))
+
+
+class _BinaryReader:
+    """Decodes strings and table records of a memory-mapped binary schema file."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (
+            magic, version, self.table_count, descriptor_offset,
+            self.tables_offset, self.sketches_offset, strings_offset, index_offset,
+        ) = _HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a D-Schema binary file.")
+        if version > FORMAT_VERSION:
+            raise ValueError(
+                f"{path} uses format version {version}; this version of D-Schema reads up to {FORMAT_VERSION}."
+            )
+
+        (length,) = _U32.unpack_from(self.buffer, descriptor_offset)
+        start = descriptor_offset + _U32.size
+        self.layouts = json.loads(self.buffer[start:start + length])
+
+        (string_count,) = _U32.unpack_from(self.buffer, strings_offset)
+        ends_offset = strings_offset + _U32.size
+        self.string_ends_offset = ends_offset
+        self.string_data_offset = ends_offset + _U64.size * (string_count + 1)
+        self.strings: List[Optional[str]] = [None] * string_count
+        self._decoders: Dict[type, List[Tuple[Optional[str], Any]]] = {}
+
+        (self.db_name_sid,) = _U32.unpack_from(self.buffer, index_offset)
+        self.index_offset = index_offset + _U32.size
+
+    def string(self, sid: int) -> Optional[str]:
+        if sid == _NO_STRING:
+            return None
+        value = self.strings[sid]
+        if value is None:
+            start, end = struct.unpack_from("<2Q", self.buffer, self.string_ends_offset + _U64.size * sid)
+            start += self.string_data_offset
+            end += self.string_data_offset
+            value = self.strings[sid] = self.buffer[start:end].decode("utf-8")
+        return value
+
+    def index_entry(self, position: int) -> Tuple[int, int, int]:
+        return _INDEX_ENTRY.unpack_from(self.buffer, self.index_offset + position * _INDEX_ENTRY.size)
+
+    def table_names(self) -> List[str]:
+        return [self.string(self.index_entry(position)[0]) for position in range(self.table_count)]
+
+    def table(self, position: int) -> TableInfo:
+        _, offset, _ = self.index_entry(position)
+        table_info, _ = self.record(TableInfo, self.tables_offset + offset)
+        return table_info
+
+    def record(self, cls, offset: int):
+        values = {}
+        for name, decode in self.decoders(cls):
+            value, offset = decode(offset)
+            if name is not None:
+                values[name] = value
+        return cls(**values), offset
+
+    def decoders(self, cls):
+        """
+        Returns the (field, decoder) pairs of a structure as laid out in the
+        file. Fields the structure no longer has are decoded (to skip them)
+        but not passed on.
+        """
+        decoders = self._decoders.get(cls)
+        if decoders is None:
+            names = {f.name for f in dataclasses.fields(cls)}
+            decoders = self._decoders[cls] = [
+                (name if name in names else None, getattr(self, f"_decode_{_KIND_NAMES[kind]}"))
+                for name, kind in self.layouts[cls.__name__]
+            ]
+        return decoders
+
+    def _decode_string(self, offset: int):
+        return self.string(_U32.unpack_from(self.buffer, offset)[0]), offset + _U32.size
+
+    def _decode_int(self, offset: int):
+        (value,) = _I64.unpack_from(self.buffer, offset)
+        return (None if value == _NO_INT else value), offset + _I64.size
+
+    def _decode_float(self, offset: int):
+        (value,) = _F64.unpack_from(self.buffer, offset)
+        return (None if math.isnan(value) else value), offset + _F64.size
+
+    def _decode_bool(self, offset: int):
+        return bool(self.buffer[offset]), offset + _U8.size
+
+    def _decode_strings(self, offset: int):
+        (count,) = _U32.unpack_from(self.buffer, offset)
+        sids = struct.unpack_from(f"<{count}I", self.buffer, offset + _U32.size)
+        return [self.string(sid) for sid in sids], offset + _U32.size + 4 * count
+
+    def _decode_top_k(self, offset: int):
+        (count,) = _U32.unpack_from(self.buffer, offset)
+        offset += _U32.size
+        items = []
+        for sid, item_count in _TOP_K_ITEM.iter_unpack(self.buffer[offset:offset + count * _TOP_K_ITEM.size]):
+            items.append((self.string(sid), item_count))
+        return items, offset + count * _TOP_K_ITEM.size
+
+    def _decode_sketch(self, offset: int):
+        start, length = _SKETCH_REF.unpack_from(self.buffer, offset)
+        if length == _NO_STRING:
+            return None, offset + _SKETCH_REF.size
+        start += self.sketches_offset
+        return self.buffer[start:start + length], offset + _SKETCH_REF.size
+
+    def _decode_column_profile(self, offset: int):
+        if not self.buffer[offset]:
+            return None, offset + _U8.size
+        return self.record(ColumnProfile, offset + _U8.size)
+
+    def _decode_table_profile(self, offset: int):
+        if not self.buffer[offset]:
+            return None, offset + _U8.size
+        return self.record(TableProfile, offset + _U8.size)
+
+    def _decode_columns(self, offset: int):
+        (count,) = _U32.unpack_from(self.buffer, offset)
+        offset += _U32.size
+        columns = []
+        for _ in range(count):
+            column_info, offset = self.record(ColumnInfo, offset)
+            columns.append(column_info)
+        return columns, offset
+
+
+def load_binary(path: str) -> DatabaseSchema:
+    """
+    Loads a schema written by `dump_binary`. The file is memory-mapped and
+    every table is decoded when it is first accessed.
+    """
+    reader = _BinaryReader(path)
+    return DatabaseSchema(
+        db_name=reader.string(reader.db_name_sid),
+        tables=LazyTableList(reader.table_names(), reader.table),
+    )
+
+
+# --- JSON format ---
+
+def table_to_dict(table_info: TableInfo) -> Dict[str, Any]:
+    """Converts a table to plain JSON types; MinHash sketches become base64 text."""
+    data = dataclasses.asdict(table_info)
+    for col in data["columns"]:
+        profile = col["profile"]
+        if profile is not None and profile["minhash_sketch"] is not None:
+            profile["minhash_sketch"] = base64.b64encode(profile["minhash_sketch"]).decode("ascii")
+    return data
+
+
+def table_from_dict(data: Dict[str, Any]) -> TableInfo:
+    """Inverse of `table_to_dict`. Unknown keys are ignored and missing ones take their defaults."""
+    data = dict(data)
+    columns = []
+    for col in data.pop("columns"):
+        col = dict(col)
+        profile = col.pop("profile", None)
+        if profile is not None:
+            profile = dict(profile)
+            if profile.get("minhash_sketch") is not None:
+                profile["minhash_sketch"] = base64.b64decode(profile["minhash_sketch"])
+            profile["top_k_values"] = [tuple(item) for item in profile.get("top_k_values", [])]
+            profile = ColumnProfile(**_known_fields(ColumnProfile, profile))
+        columns.append(ColumnInfo(**_known_fields(ColumnInfo, col), profile=profile))
+    profile = data.pop("profile", None)
+    if profile is not None:
+        profile = TableProfile(**_known_fields(TableProfile, profile))
+    return TableInfo(**_known_fields(TableInfo, data), columns=columns, profile=profile)
+
+
+def dump_json(schema: DatabaseSchema, path: str):
+    """Writes a schema to a JSON file, one table at a time."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f'{{"format_version": {FORMAT_VERSION}, "db_name": {json.dumps(schema.db_name)}, "tables": [')
+        for idx, table_info in enumerate(schema.tables):
+            if idx:
+                f.write(",")
+            f.write("\n")
+            json.dump(table_to_dict(table_info), f)
+        f.write("\n]}\n")
+
+
+def load_json(path: str) -> DatabaseSchema:
+    """Loads a schema written by `dump_json`."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return DatabaseSchema(
+        db_name=data["db_name"],
+        tables=[table_from_dict(table_data) for table_data in data["tables"]],
+    )
+
+
+def _known_fields(cls, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Drops keys that are not fields of `cls`, so files of other versions still load."""
+    names = {f.name for f in dataclasses.fields(cls)}
+    return {key: value for key, value in data.items() if key in names}
@@ -0,0 +1,15 @@
+# Column similarity search and foreign key inference over the MinHash
+# sketches of profiled schemas.
+
+from .sketch_matrix import SketchMatrix
+from .lsh_index import ColumnIndex, sketch_from_values
+from .foreign_keys import InferredForeignKey, apply_foreign_keys, infer_foreign_keys
+
+__all__ = [
+    "SketchMatrix",
+    "ColumnIndex",
+    "sketch_from_values",
+    "InferredForeignKey",
+    "infer_foreign_keys",
+    "apply_foreign_keys",
+]
@@ -0,0 +1,336 @@
+# d_schema/similarity/foreign_keys.py
+
+import sys
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from datasketch import MinHashLSHEnsemble
+from sqlalchemy import column, exists, func, select, table
+from sqlalchemy.exc import SQLAlchemyError
+
+from ..profiling.scan import NEAR_UNIQUE_RATIO
+from ..profiling.sketches import NUM_PERM, deserialize_minhash
+from ..structures import ColumnInfo, DatabaseSchema, TableInfo
+from .sketch_matrix import EMPTY_HASH
+
+# Share of a column's distinct values that must appear in a unique column
+# for it to be a foreign key candidate
+DEFAULT_CONTAINMENT_THRESHOLD = 0.9
+
+# Containment threshold the LSH ensemble is tuned for. It is lower than the
+# threshold candidates must meet, because the ensemble misses many columns
+# with far fewer distinct values than the unique column that contains them
+DEFAULT_SHORTLIST_THRESHOLD = 0.6
+
+# Containment estimates of small columns are noisy, so candidates are only
+# dropped if their estimate falls this far below the threshold
+CONTAINMENT_SLACK = 0.15
+
+# Inferred foreign keys below this confidence are not applied to the schema
+DEFAULT_MIN_CONFIDENCE = 0.5
+
+# A column with few distinct values is contained in many unique columns by
+# chance; its evidence weight is distinct / (distinct + EVIDENCE_PRIOR)
+EVIDENCE_PRIOR = 4
+
+# Confidence weight of a candidate whose column name does not point at the
+# referred table or column
+UNNAMED_WEIGHT = 0.7
+
+# Evidence prior of such unnamed candidates. Enum-like columns (statuses,
+# ratings) with a few dozen distinct values fit inside the range of any
+# integer key, so without a telling name a column needs several hundred
+# distinct values to reach DEFAULT_MIN_CONFIDENCE
+UNNAMED_EVIDENCE_PRIOR = 100
+
+# Column names that say nothing about the table they refer to
+GENERIC_KEY_NAMES = frozenset({"id", "key", "code", "name", "uuid"})
+
+# Type families, checked in order against the upper-cased column type.
+# Only the families in KEY_FAMILIES take part in foreign keys.
+TYPE_FAMILIES = (
+    ("boolean", ("BOOL", "BIT")),
+    ("temporal", ("DATE", "TIME", "INTERVAL", "YEAR")),
+    ("binary", ("BLOB", "BINARY", "BYTEA", "IMAGE")),
+    ("uuid", ("UUID", "UNIQUEIDENTIFIER")),
+    ("float", ("REAL", "FLOAT", "DOUBLE")),
+    ("decimal", ("NUMERIC", "DECIMAL", "NUMBER", "MONEY")),
+    ("integer", ("INT", "SERIAL")),
+    ("text", ("CHAR", "TEXT", "CLOB", "STRING")),
+)
+KEY_FAMILIES = frozenset({"integer", "decimal", "uuid", "text"})
+
+# (table name, column name)
+ColumnRef = Tuple[str, str]
+
+
+@dataclass(slots=True)
+class InferredForeignKey:
+    """
+    A foreign key that is not declared in the database but suggested by its data.
+    """
+    table: str
+    column: str
+    referred_table: str
+    referred_column: str
+    # 0..1, from the containment, the number of distinct values and the names
+    confidence: float
+    # Share of the column's values found in the referred column: estimated
+    # from the sketches, or exact (per row) if verified
+    containment: float
+    # Non-null values without a matching referred row, if verified by a query
+    orphan_count: Optional[int] = None
+
+    @property
+    def verified(self) -> bool:
+        return self.orphan_count is not None
+
+    @property
+    def reference(self) -> str:
+        """The target in the format of `ColumnInfo.foreign_key`."""
+        return f"REFERENCES {self.referred_table}({self.referred_column})"
+
+
+def type_family(column_type: str) -> Optional[str]:
+    """Returns the type family of a column type, or None if it is not recognized."""
+    upper = column_type.upper()
+    for family, keywords in TYPE_FAMILIES:
+        if any(keyword in upper for keyword in keywords):
+            return family
+    return None
+
+
+def types_compatible(child_type: str, parent_type: str) -> bool:
+    """Returns True if values of the two column types can reference each other."""
+    child_family, parent_family = type_family(child_type), type_family(parent_type)
+    if child_family is None or parent_family is None:
+        return child_type.upper() == parent_type.upper()
+    if child_family not in KEY_FAMILIES or parent_family not in KEY_FAMILIES:
+        return False
+    return child_family == parent_family or {child_family, parent_family} == {"integer", "decimal"}
+
+
+def names_match(child_column: str, parent_table: str, parent_column: str) -> bool:
+    """
+    Returns True if a column name points at the referred table or column,
+    e.g. customer_id or customerid for customers.id, or the same
+    non-generic name on both sides.
+    """
+    child, table_name, parent = child_column.lower(), parent_table.lower(), parent_column.lower()
+    singular = table_name[:-1] if table_name.endswith("s") else table_name
+    if child == parent and parent not in GENERIC_KEY_NAMES:
+        return True
+    for prefix in (table_name, singular):
+        if child in (f"{prefix}_{parent}", f"{prefix}{parent}"):
+            return True
+    return singular in child and child.endswith(parent)
+
+
+def containment_from_jaccard(jaccard: float, size: int, other_size: int) -> float:
+    """
+    Converts a Jaccard estimate of two sets into the share of the first set
+    (of `size` elements) contained in the second.
+    """
+    if size <= 0 or jaccard <= 0.0:
+        return 0.0
+    return min(1.0, jaccard * (size + other_size) / (size * (1.0 + jaccard)))
+
+
+def _is_unique(table_info: TableInfo, column_info: ColumnInfo) -> bool:
+    """Returns True if a column is its table's only primary key column, or (nearly) all its values are distinct."""
+    primary_keys = [col for col in table_info.columns if col.primary_key]
+    if len(primary_keys) == 1 and primary_keys[0] is column_info:
+        return True
+    profile = column_info.profile
+    return bool(profile.non_null_count) and profile.distinct_count >= NEAR_UNIQUE_RATIO * profile.non_null_count
+
+
+def _is_sole_primary_key(table_info: TableInfo, column_info: ColumnInfo) -> bool:
+    return column_info.primary_key and sum(col.primary_key for col in table_info.columns) == 1
+
+
+def _confidence(containment: float, distinct_count: int, named: bool) -> float:
+    if named:
+        return containment * distinct_count / (distinct_count + EVIDENCE_PRIOR)
+    return containment * UNNAMED_WEIGHT * distinct_count / (distinct_count + UNNAMED_EVIDENCE_PRIOR)
+
+
+def count_orphans(connection, child: ColumnRef, parent: ColumnRef) -> Optional[int]:
+    """
+    Counts the non-null values of a column without a matching row in the
+    referred column, with one anti-join.
+
+    Returns:
+        The number of orphaned rows, or None if the query failed.
+    """
+    child_table = table(child[0], column(child[1])).alias("child")
+    parent_table = table(parent[0], column(parent[1])).alias("parent")
+    child_column, parent_column = child_table.c[child[1]], parent_table.c[parent[1]]
+    query = (
+        select(func.count())
+        .select_from(child_table)
+        .where(child_column.is_not(None), ~exists().where(parent_column == child_column))
+    )
+    try:
+        return connection.execute(query).scalar_one()
+    except SQLAlchemyError as e:
+        connection.rollback()
+        print(f"Could not verify {child[0]}.{child[1]} -> {parent[0]}.{parent[1]}: {e}")
+        return None
+
+
+def infer_foreign_keys(
+    schema: DatabaseSchema,
+    threshold: float = DEFAULT_CONTAINMENT_THRESHOLD,
+    connection=None,
+    shortlist_threshold: float = DEFAULT_SHORTLIST_THRESHOLD,
+    num_perm: int = NUM_PERM,
+    num_part: int = 16,
+) -> List[InferredForeignKey]:
+    """
+    Infers foreign keys between the profiled columns of one database.
+
+    1. The sketches of all unique columns (single-column primary keys and
+       columns whose values are (nearly) all distinct) go into a
+       MinHashLSHEnsemble, which finds the unique columns that likely contain
+       a given column without comparing every pair.
+    2. Candidates are pruned by type compatibility and by their containment
+       estimate (from the Jaccard estimate and the distinct counts). Columns
+       with a declared foreign key are skipped, and so are primary keys
+       unless their name points at the referred table.
+    3. With a connection, the candidates of each column are verified with an
+       anti-join counting the values without a referred row, most confident
+       first, until one holds; its containment then becomes exact.
+
+    Columns need a MinHash sketch and a distinct count, i.e. the schema must
+    be parsed with profiling (but not profile_mode=catalog).
+
+    Args:
+        schema: The parsed and profiled schema.
+        threshold: Minimum share of a column's values that must be contained
+            in the referred column.
+        connection: An open SQLAlchemy connection to the database, to verify
+            the candidates. Without it, confidences rest on the sketches alone.
+        shortlist_threshold: Containment threshold of the LSH ensemble.
+        num_perm: Number of hash values of the profiled sketches.
+        num_part: Number of size partitions of the LSH ensemble.
+
+    Returns:
+        At most one inferred foreign key per column, most confident first.
+    """
+    columns: Dict[ColumnRef, Tuple[TableInfo, ColumnInfo, object]] = {}
+    for table_info in schema.tables:
+        for column_info in table_info.columns:
+            profile = column_info.profile
+            if profile is None or profile.minhash_sketch is None or not profile.distinct_count:
+                continue
+            minhash = deserialize_minhash(profile.minhash_sketch)
+            if len(minhash) != num_perm or (minhash.hashvalues == EMPTY_HASH).all():
+                continue
+            columns[(table_info.name, column_info.name)] = (table_info, column_info, minhash)
+
+    parents = {
+        key: entry for key, entry in columns.items()
+        if type_family(entry[1].type) in KEY_FAMILIES and _is_unique(entry[0], entry[1])
+    }
+    if not parents:
+        return []
+    ensemble = MinHashLSHEnsemble(threshold=shortlist_threshold, num_perm=num_perm, num_part=num_part)
+    ensemble.index(
+        (key, minhash, column_info.profile.distinct_count) for key, (_, column_info, minhash) in parents.items()
+    )
+
+    inferred = []
+    for key, (table_info, column_info, minhash) in columns.items():
+        declared = column_info.foreign_key and column_info.foreign_key_confidence is None
+        if declared or type_family(column_info.type) not in KEY_FAMILIES:
+            continue
+        distinct_count = column_info.profile.distinct_count
+        candidates = []
+        for parent_key in ensemble.query(minhash, distinct_count):
+            if parent_key == key:
+                continue
+            _, parent_info, parent_minhash = parents[parent_key]
+            if not types_compatible(column_info.type, parent_info.type):
+                continue
+            named = names_match(column_info.name, parent_key[0], parent_key[1])
+            if not named and _is_sole_primary_key(table_info, column_info):
+                continue
+            containment = containment_from_jaccard(
+                minhash.jaccard(parent_minhash), distinct_count, parent_info.profile.distinct_count
+            )
+            if containment < threshold - CONTAINMENT_SLACK:
+                continue
+            candidates.append(InferredForeignKey(
+                table=key[0],
+                column=key[1],
+                referred_table=parent_key[0],
+                referred_column=parent_key[1],
+                confidence=_confidence(containment, distinct_count, named),
+                containment=containment,
+            ))
+        # Among equally likely targets, the smallest unique column fits tightest
+        candidates.sort(key=lambda fk: (
+            -fk.confidence,
+            parents[(fk.referred_table, fk.referred_column)][1].profile.distinct_count,
+            fk.referred_table,
+            fk.referred_column,
+        ))
+
+        if connection is None:
+            inferred.extend(candidates[:1])
+            continue
+        non_null_count = column_info.profile.non_null_count
+        for candidate in candidates:
+            orphan_count = count_orphans(connection, key, (candidate.referred_table, candidate.referred_column))
+            if orphan_count is None:
+                inferred.append(candidate)
+                break
+            containment = 1.0 - orphan_count / non_null_count if non_null_count else 0.0
+            if containment >= threshold:
+                candidate.orphan_count = orphan_count
+                candidate.containment = containment
+                candidate.confidence = _confidence(
+                    containment, distinct_count,
+                    names_match(candidate.column, candidate.referred_table, candidate.referred_column),
+                )
+                inferred.append(candidate)
+                break
+
+    inferred.sort(key=lambda fk: (-fk.confidence, fk.table, fk.column))
+    return inferred
+
+
+def apply_foreign_keys(
+    schema: DatabaseSchema,
+    inferred: List[InferredForeignKey],
+    min_confidence: float = DEFAULT_MIN_CONFIDENCE,
+) -> int:
+    """
+    Sets the inferred foreign keys of at least `min_confidence` on the
+    columns of a schema, with their confidence in
+    `ColumnInfo.foreign_key_confidence` so generators can mark them.
+    Foreign keys inferred earlier are replaced; declared ones are kept.
+
+    Returns:
+        The number of foreign keys applied.
+    """
+    # Indexed access, so lazily loaded tables keep the changes
+    tables = {table_info.name: table_info for table_info in schema.tables[:]}
+    for table_info in tables.values():
+        for column_info in table_info.columns:
+            if column_info.foreign_key_confidence is not None:
+                column_info.foreign_key = None
+                column_info.foreign_key_confidence = None
+
+    applied = 0
+    for foreign_key in inferred:
+        if foreign_key.confidence < min_confidence or foreign_key.table not in tables:
+            continue
+        for column_info in tables[foreign_key.table].columns:
+            if column_info.name == foreign_key.column and not column_info.foreign_key:
+                column_info.foreign_key = sys.intern(foreign_key.reference)
+                column_info.foreign_key_confidence = round(foreign_key.confidence, 2)
+                applied += 1
+                break
+    return applied
@@ -0,0 +1,181 @@
+# d_schema/similarity/lsh_index.py
+
+import os
+import pickle
+import tempfile
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from datasketch import LeanMinHash, MinHashLSH
+
+from ..profiling.sketches import NUM_PERM, deserialize_minhash, hash_values, new_minhash, update_minhash
+from ..structures import DatabaseSchema
+from .sketch_matrix import EMPTY_HASH, ColumnKey
+
+DEFAULT_LSH_THRESHOLD = 0.5
+
+# Version of the file written by `ColumnIndex.save`
+INDEX_FORMAT_VERSION = 1
+
+
+def sketch_from_values(values: Iterable, num_perm: int = NUM_PERM) -> LeanMinHash:
+    """Builds the sketch of a list of values, the same way the profiler sketches a column."""
+    minhash = new_minhash(num_perm)
+    update_minhash(minhash, hash_values(str(value) for value in values if value is not None))
+    return LeanMinHash(minhash)
+
+
+def _is_column_key(query) -> bool:
+    return isinstance(query, tuple) and len(query) == 3 and all(isinstance(part, str) for part in query)
+
+
+class ColumnIndex:
+    """
+    A MinHash-LSH index of the value sets of profiled columns across any
+    number of databases.
+
+    Finds the columns whose estimated Jaccard similarity to a query column
+    (or list of values) is likely above the index threshold without
+    comparing against every column; the candidates are then ranked by their
+    Jaccard estimate. Columns can be added and removed at any time, and the
+    index is saved to and loaded from a single file.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_LSH_THRESHOLD, num_perm: int = NUM_PERM):
+        """
+        Args:
+            threshold: The Jaccard similarity the LSH bands are tuned for.
+            num_perm: Number of hash values of the indexed sketches.
+        """
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.lsh = MinHashLSH(threshold=threshold, num_perm=num_perm)
+        self.sketches: Dict[ColumnKey, bytes] = {}
+
+    def __len__(self) -> int:
+        return len(self.sketches)
+
+    def __contains__(self, key) -> bool:
+        return tuple(key) in self.sketches
+
+    def add_schema(self, schema: DatabaseSchema) -> int:
+        """
+        Indexes all profiled columns of a schema, replacing columns that are
+        already indexed. Columns without values are skipped.
+
+        Returns:
+            The number of columns indexed.
+        """
+        added = 0
+        for table_info in schema.tables:
+            for column_info in table_info.columns:
+                sketch = column_info.profile.minhash_sketch if column_info.profile else None
+                if sketch is not None and self.add((schema.db_name, table_info.name, column_info.name), sketch):
+                    added += 1
+        return added
+
+    def add(self, key: ColumnKey, sketch: bytes) -> bool:
+        """
+        Indexes one serialized sketch (as in `ColumnProfile.minhash_sketch`).
+
+        Returns:
+            False if the sketch is empty and was not indexed.
+        """
+        key = tuple(key)
+        minhash = deserialize_minhash(sketch)
+        if len(minhash) != self.num_perm:
+            raise ValueError(f"Sketch of {'.'.join(key)} has {len(minhash)} hash values, expected {self.num_perm}.")
+        if key in self.sketches:
+            self.remove(key)
+        if (minhash.hashvalues == EMPTY_HASH).all():
+            return False
+        self.lsh.insert(key, minhash)
+        self.sketches[key] = bytes(sketch)
+        return True
+
+    def remove(self, key: ColumnKey):
+        """Removes a column from the index, if present."""
+        key = tuple(key)
+        if self.sketches.pop(key, None) is not None:
+            self.lsh.remove(key)
+
+    def remove_database(self, db_name: str) -> int:
+        """Removes all columns of a database, e.g. before indexing a new snapshot of it."""
+        keys = [key for key in self.sketches if key[0] == db_name]
+        for key in keys:
+            self.remove(key)
+        return len(keys)
+
+    def query(
+        self,
+        query: Union[ColumnKey, bytes, Sequence],
+        k: Optional[int] = None,
+        min_similarity: float = 0.0,
+    ) -> List[Tuple[ColumnKey, float]]:
+        """
+        Finds indexed columns with similar value sets.
+
+        Args:
+            query: An indexed column key, a serialized sketch, or a list of
+                values (sketched like the profiler sketches a column). A
+                tuple of three strings is always taken as a column key.
+            k: Maximum number of results (default: all candidates).
+            min_similarity: Drop candidates whose Jaccard estimate is lower.
+
+        Returns:
+            (column key, estimated Jaccard similarity) pairs, most similar
+            first. The query column itself is not included.
+
+        Raises:
+            KeyError: If the query is a column key that is not indexed.
+        """
+        own_key = None
+        if _is_column_key(query):
+            if query not in self.sketches:
+                raise KeyError(f"No sketch for column {'.'.join(query)}.")
+            own_key = query
+            minhash = deserialize_minhash(self.sketches[query])
+        elif isinstance(query, (bytes, bytearray)):
+            minhash = deserialize_minhash(query)
+        else:
+            minhash = sketch_from_values(query, self.num_perm)
+        if (minhash.hashvalues == EMPTY_HASH).all():
+            return []
+
+        results = []
+        for key in self.lsh.query(minhash):
+            key = tuple(key)
+            if key == own_key:
+                continue
+            similarity = minhash.jaccard(deserialize_minhash(self.sketches[key]))
+            if similarity >= min_similarity:
+                results.append((key, similarity))
+        results.sort(key=lambda item: (-item[1], item[0]))
+        return results if k is None else results[:k]
+
+    def save(self, path: str):
+        """Writes the index to a file, replacing it atomically."""
+        state = {
+            "version": INDEX_FORMAT_VERSION,
+            "threshold": self.threshold,
+            "num_perm": self.num_perm,
+            "lsh": self.lsh,
+            "sketches": self.sketches,
+        }
+        directory = os.path.dirname(os.path.abspath(path))
+        with tempfile.NamedTemporaryFile("wb", dir=directory, delete=False) as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(f.name, path)
+
+    @classmethod
+    def load(cls, path: str) -> "ColumnIndex":
+        """Loads an index written by `save`. Only load files you created yourself."""
+        with open(path, "rb") as f:
+            state = pickle.load(f)
+        if state.get("version", 0) > INDEX_FORMAT_VERSION:
+            raise ValueError(f"{path} was written by a newer version of D-Schema.")
+        index = cls.__new__(cls)
+        index.threshold = state["threshold"]
+        index.num_perm = state["num_perm"]
+        index.lsh = state["lsh"]
+        index.sketches = state["sketches"]
+        return index
@@ -0,0 +1,253 @@
+# d_schema/similarity/sketch_matrix.py
+
+import json
+import os
+import tempfile
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..profiling.sketches import NUM_PERM, deserialize_minhash
+from ..structures import DatabaseSchema
+
+# (database name, table name, column name)
+ColumnKey = Tuple[str, str, str]
+
+# Hash value of a MinHash that has seen no values
+EMPTY_HASH = np.uint32(0xFFFFFFFF)
+
+# Rows compared per step by the one-vs-all scan, bounding its temporary memory
+SCAN_CHUNK_ROWS = 65536
+
+
+class SketchMatrix:
+    """
+    The MinHash sketches of many columns as one matrix (columns x num_perm)
+    in a memory-mapped .npy file, with an index from (database, table,
+    column) to row in a JSON-lines file next to it.
+
+    Jaccard similarity estimates are the fraction of equal hash values of
+    two rows, so comparing one column against all others, or a block of
+    columns against another, is a vectorized NumPy operation instead of a
+    loop over deserialized sketches. The matrix holds the 32-bit hash values
+    the profiler produces.
+    """
+
+    def __init__(self, path: str, num_perm: int = NUM_PERM):
+        """
+        Opens the matrix stored at `path` (a .npy file), or creates an empty one.
+
+        Args:
+            path: The path of the matrix file. The index is kept in the same
+                path with a ".jsonl" suffix: a header line, then one column
+                key per row, appended as rows are added.
+            num_perm: Number of hash values per sketch, for a new matrix.
+        """
+        self.path = path
+        self.index_path = os.path.splitext(path)[0] + ".jsonl"
+        self.keys: List[ColumnKey] = []
+        self.rows: Dict[ColumnKey, int] = {}
+        if os.path.exists(path) and os.path.exists(self.index_path):
+            self.keys = self._read_index()
+            self.rows = {key: row for row, key in enumerate(self.keys)}
+            self._data = np.load(path, mmap_mode="r+")
+            self.num_perm = self._data.shape[1]
+        else:
+            self.num_perm = num_perm
+            self._data = np.lib.format.open_memmap(path, mode="w+", dtype=np.uint32, shape=(0, num_perm))
+            with open(self.index_path, "w", encoding="utf-8") as f:
+                f.write(json.dumps({"num_perm": num_perm}) + "\n")
+        # Number of keys already in the index file
+        self._indexed = len(self.keys)
+
+    @classmethod
+    def build(cls, path: str, schemas: Iterable[DatabaseSchema], num_perm: int = NUM_PERM) -> "SketchMatrix":
+        """Creates a matrix at `path` holding the sketches of all given schemas."""
+        for file_path in (path, os.path.splitext(path)[0] + ".jsonl"):
+            if os.path.exists(file_path):
+                os.remove(file_path)
+        matrix = cls(path, num_perm)
+        for schema in schemas:
+            matrix.add_schema(schema)
+        return matrix
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """The (memory-mapped) hash values of all columns, one row per column."""
+        return self._data[:len(self.keys)]
+
+    def add_schema(self, schema: DatabaseSchema) -> int:
+        """
+        Adds the sketches of all profiled columns of a schema. Columns that
+        are already in the matrix get their row overwritten.
+
+        Returns:
+            The number of sketches added or replaced.
+        """
+        entries = []
+        for table_info in schema.tables:
+            for column_info in table_info.columns:
+                sketch = column_info.profile.minhash_sketch if column_info.profile else None
+                if sketch is not None:
+                    entries.append(((schema.db_name, table_info.name, column_info.name), sketch))
+        return self.add(entries)
+
+    def add(self, entries: Sequence[Tuple[ColumnKey, bytes]]) -> int:
+        """
+        Adds serialized sketches (as in `ColumnProfile.minhash_sketch`) under
+        their column keys. The batch is written to disk once, at the end.
+
+        Returns:
+            The number of sketches added or replaced.
+        """
+        new_keys = [key for key, _ in entries if key not in self.rows]
+        self._reserve(len(self.keys) + len(set(new_keys)))
+        for key, sketch in entries:
+            hashvalues = deserialize_minhash(sketch).hashvalues
+            if len(hashvalues) != self.num_perm:
+                raise ValueError(
+                    f"Sketch of {'.'.join(key)} has {len(hashvalues)} hash values, expected {self.num_perm}."
+                )
+            row = self.rows.get(key)
+            if row is None:
+                row = self.rows[key] = len(self.keys)
+                self.keys.append(key)
+            self._data[row] = hashvalues
+        self.flush()
+        return len(entries)
+
+    def _reserve(self, rows: int):
+        """
+        Grows the file to hold at least `rows` rows, doubling its capacity.
+        The rows are copied chunk by chunk into a new file that then replaces
+        the old one, so the matrix is never held in memory and the old file
+        survives an interrupted copy.
+        """
+        capacity = self._data.shape[0]
+        if rows <= capacity:
+            return
+        capacity = max(rows, 2 * capacity, 1024)
+        used = len(self.keys)
+        directory = os.path.dirname(os.path.abspath(self.path))
+        with tempfile.NamedTemporaryFile(dir=directory, suffix=".npy", delete=False) as f:
+            temp_path = f.name
+        try:
+            grown = np.lib.format.open_memmap(
+                temp_path, mode="w+", dtype=np.uint32, shape=(capacity, self.num_perm)
+            )
+            for start in range(0, used, SCAN_CHUNK_ROWS):
+                stop = min(start + SCAN_CHUNK_ROWS, used)
+                grown[start:stop] = self._data[start:stop]
+            grown.flush()
+            del grown
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        del self._data
+        os.replace(temp_path, self.path)
+        self._data = np.load(self.path, mmap_mode="r+")
+
+    def flush(self):
+        """
+        Writes pending changes of the matrix to disk, then appends the keys
+        of new rows to the index, so the index never names unwritten rows.
+        """
+        self._data.flush()
+        if self._indexed < len(self.keys):
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                f.writelines(json.dumps(key) + "\n" for key in self.keys[self._indexed:])
+            self._indexed = len(self.keys)
+
+    def _read_index(self) -> List[ColumnKey]:
+        """Reads the keys of the index file, dropping a line cut short by an interrupted write."""
+        with open(self.index_path, "rb+") as f:
+            lines = f.readlines()
+            if lines and not lines[-1].endswith(b"\n"):
+                f.truncate(f.tell() - len(lines.pop()))
+        return [tuple(json.loads(line)) for line in lines[1:]]
+
+    def row(self, key: ColumnKey) -> Optional[int]:
+        """Returns the row of a column, or None if it has no sketch in the matrix."""
+        return self.rows.get(tuple(key))
+
+    def similarities(self, query: Union[ColumnKey, np.ndarray, bytes]) -> np.ndarray:
+        """
+        Estimates the Jaccard similarity of one column to every column of the matrix.
+
+        Args:
+            query: A column key of the matrix, a serialized sketch, or an
+                array of `num_perm` hash values.
+
+        Returns:
+            A float32 array with one similarity per row. Columns without any
+            values are 0 (and so is everything if the query has none).
+        """
+        hashvalues = self._query_hashvalues(query)
+        matrix = self.matrix
+        result = np.zeros(len(matrix), dtype=np.float32)
+        if (hashvalues == EMPTY_HASH).all():
+            return result
+        for start in range(0, len(matrix), SCAN_CHUNK_ROWS):
+            chunk = np.asarray(matrix[start:start + SCAN_CHUNK_ROWS])
+            similar = np.count_nonzero(chunk == hashvalues, axis=1) / self.num_perm
+            similar[(chunk == EMPTY_HASH).all(axis=1)] = 0.0
+            result[start:start + len(chunk)] = similar
+        return result
+
+    def pairwise_similarities(
+        self, rows: Optional[Sequence[int]] = None, other_rows: Optional[Sequence[int]] = None
+    ) -> np.ndarray:
+        """
+        Estimates the Jaccard similarities between two blocks of rows.
+        `rows` defaults to all rows and `other_rows` to `rows`.
+
+        The result has len(rows) x len(other_rows) entries, so for large
+        matrices call this on blocks of rows.
+        """
+        left = self.matrix if rows is None else self.matrix[np.asarray(rows)]
+        right = left if other_rows is None else self.matrix[np.asarray(other_rows)]
+        left, right = np.asarray(left), np.asarray(right)
+        # One hash position at a time over contiguous columns, counting matches
+        # in place (uint8 is enough for up to 255 permutations)
+        left_t, right_t = np.ascontiguousarray(left.T), np.ascontiguousarray(right.T)
+        count_dtype = np.uint8 if self.num_perm < 256 else np.uint16
+        equal = np.zeros((len(left), len(right)), dtype=count_dtype)
+        matches = np.empty((len(left), len(right)), dtype=bool)
+        for perm in range(self.num_perm):
+            np.equal(left_t[perm][:, None], right_t[perm][None, :], out=matches)
+            equal += matches
+        result = equal.astype(np.float32) / self.num_perm
+        result[(left == EMPTY_HASH).all(axis=1), :] = 0.0
+        result[:, (right == EMPTY_HASH).all(axis=1)] = 0.0
+        return result
+
+    def most_similar(
+        self, query: Union[ColumnKey, np.ndarray, bytes], k: int = 10, threshold: float = 0.0
+    ) -> List[Tuple[ColumnKey, float]]:
+        """
+        Returns up to `k` columns whose estimated Jaccard similarity to the
+        query is above `threshold` (excluding the query column itself), most
+        similar first.
+        """
+        similar = self.similarities(query)
+        if isinstance(query, tuple) and query in self.rows:
+            similar[self.rows[query]] = -1.0
+        k = min(k, len(similar))
+        if k <= 0:
+            return []
+        candidates = np.argpartition(-similar, k - 1)[:k]
+        candidates = candidates[np.argsort(-similar[candidates], kind="stable")]
+        return [(self.keys[row], float(similar[row])) for row in candidates if similar[row] > threshold]
+
+    def _query_hashvalues(self, query) -> np.ndarray:
+        if isinstance(query, tuple):
+            row = self.rows.get(query)
+            if row is None:
+                raise KeyError(f"No sketch for column {'.'.join(query)}.")
+            return np.asarray(self._data[row])
+        if isinstance(query, (bytes, bytearray, memoryview)):
+            return deserialize_minhash(query).hashvalues.astype(np.uint32)
+        return np.asarray(query, dtype=np.uint32)
@@ -0,0 +1,188 @@
+# d_schema/store.py
+
+import hashlib
+import json
+import sqlite3
+import time
+import zlib
+from typing import Any, List, Optional, Sequence
+
+from sqlalchemy.engine import make_url
+
+from .serialization import table_from_dict, table_to_dict
+from .structures import DatabaseSchema, LazyTableList, TableInfo
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    db_url TEXT NOT NULL,
+    db_name TEXT,
+    fingerprint TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    UNIQUE (db_url, fingerprint)
+);
+CREATE TABLE IF NOT EXISTS snapshot_tables (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (snapshot_id, position)
+);
+CREATE INDEX IF NOT EXISTS snapshot_tables_name ON snapshot_tables (snapshot_id, name);
+"""
+
+
+def store_key(db_url: str) -> str:
+    """Returns the URL under which snapshots of a database are stored, without its password."""
+    return make_url(db_url).render_as_string(hide_password=True)
+
+
+def table_fingerprint(table_info: TableInfo) -> str:
+    """
+    Returns a hash of the structure of a table: its name, comment and the
+    name, type, nullability, keys and comment of every column. Samples,
+    profiles and inferred foreign keys do not contribute.
+    """
+    structure = [
+        table_info.name,
+        table_info.comment,
+        [
+            [
+                col.name, col.type, col.nullable, col.primary_key,
+                col.foreign_key if col.foreign_key_confidence is None else None, col.comment,
+            ]
+            for col in table_info.columns
+        ],
+    ]
+    return hashlib.sha256(json.dumps(structure).encode("utf-8")).hexdigest()
+
+
+def schema_fingerprint(tables: Sequence[TableInfo]) -> str:
+    """Returns a hash of the structure of all given tables (see `table_fingerprint`)."""
+    digest = hashlib.sha256()
+    for fingerprint in sorted(table_fingerprint(table_info) for table_info in tables):
+        digest.update(fingerprint.encode("ascii"))
+    return digest.hexdigest()
+
+
+def _encode_table(table_info: TableInfo) -> bytes:
+    """Serializes a table to compressed JSON."""
+    return zlib.compress(json.dumps(table_to_dict(table_info), separators=(",", ":")).encode("utf-8"))
+
+
+def _decode_table(blob: bytes) -> TableInfo:
+    """Inverse of `_encode_table`."""
+    return table_from_dict(json.loads(zlib.decompress(blob)))
+
+
+class SchemaStore:
+    """
+    A local SQLite file of parsed DatabaseSchema snapshots.
+
+    Snapshots are keyed by database URL (without password) and schema
+    fingerprint. Every table is stored on its own as compressed JSON, so a
+    loaded snapshot only deserializes the tables that are accessed.
+    """
+
+    def __init__(self, path: str):
+        """
+        Opens (or creates) a store.
+
+        Args:
+            path: Path of the SQLite file.
+        """
+        self.path = path
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(_SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def save(self, schema: DatabaseSchema, db_url: str) -> str:
+        """
+        Stores a snapshot of a parsed schema, replacing an earlier snapshot of
+        the same database with the same fingerprint.
+
+        Args:
+            schema: The parsed schema.
+            db_url: The URL the schema was parsed from.
+
+        Returns:
+            The schema fingerprint of the snapshot.
+        """
+        fingerprint = schema_fingerprint(schema.tables)
+        key = store_key(db_url)
+        with self.connection:
+            self.connection.execute(
+                "DELETE FROM snapshots WHERE db_url = ? AND fingerprint = ?", (key, fingerprint)
+            )
+            snapshot_id = self.connection.execute(
+                "INSERT INTO snapshots (db_url, db_name, fingerprint, created_at) VALUES (?, ?, ?, ?)",
+                (key, schema.db_name, fingerprint, time.time()),
+            ).lastrowid
+            self.connection.executemany(
+                "INSERT INTO snapshot_tables (snapshot_id, position, name, fingerprint, data) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    (snapshot_id, position, table_info.name, table_fingerprint(table_info), _encode_table(table_info))
+                    for position, table_info in enumerate(schema.tables)
+                ),
+            )
+        return fingerprint
+
+    def load(
+        self,
+        db_url: str,
+        fingerprint: Optional[str] = None,
+        tables: Optional[Sequence[str]] = None,
+    ) -> Optional[DatabaseSchema]:
+        """
+        Loads a snapshot. Its `tables` is a LazyTableList.
+
+        Args:
+            db_url: The URL the schema was parsed from.
+            fingerprint: The schema fingerprint of the snapshot. Defaults to
+                the most recent snapshot of the database.
+            tables: Names of the tables to include. Defaults to all tables.
+
+        Returns:
+            The stored DatabaseSchema, or None if there is no such snapshot.
+        """
+        query = "SELECT id, db_name FROM snapshots WHERE db_url = ?"
+        params: List[Any] = [store_key(db_url)]
+        if fingerprint is not None:
+            query += " AND fingerprint = ?"
+            params.append(fingerprint)
+        row = self.connection.execute(query + " ORDER BY created_at DESC, id DESC LIMIT 1", params).fetchone()
+        if row is None:
+            return None
+        snapshot_id, db_name = row
+
+        entries = self.connection.execute(
+            "SELECT position, name FROM snapshot_tables WHERE snapshot_id = ? ORDER BY position",
+            (snapshot_id,),
+        ).fetchall()
+        if tables is not None:
+            wanted = set(tables)
+            entries = [(position, name) for position, name in entries if name in wanted]
+        positions = [position for position, _ in entries]
+        lazy_tables = LazyTableList(
+            [name for _, name in entries],
+            lambda index: self._load_table(snapshot_id, positions[index]),
+        )
+        return DatabaseSchema(db_name=db_name, tables=lazy_tables)
+
+    def _load_table(self, snapshot_id: int, position: int) -> TableInfo:
+        (blob,) = self.connection.execute(
+            "SELECT data FROM snapshot_tables WHERE snapshot_id = ? AND position = ?",
+            (snapshot_id, position),
+        ).fetchone()
+        return _decode_table(blob)
@@ -1,9 +1,16 @@
 # d_schema/structures.py
+import sys
+from collections.abc import Sequence as SequenceABC
 from dataclasses import dataclass, field
-from typing import List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 
 
-@dataclass
+def _intern(value: Optional[str]) -> Optional[str]:
+    """Interns a string so that equal strings of many columns share one object."""
+    return sys.intern(value) if type(value) is str else value
+
+
+@dataclass(slots=True)
 class ColumnProfile:
     """
     Contains statistical and analytical data about a column.
@@ -14,19 +21,45 @@ class ColumnProfile:
     min_value: Optional[str] = None
     max_value: Optional[str] = None
     avg_char_length: Optional[float] = None
+    mean_value: Optional[float] = None
+    std_dev: Optional[float] = None
+    # Value distribution of numeric and date columns: the 25/50/75% and
+    # 10..90% quantiles, and the bounds of an equi-depth histogram (each
+    # bucket holds about the same number of values)
+    quartiles: List[str] = field(default_factory=list)
+    deciles: List[str] = field(default_factory=list)
+    histogram_bounds: List[str] = field(default_factory=list)
     top_k_values: List[Tuple[str, int]] = field(default_factory=list)
+    # Largest possible undercount of the top-k counts, if they come from a
+    # heavy-hitters summary (0 if they are exact)
+    top_k_error: Optional[int] = None
     minhash_sketch: Optional[bytes] = None
+    # Names of the fields above that are estimates rather than exact values
+    estimated_fields: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class TableProfile:
     """
     Contains statistical data about a table.
     """
     record_count: Optional[int] = None
+    # Names of the fields above that are estimates rather than exact values
+    estimated_fields: List[str] = field(default_factory=list)
+    # Set when the column profiles were computed from a sample of the table
+    sample_size: Optional[int] = None
+    sample_method: Optional[str] = None
+    # Half-width of the 95% confidence interval of ratios estimated from the sample
+    margin_of_error: Optional[float] = None
+    # How the table was profiled ("full", "sample", "catalog" or "skip"), and
+    # the fields that strategy could not compute within its time limit
+    strategy: Optional[str] = None
+    degraded_fields: List[str] = field(default_factory=list)
+    # Number of key ranges scanned in parallel, if the table was partitioned
+    partitions: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ColumnInfo:
     """
     Holds all relevant information about a database column.
@@ -39,9 +72,18 @@ class ColumnInfo:
     comment: Optional[str] = None
     samples: List[str] = field(default_factory=list)
     profile: Optional[ColumnProfile] = None
+    # Set if foreign_key was inferred from the data rather than declared
+    # (see d_schema.similarity.foreign_keys): its confidence from 0 to 1
+    foreign_key_confidence: Optional[float] = None
+
+    def __post_init__(self):
+        # Names, types and foreign key targets repeat across columns and tables
+        self.name = _intern(self.name)
+        self.type = _intern(self.type)
+        self.foreign_key = _intern(self.foreign_key)
 
 
-@dataclass
+@dataclass(slots=True)
 class TableInfo:
     """
     Holds all relevant information about a database table.
@@ -49,12 +91,99 @@ class TableInfo:
     name: str
     columns: List[ColumnInfo]
     profile: Optional[TableProfile] = None
+    comment: Optional[str] = None
+    # Signature of the table's data when it was parsed, compared by
+    # incremental parses to find changed tables (see d_schema.changes)
+    change_signal: Optional[str] = None
+
+
+class LazyTableList(SequenceABC):
+    """
+    A read-only list of tables that are decoded on first access, e.g. from a
+    SchemaStore or a binary schema file.
+
+    Behaves like the `List[TableInfo]` of a parsed DatabaseSchema, so
+    generators can use it unchanged. Tables accessed by index are kept;
+    tables that are only iterated over (e.g. by a streaming generator) are
+    not, so memory stays bounded by the largest table.
+    """
+
+    def __init__(self, names: Sequence[str], load: Callable[[int], TableInfo]):
+        """
+        Args:
+            names: The table names, in order.
+            load: Decodes the table at the given position.
+        """
+        self._names = list(names)
+        self._load = load
+        self._loaded: Dict[int, TableInfo] = {}
 
+    def __len__(self) -> int:
+        return len(self._names)
 
-@dataclass
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("table index out of range")
+        if index not in self._loaded:
+            self._loaded[index] = self._load(index)
+        return self._loaded[index]
+
+    def __iter__(self):
+        for index in range(len(self)):
+            table_info = self._loaded.get(index)
+            yield table_info if table_info is not None else self._load(index)
+
+    @property
+    def names(self) -> List[str]:
+        """The table names, available without decoding any table."""
+        return list(self._names)
+
+    def get(self, name: str) -> Optional[TableInfo]:
+        """Returns the table with the given name, or None."""
+        try:
+            return self[self._names.index(name)]
+        except ValueError:
+            return None
+
+
+@dataclass(slots=True)
 class DatabaseSchema:
     """
     Represents the entire database schema, independent of SQLAlchemy.
     """
     db_name: str
     tables: List[TableInfo]
+
+    def dump(self, path: str, format: str = "binary"):
+        """
+        Saves the schema to a file.
+
+        Args:
+            path: The file to write.
+            format: "binary" for the compact D-Schema format, which loads
+                lazily, or "json" for interoperability.
+        """
+        from .serialization import dump_binary, dump_json
+
+        if format == "binary":
+            dump_binary(self, path)
+        elif format == "json":
+            dump_json(self, path)
+        else:
+            raise ValueError(f"Unknown format '{format}'. Expected 'binary' or 'json'.")
+
+    @classmethod
+    def load(cls, path: str) -> "DatabaseSchema":
+        """
+        Loads a schema saved by `dump`, detecting its format. Binary files
+        are memory-mapped and their tables decoded on first access.
+        """
+        from .serialization import MAGIC, load_binary, load_json
+
+        with open(path, "rb") as f:
+            is_binary = f.read(len(MAGIC)) == MAGIC
+        return load_binary(path) if is_binary else load_json(path)
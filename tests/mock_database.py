@@ -0,0 +1,36 @@
+import os
+import sqlite3
+
+
+def create_mock_database(directory: str) -> str:
+    """
+    Creates a small SQLite database file mirroring the mock schema and returns
+    its SQLAlchemy URL.
+    """
+    path = os.path.join(directory, "mock.db")
+    connection = sqlite3.connect(path)
+    connection.executescript(
+        """
+        CREATE TABLE hero (
+            id INTEGER PRIMARY KEY,
+            name VARCHAR(100) NOT NULL
+        );
+        CREATE TABLE superpower (
+            id INTEGER PRIMARY KEY,
+            power_name TEXT
+        );
+        CREATE TABLE hero_power (
+            hero_id INTEGER REFERENCES hero(id),
+            power_id INTEGER REFERENCES superpower(id)
+        );
+        CREATE TABLE empty_table (
+            id INTEGER PRIMARY KEY
+        );
+        INSERT INTO hero (id, name) VALUES (1, 'Superman'), (2, 'Batman'), (3, 'Wonder Woman');
+        INSERT INTO superpower (id, power_name) VALUES (1, 'Agility'), (2, 'Accelerated Healing'), (3, NULL);
+        INSERT INTO hero_power (hero_id, power_id) VALUES (1, 1), (1, 2), (2, 1), (3, 1), (3, NULL);
+        """
+    )
+    connection.commit()
+    connection.close()
+    return f"sqlite:///{path}"
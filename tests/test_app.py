@@ -0,0 +1,87 @@
+import gzip
+import importlib.util
+import os
+import tempfile
+import unittest
+
+import importlib.resources as importlib_resources
+from hydra import compose, initialize_config_dir
+from omegaconf import OmegaConf
+
+from d_schema.app import needs_profile, open_output, run_generator, select_generators
+from d_schema.generators.m_schema.generator import MSchemaGenerator
+from tests.mock_schema import create_mock_schema
+
+CONFIG_PATH = str(importlib_resources.files("d_schema") / "config")
+
+
+def compose_config(*overrides):
+    with initialize_config_dir(config_dir=CONFIG_PATH, job_name="test_app", version_base=None):
+        return compose(config_name="config", overrides=list(overrides))
+
+
+class TestGeneratorSelection(unittest.TestCase):
+    def test_single_generator_by_default(self):
+        """Test that an empty generator list runs just the selected generator."""
+        cfg = compose_config("generator=m_schema")
+        generator_cfgs = select_generators(cfg, CONFIG_PATH)
+        self.assertEqual([generator_cfg.name for generator_cfg in generator_cfgs], ["m_schema"])
+
+    def test_list_keeps_overrides_of_selected_generator(self):
+        """Test that the CLI-selected generator in the list keeps its command-line overrides."""
+        cfg = compose_config("generators=[ddl,m_schema]", "generator=ddl", "generator.allow_comments=false")
+        ddl_cfg, m_schema_cfg = select_generators(cfg, CONFIG_PATH)
+        self.assertEqual(ddl_cfg.name, "ddl")
+        self.assertFalse(ddl_cfg.allow_comments)
+        self.assertEqual(m_schema_cfg.name, "m_schema")
+
+    def test_list_loads_generators_from_their_files(self):
+        """Test that the other listed generators are loaded from config/generator/."""
+        cfg = compose_config("generators=[m_schema,ddl,unknown]", "generator=m_schema")
+        m_schema_cfg, ddl_cfg, unknown_cfg = select_generators(cfg, CONFIG_PATH)
+        self.assertEqual(m_schema_cfg.name, "m_schema")
+        self.assertEqual(ddl_cfg.name, "ddl")
+        self.assertTrue(ddl_cfg.allow_comments)
+        self.assertTrue(ddl_cfg.include_profiling)
+        # Unknown generators get a bare configuration and are skipped when run
+        self.assertEqual(dict(unknown_cfg), {"name": "unknown"})
+
+    def test_profiling_enabled_only_when_needed(self):
+        """Test that profiling is enabled if any generator (here only profile_report) renders profiles."""
+        cfg = compose_config("generators=[ddl,m_schema,profile_report]")
+        self.assertTrue(needs_profile(select_generators(cfg, CONFIG_PATH)))
+        cfg = compose_config("generators=[ddl,m_schema,mac_sql]")
+        self.assertFalse(needs_profile(select_generators(cfg, CONFIG_PATH)))
+        cfg = compose_config("generator=profile_report")
+        self.assertTrue(needs_profile(select_generators(cfg, CONFIG_PATH)))
+
+
+class TestOutput(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_gzip_output_round_trip(self):
+        """Test that a generator's output streamed to gzip reads back unchanged."""
+        schema = create_mock_schema()
+        run_generator(schema, self.tmp_dir.name, OmegaConf.create({"name": "m_schema"}), compression="gzip")
+        path = os.path.join(self.tmp_dir.name, "schema.mschema.gz")
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            self.assertEqual(f.read(), MSchemaGenerator(schema).generate_schema())
+
+    def test_unknown_compression(self):
+        """Test that an unknown compression is rejected with the supported ones."""
+        with self.assertRaisesRegex(ValueError, "Unknown compression 'lz4'.*gzip, zstd"):
+            open_output(os.path.join(self.tmp_dir.name, "schema.ddl"), "lz4")
+
+    @unittest.skipIf(importlib.util.find_spec("zstandard") is not None, "zstandard is installed")
+    def test_zstd_requires_zstandard(self):
+        """Test that zstd output without the zstandard package points at the extra."""
+        with self.assertRaisesRegex(ImportError, "d-schema\\[zstd\\]"):
+            open_output(os.path.join(self.tmp_dir.name, "schema.ddl.zst"), "zstd")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import asyncio
+import importlib.util
+import tempfile
+import unittest
+
+from d_schema import AsyncDatabaseParser, DatabaseParser
+from tests.mock_database import create_mock_database
+
+
+@unittest.skipIf(importlib.util.find_spec("aiosqlite") is None, "aiosqlite is not installed")
+class TestAsyncDatabaseParser(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_url = create_mock_database(self.tmp_dir.name)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_async_parse_matches_sync_parse(self):
+        """Test that the async parser returns the same schema as the sync parser."""
+        expected = DatabaseParser(db_url=self.db_url).parse(profile=True, num_samples=2)
+
+        async def parse():
+            parser = AsyncDatabaseParser(
+                db_url=self.db_url.replace("sqlite://", "sqlite+aiosqlite://"), max_concurrency=3
+            )
+            try:
+                return await parser.parse(profile=True, num_samples=2)
+            finally:
+                await parser.dispose()
+
+        self.assertEqual(asyncio.run(parse()), expected)
+
+    def test_async_parser_has_every_parser_setting(self):
+        """Test that the async parser is initialized like the sync parser, apart from its engine."""
+        sync_parser = DatabaseParser(db_url=self.db_url)
+        async_parser = AsyncDatabaseParser(db_url=self.db_url.replace("sqlite://", "sqlite+aiosqlite://"))
+        for name, value in vars(sync_parser).items():
+            if name not in ("db_url", "engine"):
+                self.assertEqual(getattr(async_parser, name), value, name)
+        self.assertEqual(type(async_parser.engine).__name__, "AsyncEngine")
+        asyncio.run(async_parser.dispose())
+        sync_parser.engine.dispose()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,26 @@
+import os
+import sqlite3
+import tempfile
 import unittest
+
+from datasketch import LeanMinHash, MinHash
+from sqlalchemy import Boolean, Column, Integer, MetaData, Table, column, event, table
+from sqlalchemy.dialects import postgresql
+
 from d_schema.db_parser import DatabaseParser
+from d_schema.profiling.aggregate import build_aggregate_statement
+from d_schema.structures import ColumnInfo
+from tests.mock_database import create_mock_database
+
 
 class TestDatabaseParser(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_url = create_mock_database(self.tmp_dir.name)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
     def test_parse_sqlite_in_memory(self):
         """Test parsing an in-memory SQLite database."""
         try:
@@ -10,5 +29,245 @@ class TestDatabaseParser(unittest.TestCase):
         except Exception as e:
             self.fail(f"DatabaseParser failed to parse in-memory SQLite DB: {e}")
 
+    def test_profile_aggregates(self):
+        """Test that the fused aggregate statement fills the column profiles."""
+        parser = DatabaseParser(db_url=self.db_url)
+        schema = parser.parse(profile=True, num_samples=1)
+        tables = {table.name: table for table in schema.tables}
+
+        superpower = tables["superpower"]
+        self.assertEqual(superpower.profile.record_count, 3)
+        power_name = superpower.columns[1].profile
+        self.assertEqual(power_name.null_count, 1)
+        self.assertEqual(power_name.non_null_count, 2)
+        self.assertEqual(power_name.distinct_count, 2)
+        self.assertEqual(power_name.min_value, "Accelerated Healing")
+        self.assertEqual(power_name.max_value, "Agility")
+        self.assertAlmostEqual(power_name.avg_char_length, 13.0)
+
+        self.assertEqual(tables["empty_table"].profile.record_count, 0)
+        self.assertIsNone(tables["empty_table"].columns[0].profile)
+
+    def test_profile_aggregates_single_statement_per_batch(self):
+        """Test that aggregate statistics cost one statement per column batch."""
+        statements = []
+
+        def count_aggregates(conn, cursor, statement, parameters, context, executemany):
+            if "count(DISTINCT" in statement:
+                statements.append(statement)
+
+        for max_columns, expected in ((100, 1), (1, 2)):
+            statements.clear()
+            parser = DatabaseParser(db_url=self.db_url, max_columns_per_statement=max_columns)
+            event.listen(parser.engine, "before_cursor_execute", count_aggregates)
+            schema = parser.parse(profile=True, num_samples=1)
+            hero_power = next(t for t in schema.tables if t.name == "hero_power")
+            self.assertEqual(hero_power.columns[1].profile.null_count, 1)
+            self.assertEqual(hero_power.columns[0].profile.distinct_count, 3)
+            # hero, superpower and hero_power have two columns each, empty_table one.
+            self.assertEqual(len(statements), 3 * expected + 1)
+
+    def test_approx_distinct(self):
+        """Test that approximate distinct counts skip COUNT(DISTINCT) and are marked."""
+        statements = []
+        parser = DatabaseParser(db_url=self.db_url, approx_distinct=True)
+        event.listen(
+            parser.engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+        schema = parser.parse(profile=True, num_samples=1)
+        hero_power = next(t for t in schema.tables if t.name == "hero_power")
+
+        self.assertFalse(any("count(DISTINCT" in statement for statement in statements))
+        self.assertEqual(hero_power.columns[0].profile.distinct_count, 3)
+        self.assertEqual(hero_power.columns[1].profile.distinct_count, 2)
+        self.assertIn("distinct_count", hero_power.columns[1].profile.estimated_fields)
+
+        # Dialects with a native approximation use it in the fused statement
+        statement = build_aggregate_statement(
+            table("hero_power", column("hero_id"), column("power_id")),
+            list(enumerate(hero_power.columns)),
+            dialect_name="mssql",
+            approx_distinct=True,
+        )
+        self.assertIn("approx_count_distinct(hero_power.power_id)", str(statement))
+
+    def test_aggregate_statement_skips_unsupported_types(self):
+        """Test that aggregates a column type lacks are left out instead of failing the batch."""
+        meta_table = Table(
+            "events", MetaData(),
+            Column("id", Integer), Column("flag", Boolean), Column("token", postgresql.UUID),
+            Column("doc", postgresql.JSON), Column("data", postgresql.JSONB),
+        )
+        columns = [
+            (idx, ColumnInfo(name=c.name, type=str(c.type), nullable=True, primary_key=False))
+            for idx, c in enumerate(meta_table.columns)
+        ]
+        compiled = str(build_aggregate_statement(meta_table, columns, "postgresql").compile(
+            dialect=postgresql.dialect()
+        ))
+        self.assertIn("min(events.id)", compiled)
+        for name in ("flag", "token", "doc", "data"):
+            self.assertIn(f"count(events.{name})", compiled)
+            self.assertNotIn(f"min(events.{name})", compiled)
+            self.assertNotIn(f"max(events.{name})", compiled)
+        # json has no equality operator, jsonb does
+        self.assertNotIn("count(DISTINCT events.doc)", compiled)
+        self.assertIn("count(DISTINCT events.data)", compiled)
+        self.assertIn("count(DISTINCT events.flag)", compiled)
+
+        # Other dialects can order booleans
+        sqlite_statement = str(build_aggregate_statement(meta_table, columns[:2], "sqlite"))
+        self.assertIn("min(events.flag)", sqlite_statement)
+
+    def test_top_k_from_heavy_hitters(self):
+        """Test that top-k values come from the scan instead of a GROUP BY query."""
+        statements = []
+        parser = DatabaseParser(db_url=self.db_url)
+        event.listen(
+            parser.engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+        schema = parser.parse(profile=True, num_samples=1)
+        hero_power = next(t for t in schema.tables if t.name == "hero_power")
+
+        self.assertFalse(any("GROUP BY" in statement for statement in statements))
+        power_id = hero_power.columns[1].profile
+        self.assertEqual(power_id.top_k_values, [("1", 3), ("2", 1)])
+        self.assertEqual(power_id.top_k_error, 0)
+        self.assertNotIn("top_k_values", power_id.estimated_fields)
+
+    def test_near_unique_columns_have_no_top_k(self):
+        """Test that near-unique columns skip top-k values."""
+        path = os.path.join(self.tmp_dir.name, "unique.db")
+        connection = sqlite3.connect(path)
+        connection.execute("CREATE TABLE events (id INTEGER PRIMARY KEY, kind TEXT)")
+        connection.executemany(
+            "INSERT INTO events (id, kind) VALUES (?, ?)",
+            [(i, f"kind_{i % 4}") for i in range(1, 12001)],
+        )
+        connection.commit()
+        connection.close()
+
+        events = DatabaseParser(f"sqlite:///{path}", batch_size=5000).parse(profile=True).tables[0]
+        self.assertEqual(events.columns[0].profile.top_k_values, [])
+        self.assertEqual(
+            sorted(events.columns[1].profile.top_k_values),
+            [(f"kind_{i}", 3000) for i in range(4)],
+        )
+
+    def test_streaming_scan(self):
+        """Test that the streaming scan fills sketches and numeric moments."""
+        parser = DatabaseParser(db_url=self.db_url, batch_size=2)
+        schema = parser.parse(profile=True, num_samples=1)
+        hero = next(t for t in schema.tables if t.name == "hero")
+
+        id_profile = hero.columns[0].profile
+        self.assertAlmostEqual(id_profile.mean_value, 2.0)
+        self.assertAlmostEqual(id_profile.std_dev, (2 / 3) ** 0.5)
+
+        minhash = MinHash(num_perm=128)
+        for name in ("Superman", "Batman", "Wonder Woman"):
+            minhash.update(name.encode("utf8"))
+        sketch = LeanMinHash.deserialize(hero.columns[1].profile.minhash_sketch)
+        self.assertEqual(sketch.jaccard(LeanMinHash(minhash)), 1.0)
+
+    def test_concurrent_parse_keeps_table_order(self):
+        """Test that parsing with several workers matches a sequential parse."""
+        sequential = DatabaseParser(db_url=self.db_url).parse(profile=True, num_samples=2)
+        concurrent = DatabaseParser(db_url=self.db_url, max_workers=4).parse(profile=True, num_samples=2)
+        self.assertEqual(concurrent, sequential)
+
+    def test_process_executor_matches_sequential_parse(self):
+        """Test that parsing in worker processes matches a sequential parse."""
+        sequential = DatabaseParser(db_url=self.db_url).parse(profile=True, num_samples=2)
+        in_processes = DatabaseParser(
+            db_url=self.db_url, max_workers=2, executor="process"
+        ).parse(profile=True, num_samples=2)
+        self.assertEqual(in_processes, sequential)
+
+    def test_failing_table_is_isolated(self):
+        """Test that an error in one table does not prevent the others from parsing."""
+        parser = DatabaseParser(db_url=self.db_url, max_workers=2)
+        original = parser._profile_table_and_columns
+
+        def fail_on_hero(connection, table_info, meta_table):
+            if table_info.name == "hero":
+                raise RuntimeError("boom")
+            return original(connection, table_info, meta_table)
+
+        parser._profile_table_and_columns = fail_on_hero
+        schema = parser.parse(profile=True)
+        self.assertEqual(
+            [table.name for table in schema.tables],
+            ["empty_table", "hero_power", "superpower"],
+        )
+
+    def test_excluded_tables_are_never_queried(self):
+        """Test that filtered-out tables cost neither catalog queries nor scans."""
+        statements = []
+        parser = DatabaseParser(db_url=self.db_url)
+        event.listen(
+            parser.engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+        schema = parser.parse(profile=True, include=["hero*"], exclude=["hero_power"])
+        self.assertEqual([table.name for table in schema.tables], ["hero"])
+        self.assertFalse(any("superpower" in statement for statement in statements))
+
+    def test_incremental_parse_requires_same_profile_mode(self):
+        """Test that tables profiled with another strategy are profiled again."""
+        parser = DatabaseParser(db_url=self.db_url)
+        first = parser.parse(profile=True, profile_mode="catalog", track_changes=True)
+        old_tables = {table.name: table for table in first.tables}
+
+        second = parser.parse(profile=True, profile_mode="full", previous=first)
+        new_tables = {table.name: table for table in second.tables}
+        self.assertIsNot(new_tables["hero"], old_tables["hero"])
+        self.assertEqual(new_tables["hero"].profile.strategy, "full")
+        self.assertIsNotNone(new_tables["hero"].columns[0].profile.minhash_sketch)
+
+        third = parser.parse(profile=True, profile_mode="auto", time_budget=600, previous=second)
+        self.assertIs({table.name: table for table in third.tables}["hero"], new_tables["hero"])
+
+    def test_incremental_parse_reuses_unchanged_tables(self):
+        """Test that only tables whose data or structure changed are parsed again."""
+        parser = DatabaseParser(db_url=self.db_url)
+        first = parser.parse(profile=True, track_changes=True)
+        self.assertTrue(all(table.change_signal for table in first.tables))
+
+        connection = sqlite3.connect(os.path.join(self.tmp_dir.name, "mock.db"))
+        connection.execute("INSERT INTO hero (id, name) VALUES (4, 'Flash')")
+        connection.execute("ALTER TABLE superpower ADD COLUMN category TEXT")
+        connection.commit()
+        connection.close()
+
+        statements = []
+        event.listen(
+            parser.engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+        second = parser.parse(profile=True, previous=first)
+        old_tables = {table.name: table for table in first.tables}
+        new_tables = {table.name: table for table in second.tables}
+
+        self.assertEqual([table.name for table in second.tables], [table.name for table in first.tables])
+        self.assertIs(new_tables["hero_power"], old_tables["hero_power"])
+        self.assertIs(new_tables["empty_table"], old_tables["empty_table"])
+        self.assertEqual(new_tables["hero"].profile.record_count, 4)
+        self.assertEqual(new_tables["superpower"].columns[-1].name, "category")
+        profiled = [s for s in statements if "count(distinct" in s.lower()]
+        self.assertTrue(any(statement.endswith("FROM hero") for statement in profiled))
+        self.assertFalse(any("hero_power" in statement for statement in profiled))
+
+        # Profiling a table that was only parsed before requires a new parse
+        third = parser.parse(profile=False, previous=second)
+        self.assertIsNot(third.tables[0], second.tables[0])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -34,5 +34,13 @@ hero_power.power_id = superpower.id
 """
         self.assertEqual(m_schema_output.strip(), expected_output.strip())
 
+    def test_iter_schema_streams_tables(self):
+        """Test that the streamed chunks add up to the generated schema, one per table."""
+        chunks = list(self.generator.iter_schema())
+        self.assertEqual("".join(chunks), self.generator.generate_schema())
+        self.assertTrue(any(chunk.startswith("\n# Table: hero_power") for chunk in chunks))
+        self.assertGreater(len(chunks), len(self.mock_schema.tables))
+
+
 if __name__ == '__main__':
     unittest.main()
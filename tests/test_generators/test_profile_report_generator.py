@@ -1,5 +1,6 @@
 import unittest
 from tests.mock_schema import create_mock_schema
+from d_schema.structures import ColumnProfile, TableProfile
 from d_schema.generators.profile_report.generator import ProfileReportGenerator
 
 class TestProfileReportGenerator(unittest.TestCase):
@@ -48,5 +49,51 @@ class TestProfileReportGenerator(unittest.TestCase):
         self.maxDiff = None
         self.assertEqual(profile_report_output.strip(), expected_output.strip())
 
+    def test_estimates_are_marked(self):
+        """Test that estimated profile values are rendered with a '~'."""
+        hero = self.mock_schema.tables[0]
+        hero.profile = TableProfile(record_count=1000, estimated_fields=["record_count"])
+        hero.columns[1].profile = ColumnProfile(
+            null_count=0,
+            non_null_count=1000,
+            distinct_count=990,
+            top_k_values=[("Superman", 10)],
+            estimated_fields=["null_count", "non_null_count", "distinct_count", "top_k_values"],
+        )
+
+        table_output = self.generator.generate_table(hero)
+        self.assertIn("*Record Count: ~1000*", table_output)
+        self.assertIn(
+            "| name | VARCHAR(100) | **Non-Null**: ~100.0%<br>**Distinct**: ~990<br>"
+            "**Min**: N/A<br>**Max**: N/A<br>**Top Values**: 'Superman' (~10) |",
+            table_output,
+        )
+
+        hero.columns[1].profile.top_k_error = 4
+        self.assertIn(
+            "**Top Values**: 'Superman' (~10) (counts up to 4 low) |",
+            self.generator.generate_table(hero),
+        )
+
+    def test_quantiles_are_rendered(self):
+        """Test that quartiles, deciles and histogram bounds appear in the report."""
+        hero = self.mock_schema.tables[0]
+        hero.columns[0].profile = ColumnProfile(
+            null_count=0,
+            non_null_count=4,
+            distinct_count=4,
+            min_value="1",
+            max_value="4",
+            quartiles=["1", "2", "3"],
+            deciles=["1", "1", "1", "2", "2", "3", "3", "4", "4"],
+            histogram_bounds=["1", "2", "3", "4"],
+            estimated_fields=["quartiles"],
+        )
+
+        row = self.generator.generate_column(hero.columns[0])
+        self.assertIn("**Quartiles**: ~1 / 2 / 3", row)
+        self.assertIn("**Deciles**: 1 / 1 / 1 / 2 / 2 / 3 / 3 / 4 / 4", row)
+        self.assertIn("**Histogram** (3 equal-count buckets): 1, 2, 3, 4", row)
+
 if __name__ == '__main__':
     unittest.main()
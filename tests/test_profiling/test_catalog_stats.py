@@ -0,0 +1,51 @@
+import sqlite3
+import tempfile
+import unittest
+
+from d_schema.db_parser import DatabaseParser
+from d_schema.profiling.catalog_stats import _decode_mysql_histogram_value, _parse_pg_array
+from tests.mock_database import create_mock_database
+
+
+class TestCatalogStatistics(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_url = create_mock_database(self.tmp_dir.name)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_sqlite_catalog_profile(self):
+        """Test that catalog mode reads sqlite_stat1 and marks estimates."""
+        connection = sqlite3.connect(self.db_url[len("sqlite:///"):])
+        connection.executescript("CREATE INDEX ix_power_name ON superpower (power_name); ANALYZE;")
+        connection.close()
+
+        schema = DatabaseParser(self.db_url).parse(profile=True, profile_mode="catalog")
+        superpower = next(t for t in schema.tables if t.name == "superpower")
+
+        self.assertEqual(superpower.profile.record_count, 3)
+        self.assertEqual(superpower.profile.estimated_fields, ["record_count"])
+        id_profile = superpower.columns[0].profile
+        self.assertEqual((id_profile.null_count, id_profile.distinct_count), (0, 3))
+        self.assertIn("distinct_count", superpower.columns[1].profile.estimated_fields)
+        self.assertIsNone(superpower.columns[1].profile.minhash_sketch)
+
+    def test_without_statistics(self):
+        """Test that catalog mode never scans a database that was not analyzed."""
+        schema = DatabaseParser(self.db_url).parse(profile=True, profile_mode="catalog")
+        self.assertTrue(all(table.profile is None for table in schema.tables))
+
+    def test_parse_pg_array(self):
+        """Test parsing PostgreSQL array literals from pg_stats."""
+        self.assertEqual(_parse_pg_array('{a,"b c","d,\\"e",NULL,"NULL"}'), ["a", "b c", 'd,"e', None, "NULL"])
+        self.assertEqual(_parse_pg_array("{}"), [])
+
+    def test_decode_mysql_histogram_value(self):
+        """Test decoding base64 encoded MySQL histogram values."""
+        self.assertEqual(_decode_mysql_histogram_value("base64:type254:QmF0bWFu"), "Batman")
+        self.assertEqual(_decode_mysql_histogram_value(42), "42")
+
+
+if __name__ == '__main__':
+    unittest.main()
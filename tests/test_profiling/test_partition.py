@@ -0,0 +1,117 @@
+import os
+import sqlite3
+import tempfile
+import tracemalloc
+import unittest
+
+import numpy as np
+from datasketch import LeanMinHash
+
+from d_schema.db_parser import DatabaseParser
+from d_schema.profiling.scan import ColumnAccumulator
+from d_schema.profiling.sketches import HeavyHitters, hash_values
+
+
+class TestPartitionedProfiling(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        path = os.path.join(self.tmp_dir.name, "large.db")
+        connection = sqlite3.connect(path)
+        connection.execute("CREATE TABLE events (id INTEGER PRIMARY KEY, kind TEXT, amount REAL)")
+        connection.executemany(
+            "INSERT INTO events (id, kind, amount) VALUES (?, ?, ?)",
+            [
+                (i, None if i % 5 == 0 else f"kind_{i % 7}", i * 0.5)
+                for i in range(1, 5001)
+            ],
+        )
+        connection.commit()
+        connection.close()
+        self.db_url = f"sqlite:///{path}"
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_partitioned_profile_matches_full_scan(self):
+        """Test that merged partition states reproduce the single-scan profile."""
+        full = DatabaseParser(self.db_url).parse(profile=True).tables[0]
+        partitioned = DatabaseParser(
+            self.db_url, max_workers=4, partition_rows=600, batch_size=250
+        ).parse(profile=True).tables[0]
+
+        self.assertEqual(partitioned.profile.partitions, 9)
+        self.assertEqual(partitioned.profile.record_count, 5000)
+        for expected, actual in zip(full.columns, partitioned.columns):
+            expected, actual = expected.profile, actual.profile
+            self.assertEqual(actual.null_count, expected.null_count)
+            self.assertEqual(actual.min_value, expected.min_value)
+            self.assertEqual(actual.max_value, expected.max_value)
+            self.assertAlmostEqual(actual.mean_value, expected.mean_value)
+            self.assertAlmostEqual(actual.std_dev, expected.std_dev)
+            self.assertAlmostEqual(
+                actual.distinct_count, expected.distinct_count, delta=expected.distinct_count * 0.03
+            )
+            self.assertEqual(
+                LeanMinHash.deserialize(actual.minhash_sketch),
+                LeanMinHash.deserialize(expected.minhash_sketch),
+            )
+
+        kind = partitioned.columns[1].profile
+        # Seven distinct values fit the heavy-hitters summary exactly
+        self.assertEqual(sorted(kind.top_k_values), sorted(full.columns[1].profile.top_k_values))
+        self.assertEqual(kind.estimated_fields, ["distinct_count"])
+
+    def test_accumulator_merge(self):
+        """Test that merging accumulators equals accumulating everything at once."""
+        values = np.array([None if i % 9 == 0 else i % 40 for i in range(3000)], dtype=object)
+        whole = ColumnAccumulator("value", numeric=True)
+        whole.update(values)
+        left, right = ColumnAccumulator("value", numeric=True), ColumnAccumulator("value", numeric=True)
+        left.update(values[:1234])
+        right.update(values[1234:])
+        left.merge(right)
+
+        self.assertEqual(left.null_count, whole.null_count)
+        self.assertEqual((left.min_value, left.max_value), (whole.min_value, whole.max_value))
+        self.assertAlmostEqual(left.mean, whole.mean)
+        self.assertAlmostEqual(left.m2, whole.m2)
+        self.assertTrue((left.hll.reg == whole.hll.reg).all())
+        self.assertEqual(left.minhash, whole.minhash)
+
+    def test_long_value_does_not_widen_batch(self):
+        """Test that one very long text value does not blow up the memory of its batch."""
+        values = np.array(["short"] * 999 + ["x" * 100_000], dtype=object)
+        accumulator = ColumnAccumulator("body", text=True)
+        tracemalloc.start()
+        try:
+            accumulator.update(values)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(accumulator.length_sum, 999 * 5 + 100_000)
+        # A fixed-width array of 1000 values of 100,000 characters would take 400 MB
+        self.assertLess(peak, 20_000_000)
+
+    def test_heavy_hitters_error_bound(self):
+        """Test that heavy-hitters counts undercount by at most the error bound."""
+        rng = np.random.default_rng(7)
+        values = np.array([str(v) for v in rng.zipf(1.5, 20000) % 1000], dtype=object)
+        hashes = hash_values(values)
+        summaries = [HeavyHitters(capacity=20) for _ in range(4)]
+        for i, summary in enumerate(summaries):
+            summary.update(hashes[i::4], values[i::4])
+        merged = summaries[0]
+        for summary in summaries[1:]:
+            merged.merge(summary)
+
+        unique, counts = np.unique(values, return_counts=True)
+        true_counts = dict(zip(unique.tolist(), counts.tolist()))
+        self.assertLessEqual(len(merged.top(100)), 20)
+        for value, count in merged.top(5):
+            self.assertLessEqual(count, true_counts[value])
+            self.assertGreaterEqual(count, true_counts[value] - merged.error_bound())
+        self.assertEqual(merged.top(1)[0][0], max(true_counts, key=true_counts.get))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from d_schema.db_parser import DatabaseParser
+from d_schema.profiling.planner import ProfilingPlanner, missing_fields
+from d_schema.profiling.timeouts import statement_deadline
+from d_schema.structures import ColumnProfile
+
+
+class TestProfilingPlanner(unittest.TestCase):
+    def test_plan_degrades_largest_tables_first(self):
+        """Test that the planner degrades the most expensive tables to fit the budget."""
+        planner = ProfilingPlanner(time_budget=5, sample_size=10_000, cells_per_second=1_000_000)
+        plans = planner.plan(
+            row_counts={"small": 1_000, "large": 50_000_000, "huge": 2_000_000_000, "unknown": None},
+            column_counts={"small": 5, "large": 10, "huge": 10, "unknown": 3},
+            has_statistics={"small": True, "large": True, "huge": False, "unknown": False},
+        )
+        self.assertEqual(plans["small"].strategy, "full")
+        self.assertEqual(plans["large"].strategy, "sample")
+        self.assertEqual(plans["huge"].strategy, "sample")
+        self.assertEqual(plans["unknown"].strategy, "sample")
+        self.assertGreaterEqual(plans["small"].allotted_seconds, 1.0)
+
+        tight = ProfilingPlanner(time_budget=0.01).plan(
+            row_counts={"large": 50_000_000, "huge": 2_000_000_000},
+            column_counts={"large": 10, "huge": 10},
+            has_statistics={"large": True, "huge": False},
+        )
+        self.assertEqual(tight["large"].strategy, "catalog")
+        self.assertEqual(tight["huge"].strategy, "skip")
+
+    def test_missing_fields_accept_empty_top_k_of_finished_scan(self):
+        """Test that near-unique columns are not reported as degraded for lacking top-k values."""
+        expected = ["null_count", "distinct_count", "top_k_values", "minhash_sketch"]
+        near_unique = ColumnProfile(null_count=0, distinct_count=500, minhash_sketch=b"sketch")
+        self.assertEqual(missing_fields([near_unique], expected), [])
+        unscanned = ColumnProfile(null_count=0, distinct_count=500)
+        self.assertEqual(missing_fields([near_unique, unscanned], expected), ["top_k_values", "minhash_sketch"])
+        self.assertEqual(missing_fields([near_unique, None], expected), expected)
+
+    def test_statement_deadline_interrupts_sqlite(self):
+        """Test that statements running past the deadline are cancelled."""
+        engine = create_engine("sqlite://")
+        endless = text(
+            "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) "
+            "SELECT count(*) FROM n"
+        )
+        with engine.connect() as connection:
+            with self.assertRaises(OperationalError):
+                with statement_deadline(connection, 0.2) as deadline:
+                    connection.execute(endless)
+            self.assertTrue(deadline.expired)
+            # The handler is removed again afterwards
+            self.assertEqual(connection.execute(text("SELECT 1")).scalar_one(), 1)
+
+    def test_statement_deadline_sets_timeout_on_plain_cursor(self):
+        """Test that the PostgreSQL timeout is not sent through the (server-side) statement cursor."""
+        connection = mock.MagicMock()
+        connection.dialect.name = "postgresql"
+        connection.info = {}
+        plain_cursor = connection.connection.dbapi_connection.cursor.return_value
+        listeners = []
+        with mock.patch("d_schema.profiling.timeouts.event") as event:
+            event.listen.side_effect = lambda target, name, listener: listeners.append(listener)
+            with statement_deadline(connection, 60):
+                server_side_cursor = mock.MagicMock()
+                listeners[0](connection, server_side_cursor, "SELECT 1", {}, None, False)
+
+        server_side_cursor.execute.assert_not_called()
+        (statement,), _ = plain_cursor.execute.call_args
+        self.assertRegex(statement, r"^SET statement_timeout = \d+$")
+        self.assertGreater(int(statement.rsplit(" ", 1)[1]), 59_000)
+        plain_cursor.close.assert_called_once()
+
+
+class TestAutoProfiling(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        path = os.path.join(self.tmp_dir.name, "planned.db")
+        connection = sqlite3.connect(path)
+        connection.execute("CREATE TABLE big (id INTEGER PRIMARY KEY, value TEXT)")
+        connection.executemany(
+            "INSERT INTO big (id, value) VALUES (?, ?)",
+            [(i, f"v{i % 100}") for i in range(1, 50001)],
+        )
+        connection.execute("CREATE TABLE tiny (id INTEGER PRIMARY KEY)")
+        connection.execute("INSERT INTO tiny (id) VALUES (1)")
+        connection.commit()
+        connection.close()
+        self.db_url = f"sqlite:///{path}"
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_auto_mode_records_strategy(self):
+        """Test that auto mode records the strategy chosen for every table."""
+        parser = DatabaseParser(self.db_url)
+        schema = parser.parse(profile=True, profile_mode="auto", time_budget=0.15, sample_size=1000)
+        big, tiny = schema.tables
+        self.assertEqual(big.profile.strategy, "sample")
+        self.assertEqual(big.profile.record_count, 50000)
+        self.assertEqual(tiny.profile.strategy, "full")
+        self.assertEqual(tiny.profile.degraded_fields, [])
+
+    def test_auto_mode_requires_budget(self):
+        with self.assertRaises(ValueError):
+            DatabaseParser(self.db_url).parse(profile=True, profile_mode="auto")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import datetime
+import os
+import sqlite3
+import tempfile
+import unittest
+
+import numpy as np
+
+from d_schema.db_parser import DatabaseParser
+from d_schema.profiling.scan import ColumnAccumulator
+from d_schema.profiling.sketches import KLLSketch
+from d_schema.structures import ColumnProfile
+
+
+class TestQuantileSketch(unittest.TestCase):
+    def test_small_input_is_exact(self):
+        """Test that a sketch that never compacted returns exact quantiles."""
+        sketch = KLLSketch()
+        sketch.update(np.arange(1, 101, dtype=np.float64))
+        self.assertTrue(sketch.is_exact())
+        self.assertEqual(sketch.quantiles([0.0, 0.5, 1.0]), [1.0, 50.0, 100.0])
+
+    def test_rank_error(self):
+        """Test that merged sketches of a large input stay within a small rank error."""
+        rng = np.random.default_rng(3)
+        values = rng.normal(size=200_000)
+        sketches = [KLLSketch(seed=i) for i in range(4)]
+        for i, sketch in enumerate(sketches):
+            for start in range(i * 50_000, (i + 1) * 50_000, 10_000):
+                sketch.update(values[start:start + 10_000])
+        merged = sketches[0]
+        for sketch in sketches[1:]:
+            merged.merge(sketch)
+
+        self.assertFalse(merged.is_exact())
+        self.assertEqual(merged.count, len(values))
+        ordered = np.sort(values)
+        fractions = [0.1, 0.25, 0.5, 0.75, 0.9]
+        for fraction, estimate in zip(fractions, merged.quantiles(fractions)):
+            rank = np.searchsorted(ordered, estimate) / len(values)
+            self.assertAlmostEqual(rank, fraction, delta=0.02)
+
+    def test_accumulator_formats_dates(self):
+        """Test that date quantiles are reported as dates and are exact for small columns."""
+        start = datetime.date(2024, 1, 1)
+        values = np.array([start + datetime.timedelta(days=i) for i in range(101)], dtype=object)
+        accumulator = ColumnAccumulator("day", temporal="date")
+        accumulator.update(values)
+        profile = ColumnProfile()
+        accumulator.apply_to(profile)
+
+        self.assertEqual(profile.quartiles, ["2024-01-26", "2024-02-20", "2024-03-16"])
+        self.assertEqual(len(profile.deciles), 9)
+        self.assertEqual(profile.histogram_bounds[0], "2024-01-01")
+        self.assertEqual(profile.histogram_bounds[-1], "2024-04-10")
+        self.assertNotIn("quartiles", profile.estimated_fields)
+
+    def test_real_column_is_numeric(self):
+        """Test that floating-point columns get moments and quartiles."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "readings.db")
+            connection = sqlite3.connect(path)
+            connection.execute("CREATE TABLE readings (id INTEGER PRIMARY KEY, value REAL)")
+            connection.executemany("INSERT INTO readings VALUES (?, ?)", [(i, i / 4) for i in range(1, 101)])
+            connection.commit()
+            connection.close()
+            parser = DatabaseParser(f"sqlite:///{path}")
+            profile = parser.parse(profile=True).tables[0].columns[1].profile
+            parser.engine.dispose()
+
+        self.assertAlmostEqual(profile.mean_value, 12.625)
+        self.assertIsNotNone(profile.std_dev)
+        self.assertEqual(len(profile.quartiles), 3)
+        self.assertEqual(len(profile.histogram_bounds), 21)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from d_schema.db_parser import DatabaseParser
+from d_schema.profiling.sampling import margin_of_error, resolve_sample_size
+
+
+class TestSampledProfiling(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        path = os.path.join(self.tmp_dir.name, "large.db")
+        connection = sqlite3.connect(path)
+        connection.execute("CREATE TABLE events (id INTEGER PRIMARY KEY, kind TEXT, amount INTEGER)")
+        connection.executemany(
+            "INSERT INTO events (id, kind, amount) VALUES (?, ?, ?)",
+            [
+                (i, None if i % 4 == 0 else f"kind_{i % 3}", i)
+                for i in range(1, 20001)
+            ],
+        )
+        connection.execute("CREATE TABLE small (id INTEGER PRIMARY KEY)")
+        connection.execute("INSERT INTO small (id) VALUES (1), (2)")
+        connection.commit()
+        connection.close()
+        self.db_url = f"sqlite:///{path}"
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_sampled_profile(self):
+        """Test that sampled profiles are scaled up and marked as estimates."""
+        schema = DatabaseParser(self.db_url).parse(profile=True, profile_mode="sample", sample_size=2000)
+        events, small = schema.tables
+
+        self.assertEqual(events.profile.record_count, 20000)
+        self.assertEqual(events.profile.sample_method, "key_range")
+        self.assertEqual(events.profile.sample_size, 2000)
+        self.assertLess(events.profile.margin_of_error, 0.03)
+
+        kind = events.columns[1].profile
+        self.assertIn("distinct_count", kind.estimated_fields)
+        self.assertAlmostEqual(kind.null_count / 20000, 0.25, delta=0.03)
+        self.assertEqual(kind.distinct_count, 3)
+        self.assertEqual(sorted(value for value, _ in kind.top_k_values), ["kind_0", "kind_1", "kind_2"])
+
+        amount = events.columns[2].profile
+        self.assertGreater(amount.distinct_count, 10000)
+        self.assertLessEqual(amount.distinct_count, 20000)
+        # Unique columns have no frequent values to scale up
+        self.assertEqual(amount.top_k_values, [])
+        self.assertEqual(events.columns[0].profile.top_k_values, [])
+
+        # Tables smaller than the sample are profiled exactly
+        self.assertIsNone(small.profile.sample_size)
+        self.assertEqual(small.columns[0].profile.estimated_fields, [])
+
+    def test_large_sample_size(self):
+        """Test that large samples are read in a bounded number of bigger blocks."""
+        path = os.path.join(self.tmp_dir.name, "huge.db")
+        connection = sqlite3.connect(path)
+        connection.execute("CREATE TABLE readings (id INTEGER PRIMARY KEY, value INTEGER)")
+        connection.executemany("INSERT INTO readings VALUES (?, ?)", ((i, i % 7) for i in range(1, 300_001)))
+        connection.commit()
+        connection.close()
+
+        schema = DatabaseParser(f"sqlite:///{path}").parse(profile=True, profile_mode="sample", sample_size=200_000)
+        readings = schema.tables[0]
+        self.assertIsNotNone(readings.profile)
+        self.assertEqual(readings.profile.sample_method, "key_range")
+        self.assertEqual(readings.profile.sample_size, 200_000)
+        self.assertEqual(readings.columns[1].profile.distinct_count, 7)
+
+    def test_sample_sizing(self):
+        """Test the sample size and margin of error helpers."""
+        self.assertEqual(resolve_sample_size(1000, 50, None), 50)
+        self.assertEqual(resolve_sample_size(1000, 50, 0.2), 200)
+        self.assertAlmostEqual(margin_of_error(100, 10**9), 0.098, places=3)
+        self.assertEqual(margin_of_error(100, 100), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
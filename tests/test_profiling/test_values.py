@@ -0,0 +1,72 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from sqlalchemy import Column, Integer, LargeBinary, MetaData, Table, event, select
+from sqlalchemy.dialects import postgresql
+
+from d_schema.db_parser import DatabaseParser
+from d_schema.profiling.values import TRUNCATION_MARK, scan_expression
+
+
+class TestValueLimits(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        path = os.path.join(self.tmp_dir.name, "documents.db")
+        connection = sqlite3.connect(path)
+        connection.execute("CREATE TABLE documents (id INTEGER PRIMARY KEY, body TEXT, payload BLOB)")
+        connection.executemany(
+            "INSERT INTO documents (id, body, payload) VALUES (?, ?, ?)",
+            [(i, f"{i % 3}" * 5000, bytes(10000)) for i in range(1, 31)],
+        )
+        connection.commit()
+        connection.close()
+        self.db_url = f"sqlite:///{path}"
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_long_values_are_cut_server_side(self):
+        """Test that long text is truncated by the database and binary values are skipped."""
+        statements = []
+        parser = DatabaseParser(self.db_url, max_value_length=20)
+        event.listen(
+            parser.engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+        table = parser.parse(profile=True, num_samples=2).tables[0]
+        body, payload = table.columns[1], table.columns[2]
+
+        self.assertEqual(body.samples, ["1" * 20 + TRUNCATION_MARK, "2" * 20 + TRUNCATION_MARK])
+        self.assertEqual(payload.samples, [])
+        self.assertEqual(body.profile.min_value, "0" * 20 + TRUNCATION_MARK)
+        self.assertEqual(body.profile.max_value, "2" * 20 + TRUNCATION_MARK)
+        self.assertEqual(sorted(count for _, count in body.profile.top_k_values), [10, 10, 10])
+        self.assertTrue(all(value.endswith(TRUNCATION_MARK) for value, _ in body.profile.top_k_values))
+        self.assertIsNone(payload.profile.min_value)
+        self.assertEqual(payload.profile.top_k_values, [])
+        self.assertEqual(payload.profile.distinct_count, 1)
+
+        sample_queries = [s for s in statements if "LIMIT" in s and "count(" not in s]
+        self.assertTrue(all("substr(documents.body" in s for s in sample_queries))
+        self.assertFalse(any("documents.payload" in s for s in sample_queries))
+
+    def test_scan_reads_digests_of_binary_columns(self):
+        """Test that scans select a server-side digest instead of binary values where possible."""
+        table = Table("files", MetaData(), Column("id", Integer), Column("payload", LargeBinary))
+        statement = select(*(scan_expression(column, "postgresql") for column in table.columns))
+        compiled = str(statement.compile(dialect=postgresql.dialect()))
+        self.assertIn("md5(files.payload) AS payload", compiled)
+        self.assertIs(scan_expression(table.c.payload, "sqlite"), table.c.payload)
+        self.assertIs(scan_expression(table.c.id, "postgresql"), table.c.id)
+
+    def test_no_limit(self):
+        """Test that values are kept whole without a maximum length."""
+        table = DatabaseParser(self.db_url, max_value_length=None).parse(num_samples=1).tables[0]
+        self.assertEqual(table.columns[1].samples, ["1" * 5000])
+
+
+if __name__ == "__main__":
+    unittest.main()
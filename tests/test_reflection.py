@@ -0,0 +1,51 @@
+import tempfile
+import unittest
+
+from sqlalchemy import create_engine, inspect, select, func
+
+from d_schema.reflection import filter_table_names, reflect_catalog
+from tests.mock_database import create_mock_database
+
+
+class TestReflectCatalog(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.engine = create_engine(create_mock_database(self.tmp_dir.name))
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.tmp_dir.cleanup()
+
+    def test_reflect_catalog(self):
+        """Test that the bulk catalog holds columns, keys and query targets."""
+        catalog = reflect_catalog(inspect(self.engine), ["hero_power", "hero", "missing"])
+
+        self.assertEqual(list(catalog), ["hero_power", "hero"])
+        self.assertEqual(catalog["hero"].primary_keys, ["id"])
+        self.assertEqual([c["name"] for c in catalog["hero"].columns], ["id", "name"])
+        self.assertEqual(
+            sorted(fk["referred_table"] for fk in catalog["hero_power"].foreign_keys),
+            ["hero", "superpower"],
+        )
+
+        query_table = catalog["hero_power"].query_table()
+        with self.engine.connect() as connection:
+            count = connection.execute(
+                select(func.count()).select_from(query_table).where(query_table.c.power_id.is_(None))
+            ).scalar_one()
+        self.assertEqual(count, 1)
+
+    def test_filter_table_names(self):
+        """Test explicit table lists and glob/regex include and exclude filters."""
+        names = ["hero", "hero_power", "superpower", "hero_tmp"]
+        self.assertEqual(filter_table_names(names, include=["hero*"]), ["hero", "hero_power", "hero_tmp"])
+        self.assertEqual(
+            filter_table_names(names, include=["hero*"], exclude=["re:.*_(tmp|bak)"]),
+            ["hero", "hero_power"],
+        )
+        self.assertEqual(filter_table_names(names, tables=["superpower", "hero", "nope"]), ["hero", "superpower"])
+        self.assertEqual(filter_table_names(names), names)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from sqlalchemy import create_engine, event, inspect
+
+from d_schema.db_parser import DatabaseParser
+from d_schema.reflection import reflect_catalog
+from d_schema.sample_values import fetch_sample_values
+from tests.mock_database import create_mock_database
+
+
+class TestSampleValues(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_url = create_mock_database(self.tmp_dir.name)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_one_sample_query_per_table(self):
+        """Test that samples of all columns come from a single query per table."""
+        statements = []
+        parser = DatabaseParser(db_url=self.db_url)
+        event.listen(
+            parser.engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+        schema = parser.parse(num_samples=2)
+        tables = {table.name: table for table in schema.tables}
+
+        self.assertEqual(tables["hero"].columns[1].samples, ["Superman", "Batman"])
+        self.assertEqual(tables["superpower"].columns[1].samples, ["Agility", "Accelerated Healing"])
+        self.assertEqual(tables["hero_power"].columns[1].samples, ["1", "2"])
+        self.assertEqual(tables["empty_table"].columns[0].samples, [])
+        data_queries = [s for s in statements if s.startswith("SELECT") and "FROM sqlite_" not in s]
+        self.assertFalse(any("DISTINCT" in s for s in data_queries))
+
+    def test_sparse_column_falls_back_to_distinct_query(self):
+        """Test that columns without enough values in the block are queried on their own."""
+        path = os.path.join(self.tmp_dir.name, "sparse.db")
+        connection = sqlite3.connect(path)
+        connection.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, rare TEXT)")
+        connection.executemany(
+            "INSERT INTO t (id, rare) VALUES (?, ?)",
+            [(i, "found" if i == 50 else None) for i in range(1, 101)],
+        )
+        connection.commit()
+        connection.close()
+
+        engine = create_engine(f"sqlite:///{path}")
+        table_catalog = reflect_catalog(inspect(engine), ["t"])["t"]
+        with engine.connect() as conn:
+            samples = fetch_sample_values(
+                conn, table_catalog.query_table(), table_catalog.columns, 1, block_rows=10
+            )
+        self.assertEqual(samples, {"id": ["1"], "rare": ["found"]})
+
+
+if __name__ == "__main__":
+    unittest.main()
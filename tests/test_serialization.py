@@ -0,0 +1,65 @@
+import os
+import struct
+import tempfile
+import unittest
+from unittest import mock
+
+from d_schema import serialization
+from d_schema.db_parser import DatabaseParser
+from d_schema.structures import DatabaseSchema, LazyTableList
+from tests.mock_database import create_mock_database
+
+
+class TestSerialization(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        db_url = create_mock_database(self.tmp_dir.name)
+        self.schema = DatabaseParser(db_url=db_url).parse(profile=True, num_samples=2)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_binary_round_trip(self):
+        """Test that a schema dumped in the binary format loads back unchanged."""
+        path = os.path.join(self.tmp_dir.name, "schema.dsch")
+        self.schema.dump(path)
+        loaded = DatabaseSchema.load(path)
+
+        self.assertIsInstance(loaded.tables, LazyTableList)
+        self.assertEqual(loaded.db_name, self.schema.db_name)
+        self.assertEqual(list(loaded.tables), self.schema.tables)
+        sketches = [col.profile.minhash_sketch for table in loaded.tables for col in table.columns if col.profile]
+        self.assertTrue(any(sketches))
+
+    def test_binary_tables_decode_on_access(self):
+        """Test that loading reads only the index and decodes tables when accessed."""
+        path = os.path.join(self.tmp_dir.name, "schema.dsch")
+        self.schema.dump(path)
+        with mock.patch.object(serialization._BinaryReader, "table", autospec=True,
+                               side_effect=serialization._BinaryReader.table) as decode:
+            loaded = DatabaseSchema.load(path)
+            self.assertEqual(loaded.tables.names, [table.name for table in self.schema.tables])
+            self.assertEqual(decode.call_count, 0)
+            self.assertEqual(loaded.tables.get("hero"), self.schema.tables[1])
+            self.assertEqual(decode.call_count, 1)
+
+    def test_newer_format_version_is_rejected(self):
+        """Test that files of a newer format version are not misread."""
+        path = os.path.join(self.tmp_dir.name, "schema.dsch")
+        self.schema.dump(path)
+        with open(path, "r+b") as f:
+            f.seek(len(serialization.MAGIC))
+            f.write(struct.pack("<I", serialization.FORMAT_VERSION + 1))
+        with self.assertRaises(ValueError):
+            DatabaseSchema.load(path)
+
+    def test_json_round_trip(self):
+        """Test that the JSON export loads back unchanged."""
+        path = os.path.join(self.tmp_dir.name, "schema.json")
+        self.schema.dump(path, format="json")
+        loaded = DatabaseSchema.load(path)
+        self.assertEqual(loaded, self.schema)
+
+
+if __name__ == "__main__":
+    unittest.main()
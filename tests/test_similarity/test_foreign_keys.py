@@ -0,0 +1,158 @@
+import os
+import random
+import sqlite3
+import tempfile
+import unittest
+
+from d_schema.db_parser import DatabaseParser
+from d_schema.generators.ddl_schema.generator import DDLSchemaGenerator
+from d_schema.generators.m_schema.generator import MSchemaGenerator
+from d_schema.similarity import apply_foreign_keys, infer_foreign_keys
+from d_schema.similarity.foreign_keys import names_match, types_compatible
+from d_schema.store import table_fingerprint
+
+
+def create_legacy_database(directory):
+    """Creates a database whose tables reference each other without declared foreign keys."""
+    path = os.path.join(directory, "legacy.db")
+    rng = random.Random(7)
+    connection = sqlite3.connect(path)
+    connection.executescript("""
+        CREATE TABLE customers (id INTEGER PRIMARY KEY, email TEXT);
+        CREATE TABLE products (id INTEGER PRIMARY KEY, sku TEXT);
+        CREATE TABLE orders (
+            id INTEGER PRIMARY KEY, customer_id INTEGER, status INTEGER, rating INTEGER, sku TEXT, note TEXT
+        );
+        CREATE TABLE employees (id INTEGER PRIMARY KEY, manager_employee_id INTEGER);
+    """)
+    connection.executemany(
+        "INSERT INTO customers VALUES (?, ?)", [(i, f"user{i}@example.com") for i in range(1, 301)]
+    )
+    connection.executemany("INSERT INTO products VALUES (?, ?)", [(i, f"SKU-{i:04d}") for i in range(1, 81)])
+    connection.executemany(
+        "INSERT INTO orders VALUES (?, ?, ?, ?, ?, ?)",
+        [
+            (
+                i, rng.randint(1, 300), rng.randint(1, 3), rng.randint(1, 20),
+                f"SKU-{rng.randint(1, 80):04d}", f"note {i}",
+            )
+            for i in range(1, 1001)
+        ],
+    )
+    connection.executemany(
+        "INSERT INTO employees VALUES (?, ?)", [(i, None if i <= 20 else rng.randint(1, 20)) for i in range(1, 201)]
+    )
+    connection.commit()
+    connection.close()
+    return f"sqlite:///{path}"
+
+
+class TestForeignKeyInference(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.parser = DatabaseParser(db_url=create_legacy_database(self.tmp_dir.name))
+        self.schema = self.parser.parse(profile=True)
+
+    def tearDown(self):
+        self.parser.engine.dispose()
+        self.tmp_dir.cleanup()
+
+    def inferred_pairs(self, inferred, min_confidence=0.5):
+        return {
+            (fk.table, fk.column): (fk.referred_table, fk.referred_column)
+            for fk in inferred if fk.confidence >= min_confidence
+        }
+
+    def test_infers_undeclared_foreign_keys(self):
+        """Test that contained columns are matched to the unique column they reference."""
+        inferred = infer_foreign_keys(self.schema)
+        pairs = self.inferred_pairs(inferred)
+        self.assertEqual(pairs[("orders", "customer_id")], ("customers", "id"))
+        self.assertEqual(pairs[("orders", "sku")], ("products", "sku"))
+        # Also contained in products.id, but the name points at employees
+        self.assertEqual(pairs[("employees", "manager_employee_id")], ("employees", "id"))
+        # Few distinct values and no telling name: contained by chance
+        self.assertNotIn(("orders", "status"), pairs)
+        # Enum-like, with more distinct values but still no telling name
+        self.assertNotIn(("orders", "rating"), pairs)
+        # Primary keys and text that is not contained anywhere
+        self.assertNotIn(("products", "id"), pairs)
+        self.assertNotIn(("orders", "note"), pairs)
+        self.assertTrue(all(fk.orphan_count is None for fk in inferred))
+
+    def test_verification_counts_orphans(self):
+        """Test that an anti-join verifies candidates and drops those with too many orphans."""
+        connection = sqlite3.connect(os.path.join(self.tmp_dir.name, "legacy.db"))
+        connection.execute("UPDATE orders SET customer_id = customer_id + 1000 WHERE id <= 20")
+        connection.commit()
+        connection.close()
+
+        with self.parser.engine.connect() as connection:
+            inferred = infer_foreign_keys(self.schema, connection=connection)
+        by_column = {(fk.table, fk.column): fk for fk in inferred}
+        customer_fk = by_column[("orders", "customer_id")]
+        self.assertTrue(customer_fk.verified)
+        self.assertEqual(customer_fk.orphan_count, 20)
+        self.assertAlmostEqual(customer_fk.containment, 0.98)
+        self.assertEqual(by_column[("orders", "sku")].orphan_count, 0)
+        # Contained in every integer key, but verification does not make up for the name
+        self.assertLess(by_column[("orders", "rating")].confidence, 0.5)
+
+        with self.parser.engine.connect() as connection:
+            strict = infer_foreign_keys(self.schema, threshold=0.99, connection=connection)
+        self.assertNotIn(("orders", "customer_id"), self.inferred_pairs(strict, 0.0))
+
+    def test_apply_and_render(self):
+        """Test that applied foreign keys are rendered as inferred and keep the table fingerprint."""
+        orders = next(table for table in self.schema.tables if table.name == "orders")
+        fingerprint = table_fingerprint(orders)
+
+        inferred = infer_foreign_keys(self.schema)
+        self.assertEqual(apply_foreign_keys(self.schema, inferred, min_confidence=0.5), 3)
+        customer_id = next(col for col in orders.columns if col.name == "customer_id")
+        self.assertEqual(customer_id.foreign_key, "REFERENCES customers(id)")
+        self.assertGreater(customer_id.foreign_key_confidence, 0.9)
+        self.assertEqual(table_fingerprint(orders), fingerprint)
+
+        m_schema = MSchemaGenerator(self.schema).generate_schema()
+        self.assertIn("[Foreign keys]", m_schema)
+        self.assertIn(
+            f"orders.customer_id = customers.id (inferred, confidence {customer_id.foreign_key_confidence:.2f})",
+            m_schema,
+        )
+        ddl = DDLSchemaGenerator(self.schema).generate_schema()
+        self.assertIn("FOREIGN KEY (customer_id) REFERENCES customers(id) /* inferred, confidence", ddl)
+
+        # Applying again replaces the earlier inferred keys
+        self.assertEqual(apply_foreign_keys(self.schema, inferred, min_confidence=1.1), 0)
+        self.assertIsNone(customer_id.foreign_key)
+
+    def test_incremental_reparse_keeps_inferred_keys(self):
+        """Test that carried-over tables with inferred keys get them inferred again."""
+        first = self.parser.parse(profile=True, track_changes=True)
+        self.assertEqual(apply_foreign_keys(first, infer_foreign_keys(first)), 3)
+
+        second = self.parser.parse(profile=True, previous=first)
+        orders = next(table for table in second.tables if table.name == "orders")
+        self.assertIs(orders, next(table for table in first.tables if table.name == "orders"))
+        self.assertEqual(apply_foreign_keys(second, infer_foreign_keys(second)), 3)
+        customer_id = next(col for col in orders.columns if col.name == "customer_id")
+        self.assertEqual(customer_id.foreign_key, "REFERENCES customers(id)")
+        self.assertIn("orders.customer_id = customers.id (inferred", MSchemaGenerator(second).generate_schema())
+
+    def test_type_and_name_rules(self):
+        """Test the type compatibility and name matching rules used for pruning and confidence."""
+        self.assertTrue(types_compatible("BIGINT", "INTEGER"))
+        self.assertTrue(types_compatible("NUMERIC(10, 0)", "INTEGER"))
+        self.assertTrue(types_compatible("VARCHAR(20)", "TEXT"))
+        self.assertFalse(types_compatible("TEXT", "INTEGER"))
+        self.assertFalse(types_compatible("DATE", "DATE"))
+        self.assertTrue(names_match("customer_id", "customers", "id"))
+        self.assertTrue(names_match("parent_customer_id", "customers", "id"))
+        self.assertTrue(names_match("sku", "products", "sku"))
+        self.assertFalse(names_match("id", "customers", "id"))
+        self.assertFalse(names_match("manager_id", "employees", "id"))
+
+
+if __name__ == "__main__":
+    unittest.main()
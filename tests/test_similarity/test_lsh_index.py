@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+
+from d_schema.profiling.sketches import hash_values, new_minhash, serialize_minhash, update_minhash
+from d_schema.similarity import ColumnIndex
+from d_schema.structures import ColumnInfo, ColumnProfile, DatabaseSchema, TableInfo
+
+
+def column(name, values):
+    minhash = new_minhash()
+    update_minhash(minhash, hash_values([str(value) for value in values]))
+    return ColumnInfo(
+        name=name, type="INTEGER", nullable=True, primary_key=False,
+        profile=ColumnProfile(minhash_sketch=serialize_minhash(minhash)),
+    )
+
+
+class TestColumnIndex(unittest.TestCase):
+    def setUp(self):
+        self.sales = DatabaseSchema("sales", [
+            TableInfo("orders", [column("customer_id", range(0, 1000)), column("status", ["new", "paid"])]),
+            TableInfo("empty", [column("nothing", [])]),
+        ])
+        self.crm = DatabaseSchema("crm", [
+            TableInfo("customers", [column("id", range(0, 1100)), column("code", range(50000, 51000))]),
+        ])
+
+    def test_query_finds_similar_columns(self):
+        """Test that columns with overlapping value sets are found across databases."""
+        index = ColumnIndex(threshold=0.5)
+        self.assertEqual(index.add_schema(self.sales), 2)
+        self.assertEqual(index.add_schema(self.crm), 2)
+
+        results = index.query(("sales", "orders", "customer_id"))
+        self.assertEqual([key for key, _ in results], [("crm", "customers", "id")])
+        self.assertAlmostEqual(results[0][1], 1000 / 1100, delta=0.1)
+        self.assertEqual(index.query([str(i) for i in range(50000, 50990)])[0][0], ("crm", "customers", "code"))
+        self.assertEqual(index.query([]), [])
+        with self.assertRaises(KeyError):
+            index.query(("sales", "orders", "missing"))
+
+    def test_incremental_updates_and_persistence(self):
+        """Test that a saved index reloads and keeps accepting inserts and removals."""
+        index = ColumnIndex()
+        index.add_schema(self.sales)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "columns.lsh")
+            index.save(path)
+            loaded = ColumnIndex.load(path)
+
+        self.assertEqual(loaded.query(("sales", "orders", "customer_id")), [])
+        loaded.add_schema(self.crm)
+        self.assertEqual(loaded.query(("sales", "orders", "customer_id"))[0][0], ("crm", "customers", "id"))
+        self.assertEqual(loaded.remove_database("crm"), 2)
+        self.assertEqual(loaded.query(("sales", "orders", "customer_id")), [])
+        self.assertEqual(len(loaded), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from d_schema.profiling.sketches import (
+    deserialize_minhash,
+    hash_values,
+    new_minhash,
+    serialize_minhash,
+    update_minhash,
+)
+from d_schema.similarity import SketchMatrix
+from d_schema.structures import ColumnInfo, ColumnProfile, DatabaseSchema, TableInfo
+
+
+def sketch(values):
+    minhash = new_minhash()
+    update_minhash(minhash, hash_values([str(value) for value in values]))
+    return serialize_minhash(minhash)
+
+
+def column(name, values):
+    return ColumnInfo(
+        name=name, type="INTEGER", nullable=True, primary_key=False,
+        profile=ColumnProfile(minhash_sketch=sketch(values)),
+    )
+
+
+class TestSketchMatrix(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "sketches.npy")
+        self.sales = DatabaseSchema("sales", [
+            TableInfo("orders", [column("customer_id", range(0, 1000)), column("status", range(5000, 5003))]),
+            TableInfo("empty", [column("nothing", [])]),
+        ])
+        self.crm = DatabaseSchema("crm", [
+            TableInfo("customers", [column("id", range(0, 1200))]),
+        ])
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_similarities_match_minhash_estimates(self):
+        """Test that the vectorized estimates equal datasketch's Jaccard estimates."""
+        matrix = SketchMatrix.build(self.path, [self.sales, self.crm])
+        self.assertEqual(len(matrix), 4)
+        query = ("sales", "orders", "customer_id")
+        similar = matrix.similarities(query)
+
+        orders = deserialize_minhash(self.sales.tables[0].columns[0].profile.minhash_sketch)
+        customers = deserialize_minhash(self.crm.tables[0].columns[0].profile.minhash_sketch)
+        self.assertAlmostEqual(
+            similar[matrix.row(("crm", "customers", "id"))], orders.jaccard(customers), places=5
+        )
+        self.assertEqual(similar[matrix.row(("sales", "empty", "nothing"))], 0.0)
+        self.assertEqual(matrix.most_similar(query, k=1)[0][0], ("crm", "customers", "id"))
+
+        pairwise = matrix.pairwise_similarities()
+        self.assertTrue(np.allclose(pairwise[matrix.row(query)], similar))
+
+    def test_matrix_persists_and_grows(self):
+        """Test that a reopened matrix keeps its rows and accepts more schemas."""
+        SketchMatrix.build(self.path, [self.sales])
+        reopened = SketchMatrix(self.path)
+        self.assertEqual(len(reopened), 3)
+        reopened.add_schema(self.crm)
+        reopened.add_schema(self.crm)
+
+        final = SketchMatrix(self.path)
+        self.assertEqual(len(final), 4)
+        self.assertEqual(final.keys[-1], ("crm", "customers", "id"))
+        self.assertGreater(final.similarities(("crm", "customers", "id"))[0], 0.6)
+
+    def test_growth_replaces_file_and_appends_index(self):
+        """Test that growing copies rows into a replacement file and only appends new keys to the index."""
+        matrix = SketchMatrix.build(self.path, [self.sales])
+        first_row = np.array(matrix.matrix[0])
+        entries = [(("bulk", "t", f"c{i}"), sketch([i])) for i in range(1500)]
+        matrix.add(entries)
+        self.assertEqual(len(matrix), 1503)
+        self.assertGreaterEqual(matrix._data.shape[0], 1503)
+        self.assertTrue(np.array_equal(matrix.matrix[0], first_row))
+        self.assertEqual(sorted(os.listdir(self.tmp_dir.name)), ["sketches.jsonl", "sketches.npy"])
+
+        with open(matrix.index_path, encoding="utf-8") as f:
+            lines = f.readlines()
+        self.assertEqual(len(lines), 1 + 1503)
+        # A key cut short by an interrupted append is ignored on reopening
+        with open(matrix.index_path, "a", encoding="utf-8") as f:
+            f.write('["bulk", "t"')
+        reopened = SketchMatrix(self.path)
+        self.assertEqual(len(reopened), 1503)
+        self.assertEqual(reopened.row(("bulk", "t", "c1499")), 1502)
+        reopened.add([(("bulk", "t", "extra"), sketch([1]))])
+        self.assertEqual(SketchMatrix(self.path).row(("bulk", "t", "extra")), 1503)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from d_schema.db_parser import DatabaseParser
+from d_schema.generators.m_schema.generator import MSchemaGenerator
+from d_schema import store
+from d_schema.store import SchemaStore, schema_fingerprint
+from tests.mock_database import create_mock_database
+
+
+class TestSchemaStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_url = create_mock_database(self.tmp_dir.name)
+        self.schema = DatabaseParser(db_url=self.db_url).parse(profile=True, num_samples=2)
+        self.store = SchemaStore(os.path.join(self.tmp_dir.name, "store.db"))
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp_dir.cleanup()
+
+    def test_round_trip(self):
+        """Test that a stored schema loads back unchanged, sketches and profiles included."""
+        fingerprint = self.store.save(self.schema, self.db_url)
+        self.assertEqual(fingerprint, schema_fingerprint(self.schema.tables))
+
+        loaded = self.store.load(self.db_url)
+        self.assertEqual(loaded.db_name, self.schema.db_name)
+        self.assertEqual(list(loaded.tables), self.schema.tables)
+        self.assertEqual(
+            MSchemaGenerator(schema=loaded).generate_schema(),
+            MSchemaGenerator(schema=self.schema).generate_schema(),
+        )
+        self.assertIsNone(self.store.load("sqlite:///other.db"))
+
+    def test_tables_load_lazily(self):
+        """Test that only the accessed tables of a snapshot are deserialized."""
+        self.store.save(self.schema, self.db_url)
+        with mock.patch("d_schema.store._decode_table", wraps=store._decode_table) as decode:
+            loaded = self.store.load(self.db_url, tables=["hero"])
+            self.assertEqual(decode.call_count, 0)
+            self.assertEqual(loaded.tables.names, ["hero"])
+            self.assertEqual(loaded.tables[0].name, "hero")
+            self.assertEqual(loaded.tables.get("hero").columns[1].samples, ["Superman", "Batman"])
+            self.assertEqual(decode.call_count, 1)
+
+    def test_snapshots_are_keyed_by_fingerprint(self):
+        """Test that a structural change creates a new snapshot and the old one stays loadable."""
+        old_fingerprint = self.store.save(self.schema, self.db_url)
+        hero = next(table for table in self.schema.tables if table.name == "hero")
+        hero.columns[1].type = "TEXT"
+        new_fingerprint = self.store.save(self.schema, self.db_url)
+
+        self.assertNotEqual(old_fingerprint, new_fingerprint)
+        self.assertEqual(self.store.load(self.db_url).tables.get("hero").columns[1].type, "TEXT")
+        old_hero = self.store.load(self.db_url, fingerprint=old_fingerprint).tables.get("hero")
+        self.assertNotEqual(old_hero.columns[1].type, "TEXT")
+
+
+if __name__ == "__main__":
+    unittest.main()